@@ -1,4 +1,4 @@
-import React, { useEffect, useState } from 'react';
+import React, { useEffect, useRef, useState } from 'react';
 import {
     Box,
     Card,
@@ -15,29 +15,27 @@ import {
     Restaurant,
     Refresh,
 } from '@mui/icons-material';
-import api from '../services/api';
-import { Order, OrderStatus } from '../types';
+import api, { API_URL } from '../services/api';
+import { MenuItem, Order, OrderStatus } from '../types';
+
+const ACTIVE_STATUSES = ['pending', 'preparing'];
 
 const KitchenDisplay: React.FC = () => {
     const [orders, setOrders] = useState<Order[]>([]);
     const [loading, setLoading] = useState(true);
     const [lastUpdated, setLastUpdated] = useState<Date>(new Date());
+    // Last order event applied, used to resume the stream after a reconnect
+    const lastEventId = useRef<string | null>(null);
+    const menuItems = useRef<Map<number, MenuItem>>(new Map());
 
     const fetchOrders = async () => {
         try {
-            const response = await api.get('/admin/orders?limit=50');
-            console.log('Fetched orders:', response.data); // Debug log
-            // Filter ensuring we match the enum string values correctly
-            const activeOrders = response.data.filter((order: Order) => {
-                const status = order.status.toLowerCase();
-                const isRecentStatus = status === 'pending' || status === 'preparing';
-
-                // Filter out very old orders (e.g., > 24 hours) to avoid "huge" times
-                const elapsed = getElapsedTime(order.created_at);
-                return isRecentStatus && elapsed < 1440;
+            // Pending/preparing orders from the last 24 hours, filtered on the server
+            const response = await api.get<Order[]>('/admin/orders/active', {
+                params: { status: ['pending', 'preparing'], max_age_minutes: 1440 },
+                paramsSerializer: { indexes: null },
             });
-            console.log('Active orders:', activeOrders);
-            setOrders(activeOrders);
+            setOrders(response.data);
             setLastUpdated(new Date());
         } catch (error) {
             console.error('Error fetching orders:', error);
@@ -46,10 +44,68 @@ const KitchenDisplay: React.FC = () => {
         }
     };
 
+    const applyEvent = (event: any) => {
+        if (event.type === 'resync') {
+            fetchOrders();
+        } else if (event.type === 'order.created') {
+            // Events carry menu item IDs only; names come from the (cached) menu
+            const order: Order = {
+                ...event.order,
+                items: event.order.items.map((item: any) => {
+                    const menuItem = menuItems.current.get(item.menu_item_id);
+                    return menuItem ? { ...item, menu_item: { name: menuItem.name, image_url: menuItem.image_url } } : item;
+                }),
+            };
+            setOrders(prev => prev.some(o => o.id === order.id) ? prev : [...prev, order]);
+        } else if (event.type === 'order.status_changed') {
+            const { id, status } = event.order;
+            setOrders(prev => ACTIVE_STATUSES.includes(status.toLowerCase())
+                ? prev.map(o => o.id === id ? { ...o, status } : o)
+                : prev.filter(o => o.id !== id));
+        }
+        setLastUpdated(new Date());
+    };
+
     useEffect(() => {
-        fetchOrders();
-        const interval = setInterval(fetchOrders, 10000); // Poll every 10s
-        return () => clearInterval(interval);
+        let socket: WebSocket | null = null;
+        let retry: ReturnType<typeof setTimeout> | undefined;
+        let stopped = false;
+
+        const connect = () => {
+            const params = new URLSearchParams({ token: localStorage.getItem('token') || '' });
+            if (lastEventId.current) {
+                params.set('since', lastEventId.current);
+            }
+            socket = new WebSocket(`${API_URL.replace(/^http/, 'ws')}/api/v1/admin/orders/stream?${params}`);
+            socket.onmessage = (message) => {
+                const event = JSON.parse(message.data);
+                if (event.type === 'ping') return;
+                if (event.id) lastEventId.current = event.id;
+                applyEvent(event);
+            };
+            socket.onclose = () => {
+                if (!stopped) retry = setTimeout(connect, 2000);
+            };
+        };
+
+        api.get<MenuItem[]>('/menu/items')
+            .then(response => {
+                menuItems.current = new Map(response.data.map(item => [item.id as number, item]));
+            })
+            .catch(error => console.error('Error fetching menu:', error))
+            .finally(() => {
+                fetchOrders();
+                connect();
+            });
+
+        // Safety net in case the stream is unavailable
+        const interval = setInterval(fetchOrders, 60000);
+        return () => {
+            stopped = true;
+            clearTimeout(retry);
+            clearInterval(interval);
+            socket?.close();
+        };
     }, []);
 
     const updateStatus = async (orderId: number, matchStatus: string, newStatus: string) => {
@@ -57,8 +113,11 @@ const KitchenDisplay: React.FC = () => {
         setOrders(prev => prev.map(o => o.id === orderId ? { ...o, status: newStatus as OrderStatus } : o));
 
         try {
-            // Note: need to implement status update endpoint in backend if not exists
-            await api.patch(`/admin/orders/${orderId}/status`, { status: newStatus });
+            // Only applies if no other screen moved the order first (409 otherwise)
+            await api.patch(`/admin/orders/${orderId}/status`, {
+                status: newStatus.toLowerCase(),
+                expected_status: matchStatus.toLowerCase(),
+            });
         } catch (error) {
             console.error('Failed to update status:', error);
             // Revert on failure
@@ -82,6 +141,13 @@ const KitchenDisplay: React.FC = () => {
         }
     };
 
+    // Order numbers restart every day, so carried-over orders show their day
+    const getOrderLabel = (order: Order) => {
+        const today = new Date().toISOString().slice(0, 10);
+        if (!order.order_date || order.order_date === today) return `#${order.order_number}`;
+        return `#${order.order_number} (${order.order_date.slice(5)})`;
+    };
+
     const getStatusColor = (status: string) => {
         switch (status) {
             case 'PENDING': return 'warning';
@@ -139,7 +205,7 @@ const KitchenDisplay: React.FC = () => {
                                     <CardContent sx={{ flexGrow: 1 }}>
                                         <Box sx={{ display: 'flex', justifyContent: 'space-between', mb: 2 }}>
                                             <Chip
-                                                label={`#${order.order_number}`}
+                                                label={getOrderLabel(order)}
                                                 size="small"
                                                 sx={{ fontWeight: 'bold' }}
                                             />
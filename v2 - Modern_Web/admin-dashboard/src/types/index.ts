@@ -55,6 +55,7 @@ export interface OrderItem {
 export interface Order {
     id: number;
     order_number: string;
+    order_date?: string; // UTC day; order_number is unique per tenant and day
     total_amount: number;
     status: OrderStatus;
     payment_status: string;
@@ -0,0 +1,40 @@
+"""Add the order listing and kitchen queue indexes
+
+Revision ID: 055a2d42cd60
+Revises: 6a2f7e307520
+Create Date: 2026-10-18 13:05:00.000000
+
+(tenant_id, created_at, id) serves the keyset paginated order listing
+and (tenant_id, status, created_at) the kitchen queue.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '055a2d42cd60'
+down_revision: Union[str, None] = '6a2f7e307520'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    "ix_orders_tenant_id_created_at_id": ["tenant_id", "created_at", "id"],
+    "ix_orders_tenant_id_status_created_at": ["tenant_id", "status", "created_at"],
+}
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if "orders" not in inspector.get_table_names():
+        return  # create_tables.py creates it as the models define it
+
+    existing = {index["name"] for index in inspector.get_indexes("orders")}
+    for name, columns in INDEXES.items():
+        if name not in existing:
+            op.create_index(name, "orders", columns)
+
+
+def downgrade() -> None:
+    for name in INDEXES:
+        op.drop_index(name, table_name="orders")
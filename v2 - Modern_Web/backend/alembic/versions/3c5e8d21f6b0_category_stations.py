@@ -0,0 +1,36 @@
+"""Assign categories to kitchen stations
+
+Revision ID: 3c5e8d21f6b0
+Revises: b81f0c3e9a47
+Create Date: 2026-10-18 14:40:00.000000
+
+Existing categories go to the default "kitchen" station until an import
+or edit assigns another one.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c5e8d21f6b0'
+down_revision: Union[str, None] = 'b81f0c3e9a47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if "categories" not in inspector.get_table_names():
+        return  # create_tables.py creates it as the models define it
+
+    if "station" not in {column["name"] for column in inspector.get_columns("categories")}:
+        op.add_column(
+            "categories",
+            sa.Column("station", sa.String(30), nullable=False, server_default="kitchen")
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("categories") as batch:
+        batch.drop_column("station")
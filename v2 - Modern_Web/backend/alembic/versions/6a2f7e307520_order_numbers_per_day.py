@@ -0,0 +1,57 @@
+"""Make order numbers unique per tenant and day
+
+Revision ID: 6a2f7e307520
+Revises: 9ecb939f1c0a
+Create Date: 2026-10-18 12:40:00.000000
+
+Orders get an order_date, backfilled from created_at, and the global
+unique index on order_number becomes a plain index next to a unique
+(tenant_id, order_date, order_number) constraint. Existing numbers were
+random and globally unique, so the backfill can't collide.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6a2f7e307520'
+down_revision: Union[str, None] = '9ecb939f1c0a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if "orders" not in inspector.get_table_names():
+        return  # create_tables.py creates it as the models define it
+
+    if "order_date" not in {column["name"] for column in inspector.get_columns("orders")}:
+        op.add_column("orders", sa.Column("order_date", sa.Date(), nullable=True))
+        op.execute("UPDATE orders SET order_date = DATE(created_at)")
+        op.execute("UPDATE orders SET order_date = CURRENT_DATE WHERE order_date IS NULL")
+        with op.batch_alter_table("orders") as batch:
+            batch.alter_column("order_date", existing_type=sa.Date(), nullable=False)
+
+    indexes = {index["name"]: index for index in inspector.get_indexes("orders")}
+    if indexes.get("ix_orders_order_number", {}).get("unique"):
+        op.drop_index("ix_orders_order_number", table_name="orders")
+        op.create_index("ix_orders_order_number", "orders", ["order_number"])
+
+    if "uq_orders_tenant_date_number" not in {
+        constraint["name"] for constraint in inspector.get_unique_constraints("orders")
+    } and "uq_orders_tenant_date_number" not in indexes:
+        with op.batch_alter_table("orders") as batch:
+            batch.create_unique_constraint(
+                "uq_orders_tenant_date_number", ["tenant_id", "order_date", "order_number"]
+            )
+
+
+def downgrade() -> None:
+    # Fails if a number was reused on another day or by another tenant
+    with op.batch_alter_table("orders") as batch:
+        batch.drop_constraint("uq_orders_tenant_date_number", type_="unique")
+    op.drop_index("ix_orders_order_number", table_name="orders")
+    op.create_index("ix_orders_order_number", "orders", ["order_number"], unique=True)
+    with op.batch_alter_table("orders") as batch:
+        batch.drop_column("order_date")
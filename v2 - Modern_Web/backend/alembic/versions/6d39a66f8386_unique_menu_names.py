@@ -0,0 +1,103 @@
+"""Make category and menu item names unique per tenant
+
+Revision ID: 6d39a66f8386
+Revises: 055a2d42cd60
+Create Date: 2026-10-18 13:30:00.000000
+
+Bulk import upserts on (tenant_id, name), which needs a unique key. Names
+used more than once by a tenant are deduplicated first: the oldest row
+keeps the name and the others get their ID appended, e.g. "Latte (42)".
+Rows are renamed rather than merged or deleted, since deleting a menu
+item would cascade to order history. Renamed items are logged as menu
+changes so kiosks pick up the new names.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6d39a66f8386'
+down_revision: Union[str, None] = '055a2d42cd60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Table, unique constraint and name column length
+TABLES = [
+    ("categories", "uq_categories_tenant_id_name", 50),
+    ("menu_items", "uq_menu_items_tenant_id_name", 100),
+]
+
+
+def deduplicate(connection, table: str, length: int) -> dict:
+    """Rename all but the oldest row of each duplicated name; return {id: tenant_id} of renamed rows."""
+    rows = connection.execute(sa.text(
+        f"SELECT t.id, t.tenant_id, t.name FROM {table} t "
+        f"JOIN (SELECT tenant_id, name, MIN(id) AS keep_id FROM {table} "
+        f"GROUP BY tenant_id, name HAVING COUNT(*) > 1) d "
+        f"ON t.tenant_id = d.tenant_id AND t.name = d.name AND t.id <> d.keep_id"
+    )).all()
+    for row_id, tenant_id, name in rows:
+        suffix = f" ({row_id})"
+        connection.execute(
+            sa.text(f"UPDATE {table} SET name = :name WHERE id = :id"),
+            {"name": name[:length - len(suffix)] + suffix, "id": row_id}
+        )
+    return {row_id: tenant_id for row_id, tenant_id, _ in rows}
+
+
+def log_renamed_items(connection, renamed: dict) -> None:
+    """Record renamed menu items under a new menu version per tenant."""
+    by_tenant = {}
+    for item_id, tenant_id in renamed.items():
+        by_tenant.setdefault(tenant_id, []).append(item_id)
+    for tenant_id, item_ids in by_tenant.items():
+        version = connection.execute(
+            sa.text("SELECT version FROM menu_versions WHERE tenant_id = :tenant_id"),
+            {"tenant_id": tenant_id}
+        ).scalar()
+        if version is None:
+            version = 1
+            connection.execute(
+                sa.text("INSERT INTO menu_versions (tenant_id, version) VALUES (:tenant_id, 1)"),
+                {"tenant_id": tenant_id}
+            )
+        else:
+            version += 1
+            connection.execute(
+                sa.text("UPDATE menu_versions SET version = :version WHERE tenant_id = :tenant_id"),
+                {"version": version, "tenant_id": tenant_id}
+            )
+        connection.execute(
+            sa.text(
+                "INSERT INTO menu_changes (tenant_id, version, menu_item_id, change_type) "
+                "VALUES (:tenant_id, :version, :menu_item_id, 'UPSERT')"
+            ),
+            [{"tenant_id": tenant_id, "version": version, "menu_item_id": item_id} for item_id in item_ids]
+        )
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    inspector = sa.inspect(connection)
+    tables = inspector.get_table_names()
+    for table, constraint, length in TABLES:
+        if table not in tables:
+            continue  # create_tables.py creates it as the models define it
+        existing = {c["name"] for c in inspector.get_unique_constraints(table)}
+        existing |= {i["name"] for i in inspector.get_indexes(table)}
+        if constraint in existing:
+            continue
+
+        renamed = deduplicate(connection, table, length)
+        if table == "menu_items" and renamed and "menu_changes" in tables:
+            log_renamed_items(connection, renamed)
+        with op.batch_alter_table(table) as batch:
+            batch.create_unique_constraint(constraint, ["tenant_id", "name"])
+
+
+def downgrade() -> None:
+    # Deduplicated names are left as they are
+    for table, constraint, _ in reversed(TABLES):
+        with op.batch_alter_table(table) as batch:
+            batch.drop_constraint(constraint, type_="unique")
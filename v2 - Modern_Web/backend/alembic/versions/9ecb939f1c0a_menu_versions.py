@@ -0,0 +1,63 @@
+"""Number menu changes from a per-tenant menu version counter
+
+Revision ID: 9ecb939f1c0a
+Revises:
+Create Date: 2026-10-18 12:10:00.000000
+
+Menu changes were versioned by their auto-increment ID, which is handed
+out on insert but becomes visible on commit, so a delta sync could skip a
+slow transaction's change. Existing changes keep their ID as version, so
+kiosks resume from the version they last saw.
+
+Like the revisions after it, this one skips what is already in place, so
+it is safe on databases created by create_tables.py.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9ecb939f1c0a'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    tables = inspector.get_table_names()
+    if "menu_versions" not in tables:
+        op.create_table(
+            "menu_versions",
+            sa.Column("tenant_id", sa.Integer(), sa.ForeignKey("tenants.id", ondelete="CASCADE"), primary_key=True),
+            sa.Column("version", sa.Integer(), nullable=False),
+        )
+    if "menu_changes" not in tables:
+        return  # create_tables.py creates it with the version column
+
+    if "version" not in {column["name"] for column in inspector.get_columns("menu_changes")}:
+        op.add_column("menu_changes", sa.Column("version", sa.Integer(), nullable=True))
+        op.execute("UPDATE menu_changes SET version = id")
+        with op.batch_alter_table("menu_changes") as batch:
+            batch.alter_column("version", existing_type=sa.Integer(), nullable=False)
+        # Create the new index first; MySQL needs one on tenant_id for the foreign key
+        op.create_index("ix_menu_changes_tenant_id_version", "menu_changes", ["tenant_id", "version"])
+        if "ix_menu_changes_tenant_id_id" in {index["name"] for index in inspector.get_indexes("menu_changes")}:
+            op.drop_index("ix_menu_changes_tenant_id_id", table_name="menu_changes")
+
+    # Start every tenant's counter at its newest change
+    op.execute(
+        "INSERT INTO menu_versions (tenant_id, version) "
+        "SELECT tenant_id, MAX(version) FROM menu_changes "
+        "WHERE tenant_id NOT IN (SELECT tenant_id FROM menu_versions) "
+        "GROUP BY tenant_id"
+    )
+
+
+def downgrade() -> None:
+    op.create_index("ix_menu_changes_tenant_id_id", "menu_changes", ["tenant_id", "id"])
+    op.drop_index("ix_menu_changes_tenant_id_version", table_name="menu_changes")
+    with op.batch_alter_table("menu_changes") as batch:
+        batch.drop_column("version")
+    op.drop_table("menu_versions")
@@ -0,0 +1,34 @@
+"""Mark cancelled orders in the rollup ledger
+
+Revision ID: b81f0c3e9a47
+Revises: 6d39a66f8386
+Create Date: 2026-10-18 14:10:00.000000
+
+Cancelled orders are now subtracted from the sales rollups, and their
+ledger row records when. Orders cancelled before this revision are still
+counted; run rollup_backfill.py afterwards to subtract them.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81f0c3e9a47'
+down_revision: Union[str, None] = '6d39a66f8386'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if "rollup_ledger" not in inspector.get_table_names():
+        return  # create_tables.py creates it as the models define it
+
+    if "reversed_at" not in {column["name"] for column in inspector.get_columns("rollup_ledger")}:
+        op.add_column("rollup_ledger", sa.Column("reversed_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("rollup_ledger") as batch:
+        batch.drop_column("reversed_at")
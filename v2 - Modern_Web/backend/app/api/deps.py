@@ -2,8 +2,8 @@
 from typing import Generator, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db, AsyncSessionLocal
 from app.core.security import decode_access_token
 from app.models import User
 
@@ -12,7 +12,7 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> User:
     """
     Get the current authenticated user from JWT token.
@@ -50,7 +50,7 @@ async def get_current_user(
         print(f"DEBUG: Invalid user_id format: {user_id}")
         raise credentials_exception
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if user is None:
         print(f"DEBUG: User not found in DB for id: {user_id}")
         raise credentials_exception
@@ -71,3 +71,30 @@ async def get_current_tenant_id(
         int: Tenant ID
     """
     return current_user.tenant_id
+
+
+async def get_websocket_tenant_id(token: str) -> Optional[int]:
+    """
+    Get the tenant ID for a WebSocket client.
+    
+    Browsers can't set headers on WebSocket connections, so the access
+    token is passed as a query parameter instead.
+    
+    Args:
+        token: JWT access token
+        
+    Returns:
+        Optional[int]: Tenant ID, or None if the token is invalid
+    """
+    payload = decode_access_token(token)
+    if payload is None:
+        return None
+    
+    try:
+        user_id = int(payload.get("sub"))
+    except (ValueError, TypeError):
+        return None
+    
+    async with AsyncSessionLocal() as db:
+        user = await db.get(User, user_id)
+    return user.tenant_id if user else None
@@ -1,14 +1,32 @@
 """Admin API endpoints."""
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, WebSocket, WebSocketDisconnect, status
+from sqlalchemy import and_, case, cast, exists, func, literal_column, or_, select, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List, Tuple
+import asyncio
+import json
+import redis
+from datetime import datetime, timedelta, timezone
+from pydantic import BaseModel, Field, field_validator, model_validator
 from decimal import Decimal
 from app.database import get_db
-from app.models import Order, MenuItem, Category, OrderStatus
-from app.api.deps import get_current_tenant_id
+from app.models import (
+    Order, OrderItem, MenuItem, Category, OrderStatus, MenuChangeType,
+    can_transition, transition_sources
+)
+from app.api.deps import get_current_tenant_id, get_websocket_tenant_id
 from app.api.v1.orders import OrderResponse
 from app.api.v1.menu import MenuItemResponse
+from app.core.menu_cache import invalidate_menu, menu_cache
+from app.core.menu_changes import record_menu_change, record_menu_changes_from_select
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.outbox import add_outbox_event
+from app.core.active_orders import active_orders
+from app.core.order_events import order_events_topic, order_status_event, order_event_hub, parse_stream_id
+from app.core.stations import check_station
 
 router = APIRouter()
 
@@ -30,40 +48,232 @@ class CategoryCreate(BaseModel):
     display_order: int = 0
 
 
+class CategoryStationUpdate(BaseModel):
+    """Category kitchen station update schema."""
+    station: str
+
+    @field_validator("station")
+    @classmethod
+    def known_station(cls, station: str) -> str:
+        """Only route categories to configured kitchen stations."""
+        return check_station(station)
+
+
+# Seconds between keepalive pings on idle order streams
+ORDER_STREAM_PING_INTERVAL = 25
+
+
 class OrderStatusUpdate(BaseModel):
     """Order status update schema."""
     status: OrderStatus
+    expected_status: OrderStatus | None = None
+
+
+class OrderStatusTransition(BaseModel):
+    """One order's expected and new status."""
+    order_id: int
+    expected_status: OrderStatus
+    status: OrderStatus
+
 
+class OrderStatusBatch(BaseModel):
+    """Batch status update schema."""
+    transitions: List[OrderStatusTransition] = Field(min_length=1, max_length=500)
 
-@router.get("/orders", response_model=List[OrderResponse])
+
+class OrderStatusResult(BaseModel):
+    """Outcome of one transition in a batch."""
+    order_id: int
+    result: str  # "updated", "conflict", "invalid_transition" or "not_found"
+    status: OrderStatus | None = None  # Status after the batch
+
+
+class OrderPage(BaseModel):
+    """A page of orders with the cursor for the next one."""
+    items: List[OrderResponse]
+    next_cursor: str | None = None
+
+
+@router.get("/orders", response_model=List[OrderResponse] | OrderPage)
 async def list_orders(
-    skip: int = 0,
-    limit: int = 50,
+    response: Response,
+    cursor: str | None = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
     tenant_id: int = Depends(get_current_tenant_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
-    List all orders for the tenant (paginated).
+    List the tenant's orders, newest first.
+    
+    Without a cursor this is the original listing: a plain list, paged
+    with skip and limit. Its X-Next-Cursor header (absent on the last page)
+    starts keyset pagination: pass it as cursor to get an OrderPage seeked
+    on (created_at, id) through the (tenant_id, created_at, id) index, so
+    deep pages cost the same as the first. Items and their menu items are
+    loaded with one batched query each.
     
     Args:
-        skip: Number of records to skip
-        limit: Maximum number of records to return
+        response: Response (for the X-Next-Cursor header)
+        cursor: next_cursor from the previous page
+        skip: Number of orders to skip (offset paging, without a cursor)
+        limit: Maximum number of orders to return
         tenant_id: Current tenant ID
         db: Database session
         
     Returns:
-        List[OrderResponse]: List of orders
+        List[OrderResponse] | OrderPage: Orders, or with a cursor, orders
+        and the cursor for the next page (None on the last page)
+    """
+    query = select(Order).options(
+        selectinload(Order.items).selectinload(OrderItem.menu_item)
+    ).where(Order.tenant_id == tenant_id)
+    
+    if cursor:
+        try:
+            created_at, order_id = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        query = query.where(or_(
+            Order.created_at < created_at,
+            and_(Order.created_at == created_at, Order.id < order_id)
+        ))
+    elif skip:
+        query = query.offset(skip)
+    
+    # Fetch one extra row to know whether there is a next page
+    result = await db.execute(
+        query.order_by(Order.created_at.desc(), Order.id.desc()).limit(limit + 1)
+    )
+    orders = result.scalars().all()
+    
+    next_cursor = None
+    if len(orders) > limit:
+        orders = orders[:limit]
+        next_cursor = encode_cursor(orders[-1].created_at, orders[-1].id)
+    items = [OrderResponse.model_validate(order) for order in orders]
+    
+    if not cursor:
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return items
+    return OrderPage(items=items, next_cursor=next_cursor)
+
+
+@router.get("/orders/active", response_model=List[OrderResponse])
+async def list_active_orders(
+    statuses: List[OrderStatus] = Query([OrderStatus.PENDING, OrderStatus.PREPARING], alias="status"),
+    max_age_minutes: int = Query(1440, ge=1),
+    limit: int = Query(500, ge=1, le=1000),
+    tenant_id: int = Depends(get_current_tenant_id),
+    db: AsyncSession = Depends(get_db)
+):
     """
-    from sqlalchemy.orm import joinedload
-    from app.models import OrderItem
+    List the tenant's live kitchen queue, oldest first.
     
-    orders = db.query(Order).options(
-        joinedload(Order.items).joinedload(OrderItem.menu_item)
-    ).filter(
-        Order.tenant_id == tenant_id
-    ).order_by(Order.created_at.desc()).offset(skip).limit(limit).all()
+    Served from the Redis active orders projection when it is built;
+    otherwise filtered in MySQL through the (tenant_id, status, created_at)
+    index while the projection is rebuilt in the background. Either way
+    the cost follows the number of active orders, not the history.
+    
+    Args:
+        statuses: Statuses to include (repeat the parameter for several)
+        max_age_minutes: Ignore orders older than this
+        limit: Safety cap on the number of orders returned
+        tenant_id: Current tenant ID
+        db: Database session
+        
+    Returns:
+        List[OrderResponse]: Active orders with their items
+    """
+    since = datetime.now(timezone.utc) - timedelta(minutes=max_age_minutes)
+    cards = await active_orders.read(tenant_id, [s.value for s in statuses], since, limit)
+    if cards is not None:
+        return cards
+    # Not built yet (fresh deploy or Redis flush); build it for the next reads
+    active_orders.schedule_rebuild(tenant_id)
     
-    return orders
+    result = await db.execute(
+        select(Order).options(
+            selectinload(Order.items).selectinload(OrderItem.menu_item)
+        ).where(
+            Order.tenant_id == tenant_id,
+            Order.status.in_(statuses),
+            Order.created_at >= since
+        ).order_by(Order.created_at, Order.id).limit(limit)
+    )
+    return result.scalars().all()
+
+
+@router.websocket("/orders/stream")
+async def stream_orders(
+    websocket: WebSocket,
+    token: str,
+    since: str | None = None
+):
+    """
+    Push the tenant's order events to a kitchen display.
+    
+    Messages are {"id", "type": "order.created" | "order.status_changed",
+    "order"}. A {"type": "resync", "id"} message tells the client to reload
+    the active orders and continue from that ID; it is sent first on a fresh
+    connection, and when events after `since` are no longer available.
+    
+    Args:
+        websocket: WebSocket connection
+        token: Access token (browsers can't send headers on WebSockets)
+        since: ID of the last event seen, to resume after a reconnect
+    """
+    tenant_id = await get_websocket_tenant_id(token)
+    if tenant_id is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    await websocket.accept()
+    # Subscribe before reading the stream so nothing falls in between
+    queue = order_event_hub.subscribe(tenant_id)
+    try:
+        try:
+            events, gap = [], True
+            if since:
+                parse_stream_id(since)
+                events, gap = await order_event_hub.replay(tenant_id, since)
+            last_id = await order_event_hub.last_id(tenant_id) if gap else since
+        except ValueError:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Invalid since")
+            return
+        except redis.RedisError:
+            await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+            return
+        
+        if gap:
+            await websocket.send_json({"type": "resync", "id": last_id})
+        else:
+            for entry_id, event in events:
+                await websocket.send_json({"id": entry_id, **event})
+                last_id = entry_id
+        
+        while True:
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout=ORDER_STREAM_PING_INTERVAL)
+            except asyncio.TimeoutError:
+                await websocket.send_json({"type": "ping"})
+                continue
+            
+            if item is None:
+                # Fell behind or lost the subscription; the client resumes from last_id
+                await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+                return
+            
+            entry_id, event = item
+            if parse_stream_id(entry_id) <= parse_stream_id(last_id):
+                continue
+            await websocket.send_json({"id": entry_id, **event})
+            last_id = entry_id
+    except WebSocketDisconnect:
+        pass
+    finally:
+        order_event_hub.unsubscribe(tenant_id, queue)
 
 
 @router.patch("/orders/{order_id}/status")
@@ -71,42 +281,189 @@ async def update_order_status(
     order_id: int,
     status_update: OrderStatusUpdate,
     tenant_id: int = Depends(get_current_tenant_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
-    Update order status.
+    Move an order to a new status.
+    
+    The change is a single conditional UPDATE that only matches if the
+    order is in a status the transition is legal from (or in
+    expected_status, when given), so concurrent screens can't overwrite
+    each other. The current status is only read when the update misses.
     
     Args:
         order_id: Order ID
-        status_update: New status
+        status_update: New status, and optionally the status it is expected to be in
         tenant_id: Current tenant ID
         db: Database session
         
     Returns:
         dict: Success message
+        
+    Raises:
+        HTTPException: 404 if the order doesn't exist, 409 with the current
+        status if the transition isn't allowed from it
     """
-    order = db.query(Order).filter(
-        Order.id == order_id,
-        Order.tenant_id == tenant_id
-    ).first()
+    new_status = status_update.status
+    if status_update.expected_status is not None:
+        sources = [status_update.expected_status] if can_transition(status_update.expected_status, new_status) else []
+    else:
+        sources = transition_sources(new_status)
+    
+    rowcount = 0
+    if sources:
+        values = {"status": new_status}
+        if new_status == OrderStatus.COMPLETED:
+            values["completed_at"] = datetime.now(timezone.utc)
+        result = await db.execute(
+            update(Order).where(
+                Order.id == order_id,
+                Order.tenant_id == tenant_id,
+                Order.status.in_(sources)
+            ).values(**values).execution_options(synchronize_session=False)
+        )
+        rowcount = result.rowcount
     
-    if not order:
+    if rowcount != 1:
+        await db.rollback()
+        current_status = await db.scalar(
+            select(Order.status).where(Order.id == order_id, Order.tenant_id == tenant_id)
+        )
+        if current_status is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Order not found"
+            )
+        expected_status = status_update.expected_status
+        if expected_status is not None and current_status != expected_status:
+            message = f"Order is {current_status.value}, not {expected_status.value}"
+        else:
+            message = f"Cannot change order status from {current_status.value} to {new_status.value}"
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Order not found"
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"message": message, "current_status": current_status.value}
         )
     
-    order.status = status_update.status
-    db.commit()
+    add_outbox_event(db, order_events_topic(tenant_id), order_status_event(
+        order_id, None, new_status.value,
+        sources[0].value if len(sources) == 1 else None
+    ))
+    await db.commit()
     
     return {"message": "Order status updated successfully"}
 
 
+@router.post("/orders/status/batch", response_model=List[OrderStatusResult])
+async def update_order_statuses(
+    batch: OrderStatusBatch,
+    tenant_id: int = Depends(get_current_tenant_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Apply many order status transitions in one transaction.
+    
+    Transitions are grouped by (expected_status, status) and each group is
+    one conditional UPDATE ... WHERE id IN (...) AND status = expected, so a
+    rush of bumps costs a handful of statements. Orders whose current status
+    isn't the expected one are reported as conflicts, and transitions the
+    order state machine doesn't allow as invalid; both are left unchanged.
+    
+    Args:
+        batch: Transitions to apply
+        tenant_id: Current tenant ID
+        db: Database session
+        
+    Returns:
+        List[OrderStatusResult]: One result per transition, in request order
+    """
+    order_ids = [t.order_id for t in batch.transitions]
+    # Lock the rows so the conditional updates match what we report
+    result = await db.execute(
+        select(Order.id, Order.order_number, Order.status).where(
+            Order.tenant_id == tenant_id,
+            Order.id.in_(order_ids)
+        ).with_for_update()
+    )
+    current = {order_id: (order_number, order_status) for order_id, order_number, order_status in result.all()}
+    
+    # Only the first transition for an order can apply
+    groups: Dict[Tuple[OrderStatus, OrderStatus], List[int]] = {}
+    accepted = {}
+    for index, t in enumerate(batch.transitions):
+        if (
+            t.order_id in current
+            and t.order_id not in accepted
+            and current[t.order_id][1] == t.expected_status
+            and can_transition(t.expected_status, t.status)
+        ):
+            groups.setdefault((t.expected_status, t.status), []).append(t.order_id)
+            accepted[t.order_id] = index
+    
+    now = datetime.now(timezone.utc)
+    for (expected_status, new_status), ids in groups.items():
+        values = {"status": new_status}
+        if new_status == OrderStatus.COMPLETED:
+            values["completed_at"] = now
+        await db.execute(
+            update(Order).where(
+                Order.tenant_id == tenant_id,
+                Order.id.in_(ids),
+                Order.status == expected_status
+            ).values(**values).execution_options(synchronize_session=False)
+        )
+        for order_id in ids:
+            add_outbox_event(db, order_events_topic(tenant_id), order_status_event(
+                order_id, current[order_id][0], new_status.value, expected_status.value
+            ))
+    await db.commit()
+    
+    final_status = {order_id: batch.transitions[index].status for order_id, index in accepted.items()}
+    results = []
+    for index, t in enumerate(batch.transitions):
+        if t.order_id not in current:
+            results.append(OrderStatusResult(order_id=t.order_id, result="not_found"))
+        elif not can_transition(t.expected_status, t.status):
+            results.append(OrderStatusResult(
+                order_id=t.order_id, result="invalid_transition", status=current[t.order_id][1]
+            ))
+        else:
+            results.append(OrderStatusResult(
+                order_id=t.order_id,
+                result="updated" if accepted.get(t.order_id) == index else "conflict",
+                status=final_status.get(t.order_id, current[t.order_id][1])
+            ))
+    return results
+
+
+@router.get("/cache/stats")
+async def get_cache_stats(
+    tenant_id: int = Depends(get_current_tenant_id)
+):
+    """
+    Get hit/miss counters for the menu cache tiers in this API process.
+    
+    Args:
+        tenant_id: Current tenant ID
+        
+    Returns:
+        dict: Per-tier cache counters
+    """
+    return menu_cache.stats()
+
+
+def _duplicate_item_name(name: str | None) -> HTTPException:
+    """409 for a write that broke the per-tenant unique item name."""
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=f"A menu item named '{name}' already exists" if name else "A menu item with this name already exists"
+    )
+
+
 @router.post("/menu/items", response_model=MenuItemResponse, status_code=status.HTTP_201_CREATED)
 async def create_menu_item(
     item_data: MenuItemCreate,
     tenant_id: int = Depends(get_current_tenant_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Create a new menu item.
@@ -118,6 +475,9 @@ async def create_menu_item(
         
     Returns:
         MenuItemResponse: Created menu item
+        
+    Raises:
+        HTTPException: 409 if the tenant already has an item with this name
     """
     new_item = MenuItem(
         **item_data.dict(),
@@ -125,8 +485,15 @@ async def create_menu_item(
     )
     
     db.add(new_item)
-    db.commit()
-    db.refresh(new_item)
+    try:
+        await db.flush()
+    except IntegrityError:
+        await db.rollback()
+        raise _duplicate_item_name(item_data.name)
+    await record_menu_change(db, tenant_id, new_item.id, MenuChangeType.UPSERT)
+    await db.commit()
+    await db.refresh(new_item)
+    await invalidate_menu(tenant_id)
     
     return new_item
 
@@ -148,7 +515,7 @@ async def update_menu_item(
     item_id: int,
     item_data: MenuItemUpdate,
     tenant_id: int = Depends(get_current_tenant_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Update a menu item.
@@ -161,11 +528,18 @@ async def update_menu_item(
         
     Returns:
         MenuItemResponse: Updated menu item
+        
+    Raises:
+        HTTPException: 404 if the item doesn't exist, 409 if another item
+        already has the new name
     """
-    item = db.query(MenuItem).filter(
-        MenuItem.id == item_id,
-        MenuItem.tenant_id == tenant_id
-    ).first()
+    result = await db.execute(
+        select(MenuItem).where(
+            MenuItem.id == item_id,
+            MenuItem.tenant_id == tenant_id
+        )
+    )
+    item = result.scalar_one_or_none()
     
     if not item:
         raise HTTPException(
@@ -177,17 +551,186 @@ async def update_menu_item(
     for field, value in update_data.items():
         setattr(item, field, value)
     
-    db.commit()
-    db.refresh(item)
+    try:
+        await db.flush()
+    except IntegrityError:
+        await db.rollback()
+        raise _duplicate_item_name(item_data.name)
+    await record_menu_change(db, tenant_id, item.id, MenuChangeType.UPSERT)
+    await db.commit()
+    await db.refresh(item)
+    await invalidate_menu(tenant_id)
     
     return item
 
 
+class MenuItemFilter(BaseModel):
+    """Which menu items a bulk update applies to; set criteria are ANDed."""
+    category_id: int | None = None
+    dietary_tag: str | None = None
+    item_ids: List[int] | None = Field(default=None, min_length=1, max_length=10000)
+
+
+class MenuItemBulkOperation(BaseModel):
+    """Changes applied to every matched menu item."""
+    price_change_percent: Decimal | None = Field(default=None, gt=-100, le=1000)
+    price_change_amount: Decimal | None = Field(default=None, max_digits=10, decimal_places=2)
+    discount_percentage: Decimal | None = Field(default=None, ge=0, le=100)
+    is_available: bool | None = None
+
+    @model_validator(mode="after")
+    def check_changes(self):
+        """Require at least one change and at most one kind of price change."""
+        if all(value is None for value in self.model_dump().values()):
+            raise ValueError("operation must change at least one field")
+        if self.price_change_percent is not None and self.price_change_amount is not None:
+            raise ValueError("use either price_change_percent or price_change_amount, not both")
+        return self
+
+
+class MenuItemBulkUpdate(BaseModel):
+    """Bulk menu item update schema."""
+    filter: MenuItemFilter
+    operation: MenuItemBulkOperation
+
+    @model_validator(mode="after")
+    def check_filter(self):
+        """Refuse an empty filter, which would touch the whole menu by accident."""
+        if all(value is None for value in self.filter.model_dump().values()):
+            raise ValueError("filter must set category_id, dietary_tag or item_ids")
+        return self
+
+
+class MenuItemBulkResult(BaseModel):
+    """Outcome of a bulk menu item update."""
+    updated: int
+
+
+def _dietary_tag_clause(dialect: str, tag: str):
+    """Match items whose dietary_tags JSON array contains a tag."""
+    if dialect == "mysql":
+        return func.json_contains(MenuItem.dietary_tags, json.dumps(tag)) == 1
+    if dialect == "sqlite":
+        tags = func.json_each(MenuItem.dietary_tags).table_valued("value")
+        return exists(select(literal_column("1")).select_from(tags).where(tags.c.value == tag))
+    if dialect == "postgresql":
+        return cast(MenuItem.dietary_tags, JSONB).has_key(tag)
+    raise HTTPException(
+        status_code=status.HTTP_501_NOT_IMPLEMENTED,
+        detail=f"Dietary tag filters are not supported on {dialect}"
+    )
+
+
+@router.post("/menu/items/bulk", response_model=MenuItemBulkResult)
+async def bulk_update_menu_items(
+    bulk: MenuItemBulkUpdate,
+    tenant_id: int = Depends(get_current_tenant_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Update every menu item matching a filter in one statement.
+    
+    The change is a single set-based UPDATE, its change log entries are one
+    INSERT ... SELECT over the same filter, and the menu cache is invalidated
+    once after commit. Price changes are rounded to cents and never go below
+    zero.
+    
+    Args:
+        bulk: Filter and operation
+        tenant_id: Current tenant ID
+        db: Database session
+        
+    Returns:
+        MenuItemBulkResult: Number of items matched
+    """
+    conditions = [MenuItem.tenant_id == tenant_id]
+    if bulk.filter.category_id is not None:
+        conditions.append(MenuItem.category_id == bulk.filter.category_id)
+    if bulk.filter.dietary_tag is not None:
+        conditions.append(_dietary_tag_clause(db.bind.dialect.name, bulk.filter.dietary_tag))
+    if bulk.filter.item_ids is not None:
+        conditions.append(MenuItem.id.in_(bulk.filter.item_ids))
+    
+    operation = bulk.operation
+    values = {}
+    price = None
+    if operation.price_change_percent is not None:
+        price = MenuItem.price * (1 + operation.price_change_percent / 100)
+    elif operation.price_change_amount is not None:
+        price = MenuItem.price + operation.price_change_amount
+    if price is not None:
+        price = func.round(price, 2)
+        values["price"] = case((price < 0, 0), else_=price)
+    if operation.discount_percentage is not None:
+        values["discount_percentage"] = operation.discount_percentage
+    if operation.is_available is not None:
+        values["is_available"] = operation.is_available
+    
+    result = await db.execute(
+        update(MenuItem).where(*conditions).values(values).execution_options(synchronize_session=False)
+    )
+    if not result.rowcount:
+        await db.rollback()
+        return MenuItemBulkResult(updated=0)
+    
+    await record_menu_changes_from_select(
+        db,
+        tenant_id,
+        select(MenuItem.tenant_id, MenuItem.id).where(*conditions),
+        MenuChangeType.UPSERT
+    )
+    await db.commit()
+    await invalidate_menu(tenant_id)
+    
+    return MenuItemBulkResult(updated=result.rowcount)
+
+
+@router.put("/menu/categories/{category_id}/station")
+async def update_category_station(
+    category_id: int,
+    station_update: CategoryStationUpdate,
+    tenant_id: int = Depends(get_current_tenant_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Route a category's items to another kitchen station.
+
+    Orders the kitchen worker already split keep their tickets; the new
+    station applies to orders split from now on.
+
+    Args:
+        category_id: Category ID
+        station_update: Station, one of KITCHEN_STATIONS
+        tenant_id: Current tenant ID
+        db: Database session
+
+    Returns:
+        dict: Success message
+
+    Raises:
+        HTTPException: 404 if the category doesn't exist
+    """
+    result = await db.execute(
+        update(Category).where(
+            Category.id == category_id,
+            Category.tenant_id == tenant_id
+        ).values(station=station_update.station).execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Category not found"
+        )
+    await db.commit()
+
+    return {"message": "Category station updated successfully"}
+
+
 @router.delete("/menu/items/{item_id}")
 async def delete_menu_item(
     item_id: int,
     tenant_id: int = Depends(get_current_tenant_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Delete a menu item.
@@ -200,10 +743,13 @@ async def delete_menu_item(
     Returns:
         dict: Success message
     """
-    item = db.query(MenuItem).filter(
-        MenuItem.id == item_id,
-        MenuItem.tenant_id == tenant_id
-    ).first()
+    result = await db.execute(
+        select(MenuItem).where(
+            MenuItem.id == item_id,
+            MenuItem.tenant_id == tenant_id
+        )
+    )
+    item = result.scalar_one_or_none()
     
     if not item:
         raise HTTPException(
@@ -211,7 +757,9 @@ async def delete_menu_item(
             detail="Menu item not found"
         )
     
-    db.delete(item)
-    db.commit()
+    await record_menu_change(db, tenant_id, item.id, MenuChangeType.DELETE)
+    await db.delete(item)
+    await db.commit()
+    await invalidate_menu(tenant_id)
     
     return {"message": "Menu item deleted successfully"}
@@ -0,0 +1,171 @@
+"""Sales analytics API endpoints."""
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import List, Literal, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import BaseModel
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db
+from app.models import MenuItem, SalesHourly, ItemSalesHourly
+from app.api.deps import get_current_tenant_id
+from app.core.rollups import hour_bucket, CENT
+
+router = APIRouter()
+
+# Longest range one report may cover
+MAX_REPORT_DAYS = 366
+
+Granularity = Literal["hour", "day"]
+
+
+class SalesBucket(BaseModel):
+    """Sales in one hour or day."""
+    period: datetime
+    order_count: int
+    revenue: Decimal
+    average_ticket: Decimal
+
+
+class SalesReport(BaseModel):
+    """Sales over a time range."""
+    start: datetime
+    end: datetime
+    granularity: Granularity
+    buckets: List[SalesBucket]
+    totals: SalesBucket
+
+
+class ItemSales(BaseModel):
+    """Sales of one menu item over a time range."""
+    menu_item_id: int
+    name: str | None = None  # None once the item is deleted
+    quantity: int
+    revenue: Decimal
+
+
+def _bucket(period: datetime, order_count: int, revenue: Decimal) -> SalesBucket:
+    """Build a bucket with its average ticket."""
+    average = (revenue / order_count).quantize(CENT) if order_count else Decimal(0)
+    return SalesBucket(period=period, order_count=order_count, revenue=revenue.quantize(CENT), average_ticket=average)
+
+
+def _report_range(start: datetime | None, end: datetime | None) -> Tuple[datetime, datetime]:
+    """
+    Resolve a report range to naive UTC hours (default: the last 7 days).
+
+    Raises:
+        HTTPException: 400 if the range is empty or too long
+    """
+    end = hour_bucket(end) if end else hour_bucket(datetime.now(timezone.utc)) + timedelta(hours=1)
+    start = hour_bucket(start) if start else end - timedelta(days=7)
+    if start >= end:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start must be before end")
+    if end - start > timedelta(days=MAX_REPORT_DAYS):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Reports cover at most {MAX_REPORT_DAYS} days"
+        )
+    return start, end
+
+
+@router.get("/sales", response_model=SalesReport)
+async def get_sales(
+    start: datetime | None = None,
+    end: datetime | None = None,
+    granularity: Granularity = "day",
+    tenant_id: int = Depends(get_current_tenant_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get order count, revenue and average ticket per hour or day.
+
+    Reads the hourly rollups maintained by the worker, so the cost depends
+    on the length of the range, not on the number of orders. Times are UTC
+    and truncated to the hour; end is exclusive.
+
+    Args:
+        start: Range start (default: 7 days before end)
+        end: Range end (default: the end of the current hour)
+        granularity: "hour" or "day"
+        tenant_id: Current tenant ID
+        db: Database session
+
+    Returns:
+        SalesReport: Buckets with sales, oldest first, and range totals
+    """
+    start, end = _report_range(start, end)
+    result = await db.execute(
+        select(SalesHourly.hour, SalesHourly.order_count, SalesHourly.revenue).where(
+            SalesHourly.tenant_id == tenant_id,
+            SalesHourly.hour >= start,
+            SalesHourly.hour < end
+        ).order_by(SalesHourly.hour)
+    )
+
+    periods: OrderedDict = OrderedDict()
+    for hour, order_count, revenue in result.all():
+        period = hour if granularity == "hour" else hour.replace(hour=0)
+        totals = periods.setdefault(period, [0, Decimal(0)])
+        totals[0] += order_count
+        totals[1] += Decimal(revenue)
+
+    buckets = [_bucket(period, count, revenue) for period, (count, revenue) in periods.items()]
+    return SalesReport(
+        start=start,
+        end=end,
+        granularity=granularity,
+        buckets=buckets,
+        totals=_bucket(
+            start,
+            sum(bucket.order_count for bucket in buckets),
+            sum((bucket.revenue for bucket in buckets), Decimal(0))
+        )
+    )
+
+
+@router.get("/items", response_model=List[ItemSales])
+async def get_item_sales(
+    start: datetime | None = None,
+    end: datetime | None = None,
+    sort: Literal["quantity", "revenue"] = "quantity",
+    limit: int = Query(20, ge=1, le=500),
+    tenant_id: int = Depends(get_current_tenant_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get the best selling menu items over a time range.
+
+    Args:
+        start: Range start (default: 7 days before end)
+        end: Range end (default: the end of the current hour)
+        sort: Rank by "quantity" or "revenue"
+        limit: Maximum number of items
+        tenant_id: Current tenant ID
+        db: Database session
+
+    Returns:
+        List[ItemSales]: Items, best selling first
+    """
+    start, end = _report_range(start, end)
+    quantity = func.sum(ItemSalesHourly.quantity).label("quantity")
+    revenue = func.sum(ItemSalesHourly.revenue).label("revenue")
+    totals = select(ItemSalesHourly.menu_item_id, quantity, revenue).where(
+        ItemSalesHourly.tenant_id == tenant_id,
+        ItemSalesHourly.hour >= start,
+        ItemSalesHourly.hour < end
+    ).group_by(ItemSalesHourly.menu_item_id).order_by(
+        (quantity if sort == "quantity" else revenue).desc(),
+        ItemSalesHourly.menu_item_id
+    ).limit(limit).subquery()
+
+    result = await db.execute(
+        select(totals.c.menu_item_id, MenuItem.name, totals.c.quantity, totals.c.revenue)
+        .outerjoin(MenuItem, MenuItem.id == totals.c.menu_item_id)
+        .order_by((totals.c.quantity if sort == "quantity" else totals.c.revenue).desc(), totals.c.menu_item_id)
+    )
+    return [
+        ItemSales(menu_item_id=item_id, name=name, quantity=item_quantity, revenue=Decimal(item_revenue).quantize(CENT))
+        for item_id, name, item_quantity, item_revenue in result.all()
+    ]
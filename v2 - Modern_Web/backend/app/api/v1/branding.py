@@ -1,10 +1,12 @@
 """Branding configuration API endpoints."""
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from app.database import get_db
 from app.models import BrandConfig
 from app.api.deps import get_current_tenant_id
+from app.core.menu_cache import invalidate_bootstrap
 
 router = APIRouter()
 
@@ -32,11 +34,32 @@ class BrandConfigResponse(BaseModel):
         from_attributes = True
 
 
+def default_brand_config(tenant_id: int) -> BrandConfigResponse:
+    """
+    Build the default brand configuration used when a tenant has none saved.
+    
+    Args:
+        tenant_id: Tenant ID
+        
+    Returns:
+        BrandConfigResponse: Default brand configuration
+    """
+    return BrandConfigResponse(
+        id=0,
+        tenant_id=tenant_id,
+        logo_url=None,
+        primary_color="#1976d2",
+        secondary_color="#dc004e",
+        font_family="Roboto",
+        currency_symbol="$"
+    )
+
+
 @router.post("/settings", response_model=BrandConfigResponse, status_code=status.HTTP_201_CREATED)
 async def save_brand_settings(
     config_data: BrandConfigCreate,
     tenant_id: int = Depends(get_current_tenant_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Save or update brand settings for the restaurant.
@@ -50,9 +73,10 @@ async def save_brand_settings(
         BrandConfigResponse: Updated brand configuration
     """
     # Check if brand config already exists
-    brand_config = db.query(BrandConfig).filter(
-        BrandConfig.tenant_id == tenant_id
-    ).first()
+    result = await db.execute(
+        select(BrandConfig).where(BrandConfig.tenant_id == tenant_id)
+    )
+    brand_config = result.scalar_one_or_none()
     
     if brand_config:
         # Update existing config
@@ -66,15 +90,16 @@ async def save_brand_settings(
         )
         db.add(brand_config)
     
-    db.commit()
-    db.refresh(brand_config)
+    await db.commit()
+    await db.refresh(brand_config)
+    await invalidate_bootstrap(tenant_id)
     
     return brand_config
 
 
 @router.get("/settings", response_model=BrandConfigResponse)
 async def get_brand_settings(
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get current brand settings for the restaurant (public endpoint).
@@ -87,19 +112,13 @@ async def get_brand_settings(
     """
     # For kiosk, we use default tenant_id=1
     tenant_id = 1
-    brand_config = db.query(BrandConfig).filter(
-        BrandConfig.tenant_id == tenant_id
-    ).first()
+    result = await db.execute(
+        select(BrandConfig).where(BrandConfig.tenant_id == tenant_id)
+    )
+    brand_config = result.scalar_one_or_none()
     
     if not brand_config:
         # Return default config if none exists
-        return BrandConfigResponse(
-            id=0,
-            tenant_id=tenant_id,
-            logo_url=None,
-            primary_color="#1976d2",
-            secondary_color="#dc004e",
-            font_family="Roboto"
-        )
+        return default_brand_config(tenant_id)
     
     return brand_config
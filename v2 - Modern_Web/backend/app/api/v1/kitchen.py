@@ -0,0 +1,186 @@
+"""Kitchen queue and station ticket API endpoints."""
+from datetime import date, datetime
+from typing import Dict, List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import BaseModel
+from sqlalchemy import case, select
+from sqlalchemy.ext.asyncio import AsyncSession
+import redis
+from app.config import settings
+from app.database import get_db
+from app.models import Category, MenuItem, Order, OrderItem, OrderStatus, OrderTicket, TicketStatus, DEFAULT_STATION
+from app.api.deps import get_current_tenant_id
+from app.core.queue import async_kitchen_queue
+from app.core.stations import complete_ticket
+
+router = APIRouter()
+
+
+class TicketItem(BaseModel):
+    """One order line on a station ticket."""
+    menu_item_id: int
+    name: str | None = None  # None once the item is deleted
+    quantity: int
+    special_instructions: str | None = None
+
+
+class TicketResponse(BaseModel):
+    """An open station ticket."""
+    id: int
+    order_id: int
+    order_number: str
+    order_date: date
+    station: str
+    created_at: datetime
+    items: List[TicketItem]
+
+
+class TicketCompletion(BaseModel):
+    """Outcome of completing a station ticket."""
+    ticket_id: int
+    order_id: int
+    station: str
+    completed: bool  # False if the ticket was already done
+    order_status: OrderStatus
+
+
+@router.get("/queue")
+async def get_kitchen_queue_depth(
+    tenant_id: int = Depends(get_current_tenant_id)
+):
+    """
+    Get the depth of the tenant's kitchen queue.
+
+    Args:
+        tenant_id: Current tenant ID
+
+    Returns:
+        dict: Orders not yet done, and how many of them a worker is on
+
+    Raises:
+        HTTPException: 503 if Redis is unavailable
+    """
+    try:
+        return (await async_kitchen_queue().depth([tenant_id]))[tenant_id]
+    except redis.RedisError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Kitchen queue unavailable"
+        )
+
+
+@router.get("/stations/{station}/tickets", response_model=List[TicketResponse])
+async def list_station_tickets(
+    station: str,
+    limit: int = Query(100, ge=1, le=500),
+    tenant_id: int = Depends(get_current_tenant_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    List a station's open tickets, oldest first.
+
+    Tickets of orders that were cancelled (or bumped to ready by hand) are
+    left out. Filtered through the (tenant_id, station, status, created_at)
+    index, so the cost follows the number of open tickets.
+
+    Args:
+        station: Station name
+        limit: Safety cap on the number of tickets returned
+        tenant_id: Current tenant ID
+        db: Database session
+
+    Returns:
+        List[TicketResponse]: Open tickets with the station's order lines
+
+    Raises:
+        HTTPException: 404 if the station isn't one of KITCHEN_STATIONS
+    """
+    if station not in settings.kitchen_stations_list:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Station not found"
+        )
+
+    result = await db.execute(
+        select(
+            OrderTicket.id, OrderTicket.order_id, Order.order_number, Order.order_date, OrderTicket.created_at
+        ).join(
+            Order, Order.id == OrderTicket.order_id
+        ).where(
+            OrderTicket.tenant_id == tenant_id,
+            OrderTicket.station == station,
+            OrderTicket.status == TicketStatus.OPEN,
+            Order.status.in_([OrderStatus.PENDING, OrderStatus.PREPARING])
+        ).order_by(OrderTicket.created_at, OrderTicket.id).limit(limit)
+    )
+    tickets = result.all()
+    if not tickets:
+        return []
+
+    # The station's lines of those orders, routed the same way the worker split them
+    result = await db.execute(
+        select(
+            OrderItem.order_id, OrderItem.menu_item_id, MenuItem.name,
+            OrderItem.quantity, OrderItem.special_instructions
+        ).outerjoin(MenuItem, MenuItem.id == OrderItem.menu_item_id).outerjoin(
+            Category, Category.id == MenuItem.category_id
+        ).where(
+            OrderItem.order_id.in_([ticket.order_id for ticket in tickets]),
+            case(
+                (Category.station.in_(settings.kitchen_stations_list), Category.station),
+                else_=DEFAULT_STATION
+            ) == station
+        ).order_by(OrderItem.id)
+    )
+    items: Dict[int, List[TicketItem]] = {}
+    for order_id, menu_item_id, name, quantity, special_instructions in result.all():
+        items.setdefault(order_id, []).append(TicketItem(
+            menu_item_id=menu_item_id,
+            name=name,
+            quantity=quantity,
+            special_instructions=special_instructions
+        ))
+
+    return [
+        TicketResponse(
+            id=ticket.id,
+            order_id=ticket.order_id,
+            order_number=ticket.order_number,
+            order_date=ticket.order_date,
+            station=station,
+            created_at=ticket.created_at,
+            items=items.get(ticket.order_id, [])
+        )
+        for ticket in tickets
+    ]
+
+
+@router.post("/tickets/{ticket_id}/complete", response_model=TicketCompletion)
+async def complete_station_ticket(
+    ticket_id: int,
+    tenant_id: int = Depends(get_current_tenant_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Mark a station's ticket done; the order becomes ready with its last ticket.
+
+    Safe to repeat: completing a done ticket changes nothing.
+
+    Args:
+        ticket_id: Ticket ID
+        tenant_id: Current tenant ID
+        db: Database session
+
+    Returns:
+        TicketCompletion: The ticket and its order's status
+
+    Raises:
+        HTTPException: 404 if the ticket doesn't exist
+    """
+    completion = await db.run_sync(complete_ticket, tenant_id, ticket_id)
+    if completion is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Ticket not found"
+        )
+    return completion
@@ -1,12 +1,18 @@
 """Menu API endpoints."""
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from pydantic import BaseModel
 from decimal import Decimal
+import json
 from app.database import get_db
-from app.models import MenuItem, Category
+from app.models import MenuItem, Category, BrandConfig, MenuChange, MenuChangeType
 from app.api.deps import get_current_tenant_id
+from app.api.v1.branding import BrandConfigResponse, default_brand_config
+from app.core.bootstrap import bootstrap_cache
+from app.core.menu_cache import menu_cache
+from app.core.menu_changes import latest_menu_version
 
 router = APIRouter()
 
@@ -38,42 +44,207 @@ class CategoryResponse(BaseModel):
         from_attributes = True
 
 
+class MenuChangesResponse(BaseModel):
+    """Delta menu sync response model."""
+    version: int
+    items: List[MenuItemResponse]
+    deleted: List[int]
+
+
 @router.get("/items", response_model=List[MenuItemResponse])
 async def get_menu_items(
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get all available menu items (public endpoint for kiosk).
     
+    Served from the in-process LRU, then Redis, then the database.
+    
     Args:
         db: Database session
         
     Returns:
         List[MenuItemResponse]: List of available menu items
     """
-    # For now, return items from all tenants (or filter by tenant in production)
-    items = db.query(MenuItem).filter(
-        MenuItem.is_available == True
-    ).all()
+    async def load_items():
+        # For now, return items from all tenants (or filter by tenant in production)
+        result = await db.execute(
+            select(MenuItem).where(MenuItem.is_available == True)
+        )
+        items = result.scalars().all()
+        return [MenuItemResponse.model_validate(i).model_dump(mode="json") for i in items]
     
-    return items
+    return await menu_cache.get_or_load("items", load_items)
 
 
 @router.get("/categories", response_model=List[CategoryResponse])
 async def get_categories(
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get all categories (public endpoint for kiosk).
     
+    Served from the in-process LRU, then Redis, then the database.
+    
     Args:
         db: Database session
         
     Returns:
         List[CategoryResponse]: List of categories
     """
-    categories = db.query(Category).filter(
-        Category.is_active == True
-    ).order_by(Category.display_order).all()
+    async def load_categories():
+        result = await db.execute(
+            select(Category).where(
+                Category.is_active == True
+            ).order_by(Category.display_order)
+        )
+        categories = result.scalars().all()
+        return [CategoryResponse.model_validate(c).model_dump(mode="json") for c in categories]
+    
+    return await menu_cache.get_or_load("categories", load_categories)
+
+
+async def build_bootstrap_payload(db: AsyncSession, tenant_id: int, version: int) -> bytes:
+    """
+    Serialize categories, available items and brand config for a tenant.
+    
+    Args:
+        db: Database session
+        tenant_id: Tenant ID
+        version: Bundle version to embed in the payload
+        
+    Returns:
+        bytes: Compact JSON payload
+    """
+    # Read the change log position first so a concurrent write is replayed
+    # by the next delta sync rather than lost
+    menu_version = await latest_menu_version(db, tenant_id)
+    
+    result = await db.execute(
+        select(Category).where(
+            Category.tenant_id == tenant_id,
+            Category.is_active == True
+        ).order_by(Category.display_order)
+    )
+    categories = result.scalars().all()
+    
+    result = await db.execute(
+        select(MenuItem).where(
+            MenuItem.tenant_id == tenant_id,
+            MenuItem.is_available == True
+        )
+    )
+    items = result.scalars().all()
+    
+    result = await db.execute(
+        select(BrandConfig).where(BrandConfig.tenant_id == tenant_id)
+    )
+    brand_config = result.scalar_one_or_none()
+    brand = (
+        BrandConfigResponse.model_validate(brand_config)
+        if brand_config else default_brand_config(tenant_id)
+    )
+    
+    bundle = {
+        "version": version,
+        "menu_version": menu_version,
+        "tenant_id": tenant_id,
+        "categories": [CategoryResponse.model_validate(c).model_dump(mode="json") for c in categories],
+        "items": [MenuItemResponse.model_validate(i).model_dump(mode="json") for i in items],
+        "brand": brand.model_dump(mode="json"),
+    }
+    return json.dumps(bundle, separators=(",", ":")).encode("utf-8")
+
+
+@router.get("/bootstrap")
+async def get_bootstrap(
+    request: Request,
+    tenant_id: int = 1,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get the kiosk bootstrap bundle (public endpoint for kiosk).
+    
+    Returns categories, available menu items and brand configuration in a
+    single pre-serialized payload. The bundle is rebuilt only after a menu or
+    branding write, so repeated cold starts are served from memory.
+    
+    Args:
+        request: Incoming request (used for conditional GETs)
+        tenant_id: Tenant ID (kiosk default is 1)
+        db: Database session
+        
+    Returns:
+        Response: JSON bundle, or 304 if the client's copy is current
+    """
+    bundle = bootstrap_cache.get(tenant_id)
+    if bundle is None:
+        version = bootstrap_cache.current_version(tenant_id)
+        bundle = bootstrap_cache.store(
+            tenant_id, version, await build_bootstrap_payload(db, tenant_id, version)
+        )
+    
+    headers = {"ETag": bundle.etag, "X-Bundle-Version": str(bundle.version)}
+    if request.headers.get("if-none-match") == bundle.etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    return Response(content=bundle.payload, media_type="application/json", headers=headers)
+
+
+@router.get("/changes", response_model=MenuChangesResponse)
+async def get_menu_changes(
+    since: int = 0,
+    tenant_id: int = 1,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get menu items changed after a menu version (public endpoint for kiosk).
+    
+    Items are returned in their current state, including ones that became
+    unavailable. Deleted items are returned as tombstone IDs. Pass the
+    returned version as `since` on the next call.
+    
+    Args:
+        since: Last menu version the kiosk has applied
+        tenant_id: Tenant ID (kiosk default is 1)
+        db: Database session
+        
+    Returns:
+        MenuChangesResponse: Changed items, deleted item IDs and the new version
+    """
+    result = await db.execute(
+        select(
+            MenuChange.version, MenuChange.menu_item_id, MenuChange.change_type
+        ).where(
+            MenuChange.tenant_id == tenant_id,
+            MenuChange.version > since
+        ).order_by(MenuChange.version, MenuChange.id)
+    )
+    changes = result.all()
+    
+    if not changes:
+        return MenuChangesResponse(version=since, items=[], deleted=[])
+    
+    # Only the last change per item matters
+    latest = {}
+    for version, menu_item_id, change_type in changes:
+        latest[menu_item_id] = change_type
+    
+    deleted = [item_id for item_id, change_type in latest.items() if change_type == MenuChangeType.DELETE]
+    upserted = [item_id for item_id, change_type in latest.items() if change_type == MenuChangeType.UPSERT]
+    
+    items = []
+    if upserted:
+        result = await db.execute(
+            select(MenuItem).where(
+                MenuItem.tenant_id == tenant_id,
+                MenuItem.id.in_(upserted)
+            )
+        )
+        items = result.scalars().all()
     
-    return categories
+    return MenuChangesResponse(
+        version=changes[-1].version,
+        items=[MenuItemResponse.model_validate(i) for i in items],
+        deleted=deleted
+    )
@@ -0,0 +1,389 @@
+"""Bulk menu import/export API endpoints."""
+import csv
+from decimal import Decimal
+from typing import Any, AsyncIterator, Dict, Iterator, List, Literal, Tuple
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, ValidationError, field_validator
+from sqlalchemy import func, select
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db, AsyncSessionLocal
+from app.models import Category, MenuItem, MenuChangeType, DEFAULT_STATION
+from app.api.deps import get_current_tenant_id
+from app.core.menu_cache import invalidate_menu
+from app.core.menu_changes import record_menu_changes
+from app.core.stations import check_station
+from app.core.streaming import chunked, iter_csv, iter_ndjson, stream_csv, stream_ndjson
+
+router = APIRouter()
+
+# Rows validated and upserted per statement
+IMPORT_CHUNK_SIZE = 500
+
+# Rows fetched per round trip while exporting
+EXPORT_BATCH_SIZE = 500
+
+# Row errors returned in an import report
+MAX_REPORTED_ERRORS = 1000
+
+# Columns of the v1 "Restaurant Menu - Food Items.csv" file
+V1_CSV_HEADER = ["SL.", "Food Item", "Category", "Type", "Price"]
+V1_DIETARY_TAGS = {"veg": ["veg"], "non-veg": ["non-veg"], "either": ["veg", "non-veg"]}
+
+ITEM_COLUMNS = ["name", "category", "price", "discount_percentage", "description", "image_url", "is_available", "dietary_tags"]
+CATEGORY_COLUMNS = ["name", "display_order", "is_active", "station"]
+
+Resource = Literal["items", "categories"]
+FileFormat = Literal["csv", "ndjson"]
+
+
+class MenuItemImportRow(BaseModel):
+    """One menu item in an import file."""
+    name: str = Field(min_length=1, max_length=100)
+    category: str = Field(min_length=1, max_length=50)
+    price: Decimal = Field(ge=0, max_digits=10, decimal_places=2)
+    discount_percentage: Decimal = Field(default=Decimal(0), ge=0, le=100, decimal_places=2)
+    description: str | None = None
+    image_url: str | None = Field(default=None, max_length=255)
+    is_available: bool = True
+    dietary_tags: List[str] | None = None
+
+
+class CategoryImportRow(BaseModel):
+    """One category in an import file."""
+    name: str = Field(min_length=1, max_length=50)
+    display_order: int = 0
+    is_active: bool = True
+    station: str = DEFAULT_STATION
+
+    @field_validator("station")
+    @classmethod
+    def known_station(cls, station: str) -> str:
+        """Only route categories to configured kitchen stations."""
+        return check_station(station)
+
+
+class UnreadableImportFile(Exception):
+    """Raised when an import file can't be decoded or parsed."""
+
+
+class ImportRowError(BaseModel):
+    """Validation errors for one input line."""
+    line: int
+    errors: List[str]
+
+
+class ImportReport(BaseModel):
+    """Outcome of a bulk import."""
+    rows: int
+    imported: int
+    failed: int
+    dry_run: bool
+    errors: List[ImportRowError]
+
+
+def _csv_record(header: List[str], row: Dict[str, str]) -> Dict[str, Any]:
+    """Convert a CSV row (native or v1 layout) into import fields."""
+    if header == V1_CSV_HEADER:
+        # Short rows miss trailing columns; validation reports the missing fields
+        record = {
+            "name": (row.get("Food Item") or "").strip(),
+            "category": (row.get("Category") or "").strip(),
+            "price": (row.get("Price") or "").strip(),
+        }
+        tags = V1_DIETARY_TAGS.get((row.get("Type") or "").strip().lower())
+        if tags:
+            record["dietary_tags"] = tags
+        return record
+
+    record = {key: value.strip() for key, value in row.items() if key and value is not None and value.strip()}
+    if "dietary_tags" in record:
+        record["dietary_tags"] = [tag.strip() for tag in record["dietary_tags"].split("|") if tag.strip()]
+    return record
+
+
+def _read_records(file: UploadFile, file_format: FileFormat) -> Iterator[Tuple[int, Any, str | None]]:
+    """
+    Yield (line, record, parse error) from an uploaded file.
+
+    Raises:
+        UnreadableImportFile: If the file isn't UTF-8 or not valid CSV
+    """
+    try:
+        if file_format == "ndjson":
+            yield from iter_ndjson(file.file)
+            return
+
+        header, rows = iter_csv(file.file)
+        for line, row in rows:
+            yield line, _csv_record(header, row), None
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise UnreadableImportFile(str(e)) from e
+
+
+def _upsert(dialect: str, model, rows: List[dict], keys: List[str], update_columns: List[str]):
+    """Build a multi-row INSERT that updates existing rows on a key conflict."""
+    if dialect == "mysql":
+        stmt = mysql.insert(model).values(rows)
+        columns = update_columns or keys[-1:]  # No-op update keeps existing rows untouched
+        return stmt.on_duplicate_key_update({column: stmt.inserted[column] for column in columns})
+
+    dialect_insert = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}.get(dialect)
+    if dialect_insert is None:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail=f"Bulk import is not supported on {dialect}"
+        )
+    stmt = dialect_insert(model).values(rows)
+    if not update_columns:
+        return stmt.on_conflict_do_nothing(index_elements=keys)
+    return stmt.on_conflict_do_update(
+        index_elements=keys,
+        set_={column: stmt.excluded[column] for column in update_columns}
+    )
+
+
+async def _import_categories(db: AsyncSession, dialect: str, tenant_id: int, rows: List[CategoryImportRow]) -> None:
+    """Upsert a chunk of categories."""
+    await db.execute(_upsert(
+        dialect,
+        Category,
+        [dict(row.model_dump(), tenant_id=tenant_id) for row in rows],
+        keys=["tenant_id", "name"],
+        update_columns=sorted(set.intersection(*(row.model_fields_set for row in rows)) - {"name"})
+    ))
+
+
+async def _category_ids(db: AsyncSession, tenant_id: int, names: List[str]) -> Dict[str, int]:
+    """Map lower-cased category names to the tenant's category IDs, oldest first."""
+    result = await db.execute(
+        select(Category.name, Category.id).where(
+            Category.tenant_id == tenant_id,
+            func.lower(Category.name).in_({name.lower() for name in names})
+        ).order_by(Category.id)
+    )
+    category_ids: Dict[str, int] = {}
+    for name, category_id in result.all():
+        category_ids.setdefault(name.lower(), category_id)
+    return category_ids
+
+
+async def _import_items(db: AsyncSession, dialect: str, tenant_id: int, rows: List[MenuItemImportRow]) -> None:
+    """
+    Upsert a chunk of menu items (creating missing categories) and log the changes.
+
+    Category names match case-insensitively, as MySQL's collation compares
+    them, so "drinks" in a file finds an existing "Drinks".
+
+    Raises:
+        HTTPException: 400 if a category name still matches no category
+    """
+    category_ids = await _category_ids(db, tenant_id, [row.category for row in rows])
+    missing: Dict[str, str] = {}
+    for row in rows:
+        if row.category.lower() not in category_ids:
+            missing.setdefault(row.category.lower(), row.category)  # First spelling wins
+    if missing:
+        await db.execute(_upsert(
+            dialect,
+            Category,
+            [
+                {"tenant_id": tenant_id, "name": name, "display_order": 0, "is_active": True}
+                for name in sorted(missing.values())
+            ],
+            keys=["tenant_id", "name"],
+            update_columns=[]
+        ))
+        category_ids = await _category_ids(db, tenant_id, [row.category for row in rows])
+
+    # e.g. accented names an accent-insensitive collation merged with an existing category
+    unknown = sorted({row.category for row in rows if row.category.lower() not in category_ids})
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown category: {', '.join(unknown)}"
+        )
+
+    # Only overwrite columns every row in the chunk provided
+    provided = set.intersection(*(row.model_fields_set for row in rows))
+    update_columns = sorted((provided - {"name", "category"}) | {"category_id"})
+    await db.execute(_upsert(
+        dialect,
+        MenuItem,
+        [
+            dict(row.model_dump(exclude={"category"}), tenant_id=tenant_id, category_id=category_ids[row.category.lower()])
+            for row in rows
+        ],
+        keys=["tenant_id", "name"],
+        update_columns=update_columns
+    ))
+
+    result = await db.execute(
+        select(MenuItem.id).where(
+            MenuItem.tenant_id == tenant_id,
+            MenuItem.name.in_([row.name for row in rows])
+        )
+    )
+    await record_menu_changes(db, tenant_id, result.scalars().all(), MenuChangeType.UPSERT)
+
+
+@router.post("/import", response_model=ImportReport)
+async def import_menu(
+    file: UploadFile = File(...),
+    resource: Resource = "items",
+    file_format: FileFormat = Query("csv", alias="format"),
+    dry_run: bool = False,
+    tenant_id: int = Depends(get_current_tenant_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Bulk upsert menu items or categories from a CSV or NDJSON file.
+
+    The file is parsed incrementally and validated in chunks of
+    IMPORT_CHUNK_SIZE rows; each chunk is one multi-row upsert keyed on
+    (tenant_id, name). The whole import is one transaction with a single
+    menu cache invalidation. Invalid rows are skipped and reported.
+
+    Item files use the columns name, category, price, discount_percentage,
+    description, image_url, is_available and dietary_tags (separated by
+    "|" in CSV); categories match by name case-insensitively and unknown
+    ones are created. The v1
+    "Restaurant Menu - Food Items.csv" layout is accepted as well.
+    Category files use the columns name, display_order, is_active and
+    station (one of KITCHEN_STATIONS).
+
+    Args:
+        file: CSV or NDJSON file
+        resource: "items" or "categories"
+        file_format: "csv" or "ndjson"
+        dry_run: Validate only, without writing anything
+        tenant_id: Current tenant ID
+        db: Database session
+
+    Returns:
+        ImportReport: Row counts and per-row errors
+
+    Raises:
+        HTTPException: 400 if the file can't be decoded or parsed, or an item's
+        category matches no category
+    """
+    row_model = MenuItemImportRow if resource == "items" else CategoryImportRow
+    import_chunk = _import_items if resource == "items" else _import_categories
+    dialect = db.bind.dialect.name
+
+    total = 0
+    imported = 0
+    failed = 0
+    errors: List[ImportRowError] = []
+
+    def report(line: int, messages: List[str]) -> None:
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append(ImportRowError(line=line, errors=messages))
+
+    try:
+        for chunk in chunked(_read_records(file, file_format), IMPORT_CHUNK_SIZE):
+            valid: Dict[str, Any] = {}
+            for line, record, parse_error in chunk:
+                total += 1
+                if parse_error:
+                    failed += 1
+                    report(line, [parse_error])
+                    continue
+                try:
+                    row = row_model.model_validate(record)
+                except ValidationError as e:
+                    failed += 1
+                    report(line, [
+                        f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+                        for error in e.errors()
+                    ])
+                    continue
+                # A later row for the same name wins
+                valid[row.name] = row
+
+            if valid and not dry_run:
+                await import_chunk(db, dialect, tenant_id, list(valid.values()))
+            imported += len(valid)
+    except UnreadableImportFile as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unreadable {file_format} file: {e}"
+        )
+
+    if dry_run or not imported:
+        await db.rollback()
+    else:
+        await db.commit()
+        await invalidate_menu(tenant_id)
+
+    return ImportReport(rows=total, imported=imported, failed=failed, dry_run=dry_run, errors=errors)
+
+
+async def _export_records(tenant_id: int, resource: Resource) -> AsyncIterator[dict]:
+    """Stream a tenant's items or categories as export records."""
+    if resource == "items":
+        query = select(
+            MenuItem.name, Category.name, MenuItem.price, MenuItem.discount_percentage,
+            MenuItem.description, MenuItem.image_url, MenuItem.is_available, MenuItem.dietary_tags
+        ).join(Category, MenuItem.category_id == Category.id).where(
+            MenuItem.tenant_id == tenant_id
+        ).order_by(Category.display_order, Category.id, MenuItem.id)
+        columns = ITEM_COLUMNS
+    else:
+        query = select(Category.name, Category.display_order, Category.is_active, Category.station).where(
+            Category.tenant_id == tenant_id
+        ).order_by(Category.display_order, Category.id)
+        columns = CATEGORY_COLUMNS
+
+    # Own session: the response outlives the request's dependencies
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for row in result:
+            yield dict(zip(columns, row))
+
+
+async def _csv_values(records: AsyncIterator[dict], columns: List[str]) -> AsyncIterator[list]:
+    """Flatten export records into CSV values."""
+    async for record in records:
+        if record.get("dietary_tags") is not None:
+            record["dietary_tags"] = "|".join(record["dietary_tags"])
+        yield [record[column] for column in columns]
+
+
+@router.get("/export")
+async def export_menu(
+    resource: Resource = "items",
+    file_format: FileFormat = Query("csv", alias="format"),
+    tenant_id: int = Depends(get_current_tenant_id)
+):
+    """
+    Stream the tenant's menu items or categories as CSV or NDJSON.
+
+    Rows are read with a server-side cursor in batches of EXPORT_BATCH_SIZE
+    and written out as they arrive, so memory stays flat for any menu size.
+    The output can be imported again unchanged.
+
+    Args:
+        resource: "items" or "categories"
+        file_format: "csv" or "ndjson"
+        tenant_id: Current tenant ID
+
+    Returns:
+        StreamingResponse: Export file
+    """
+    records = _export_records(tenant_id, resource)
+    if file_format == "csv":
+        columns = ITEM_COLUMNS if resource == "items" else CATEGORY_COLUMNS
+        body = stream_csv(columns, _csv_values(records, columns))
+        media_type = "text/csv"
+    else:
+        body = stream_ndjson(records)
+        media_type = "application/x-ndjson"
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="menu-{resource}.{file_format}"'}
+    )
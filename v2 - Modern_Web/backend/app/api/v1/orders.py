@@ -1,19 +1,36 @@
 """Order API endpoints."""
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-import uuid
-from datetime import datetime
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import insert, select
+from sqlalchemy.orm import selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Tuple
+from decimal import Decimal
+import hashlib
+from datetime import date, datetime, timezone
+import redis
 
+from app.config import settings
 from app.database import get_db
 from app.models import Order, OrderItem, MenuItem, OrderStatus, PaymentStatus
-from pydantic import BaseModel
+from app.core.pricing import pricing_engine, PricingError, Quote, CENT
+from app.core.outbox import add_outbox_event, KITCHEN_QUEUE
+from app.core.order_events import order_events_topic, order_created_event
+from app.core.order_numbers import order_numbers
+from app.core.ingest import order_ingest, IngestBackpressure
+from app.core.idempotency import idempotency_store, IdempotencyKeyMismatch, IdempotencyInProgress
+from pydantic import BaseModel, Field
 
 router = APIRouter()
 
-class OrderItemCreate(BaseModel):
+class QuoteItem(BaseModel):
     menu_item_id: int
-    quantity: int
+    quantity: int = Field(gt=0)
+
+class QuoteRequest(BaseModel):
+    items: List[QuoteItem]
+
+class OrderItemCreate(QuoteItem):
     unit_price: float
 
 class OrderCreate(BaseModel):
@@ -23,6 +40,19 @@ class OrderCreate(BaseModel):
     items: List[OrderItemCreate]
 
 
+class QuoteLineResponse(BaseModel):
+    menu_item_id: int
+    quantity: int
+    unit_price: Decimal
+    discount_percentage: Decimal
+    subtotal: Decimal
+
+class QuoteResponse(BaseModel):
+    """Server-computed cart price."""
+    items: List[QuoteLineResponse]
+    total_amount: Decimal
+
+
 class MenuItemMinimal(BaseModel):
     name: str
     image_url: str | None
@@ -31,7 +61,7 @@ class MenuItemMinimal(BaseModel):
         from_attributes = True
 
 class OrderItemResponse(BaseModel):
-    id: int
+    id: int | None = None  # Not known for cards built from order events
     menu_item_id: int
     quantity: int
     unit_price: float
@@ -46,6 +76,7 @@ class OrderResponse(BaseModel):
     """Order response model."""
     id: int
     order_number: str
+    order_date: date | None = None  # Numbers restart daily; None on cards from before it was sent
     total_amount: float
     status: OrderStatus
     payment_status: PaymentStatus
@@ -55,66 +86,380 @@ class OrderResponse(BaseModel):
     class Config:
         from_attributes = True
 
-@router.post("", status_code=status.HTTP_201_CREATED)
-async def create_order(
-    order_data: OrderCreate,
-    db: Session = Depends(get_db)
+def quote_response(quote: Quote) -> QuoteResponse:
+    """
+    Convert a pricing engine quote into its response model.
+    
+    Args:
+        quote: Priced cart
+        
+    Returns:
+        QuoteResponse: Serializable quote
+    """
+    return QuoteResponse(
+        items=[QuoteLineResponse(**line._asdict()) for line in quote.lines],
+        total_amount=quote.total_amount
+    )
+
+
+async def price_cart(db: AsyncSession, tenant_id: int, items: List[QuoteItem]) -> Quote:
+    """
+    Price a cart, turning pricing errors into HTTP errors.
+    
+    Args:
+        db: Database session
+        tenant_id: Tenant ID
+        items: Cart lines
+        
+    Returns:
+        Quote: Priced cart
+        
+    Raises:
+        HTTPException: 409 if the cart references unknown or unavailable items
+    """
+    try:
+        return await pricing_engine.quote(
+            db, tenant_id, [(item.menu_item_id, item.quantity) for item in items]
+        )
+    except PricingError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"message": str(e), "menu_item_ids": e.menu_item_ids}
+        )
+
+
+def check_cart_prices(order_data: OrderCreate, quote: Quote) -> None:
+    """
+    Reject a cart whose prices differ from the server quote.
+    
+    Client prices are computed from unrounded floats, so each unit may be off
+    by up to a cent.
+    
+    Args:
+        order_data: Submitted order
+        quote: Server quote for the same lines
+        
+    Raises:
+        HTTPException: 409 with the current quote if the cart is stale or tampered
+    """
+    stale = any(
+        abs(Decimal(str(item.unit_price)) - line.unit_price) >= CENT
+        for item, line in zip(order_data.items, quote.lines)
+    )
+    tolerance = CENT * max(sum(item.quantity for item in order_data.items), 1)
+    if stale or abs(Decimal(str(order_data.total_amount)) - quote.total_amount) > tolerance:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "message": "Cart prices are out of date",
+                "quote": quote_response(quote).model_dump(mode="json")
+            }
+        )
+
+
+@router.post("/quote", response_model=QuoteResponse)
+async def quote_order(
+    quote_data: QuoteRequest,
+    db: AsyncSession = Depends(get_db)
 ):
     """
-    Create a new customer order from the kiosk.
+    Price a cart on the server (public endpoint for kiosk).
+    
+    Served from the in-memory price snapshot, so it is cheap enough to call
+    on every cart change.
+    
+    Args:
+        quote_data: Cart lines
+        db: Database session (only used to load the price snapshot)
+        
+    Returns:
+        QuoteResponse: Unit prices, line subtotals and total
     """
     # For now, we use a default tenant_id = 1 (Test Restaurant)
-    # In multi-tenant, this would come from the request context or URL
-    tenant_id = 1
+    quote = await price_cart(db, 1, quote_data.items)
+    return quote_response(quote)
+
+
+async def place_order(db: AsyncSession, tenant_id: int, order_data: OrderCreate) -> dict:
+    """
+    Price, persist and enqueue an order.
     
-    # Generate a short unique order number
-    order_number = str(uuid.uuid4().hex[:6]).upper()
+    The order, all of its items and the kitchen queue message are written in
+    a single transaction: the order ID comes back from the flush and the
+    items go in with one multi-row insert. Redis is not called here; the
+    outbox relay delivers the message.
+    
+    Args:
+        db: Database session
+        tenant_id: Tenant ID
+        order_data: Submitted order
+        
+    Returns:
+        dict: Order ID and number
+        
+    Raises:
+        HTTPException: 409 if the cart is stale or tampered
+    """
+    quote = await price_cart(db, tenant_id, order_data.items)
+    check_cart_prices(order_data, quote)
+    
+    # Short per-day number (e.g. A-042) served from a reserved block
+    order_date, order_number = await order_numbers.allocate(tenant_id)
     
-    from datetime import timezone
     # Create order record
     new_order = Order(
         tenant_id=tenant_id,
         order_number=order_number,
-        total_amount=order_data.total_amount,
+        order_date=order_date,
+        total_amount=quote.total_amount,
         status=OrderStatus.PENDING,
         payment_status=PaymentStatus.PAID if order_data.payment_method != "CASH" else PaymentStatus.UNPAID,
         created_at=datetime.now(timezone.utc)
     )
     
     db.add(new_order)
-    db.commit()
-    db.refresh(new_order)
+    await db.flush()
     
     # Create order items
-    for item in order_data.items:
-        order_item = OrderItem(
-            order_id=new_order.id,
-            menu_item_id=item.menu_item_id,
-            quantity=item.quantity,
-            unit_price=item.unit_price,
-            subtotal=item.quantity * item.unit_price
+    if order_data.items:
+        await db.execute(
+            insert(OrderItem),
+            [
+                {
+                    "order_id": new_order.id,
+                    "menu_item_id": line.menu_item_id,
+                    "quantity": line.quantity,
+                    "unit_price": line.unit_price,
+                    "subtotal": line.subtotal
+                }
+                for line in quote.lines
+            ]
         )
-        db.add(order_item)
     
-    db.commit()
+    # Queue for Kitchen/Workers; the outbox relay pushes it to Redis after commit
+    add_outbox_event(db, KITCHEN_QUEUE, {
+        "order_id": new_order.id,
+        "order_number": order_number,
+        "order_date": order_date.isoformat(),
+        "tenant_id": tenant_id,
+        "items": [
+            {
+                "menu_item_id": line.menu_item_id,
+                "quantity": line.quantity,
+                "unit_price": float(line.unit_price)
+            }
+            for line in quote.lines
+        ],
+        "created_at": new_order.created_at.isoformat()
+    })
+    # Pushed to connected kitchen displays
+    add_outbox_event(db, order_events_topic(tenant_id), order_created_event({
+        "id": new_order.id,
+        "order_number": order_number,
+        "order_date": order_date.isoformat(),
+        "status": new_order.status.value,
+        "payment_status": new_order.payment_status.value,
+        "total_amount": float(quote.total_amount),
+        "created_at": new_order.created_at.isoformat(),
+        "items": [
+            {
+                "menu_item_id": line.menu_item_id,
+                "quantity": line.quantity,
+                "unit_price": float(line.unit_price),
+                "subtotal": float(line.subtotal)
+            }
+            for line in quote.lines
+        ]
+    }))
+    
+    await db.commit()
+    
+    return {
+        "id": new_order.id,
+        "order_number": order_number,
+        "order_date": order_date.isoformat(),
+        "message": "Order placed successfully"
+    }
 
-    # Push to Redis Queue for Kitchen/Workers
+
+async def accept_order(db: AsyncSession, tenant_id: int, order_data: OrderCreate) -> dict:
+    """
+    Price an order and append it to the write-behind ingest stream.
+    
+    The order is written to MySQL later by ingest_writer.py, so only the
+    order number is known when this returns.
+    
+    Args:
+        db: Database session (only used to load the price snapshot)
+        tenant_id: Tenant ID
+        order_data: Submitted order
+        
+    Returns:
+        dict: Order number and acceptance message
+        
+    Raises:
+        HTTPException: 409 if the cart is stale or tampered, 503 if the
+        ingest stream is saturated
+    """
+    quote = await price_cart(db, tenant_id, order_data.items)
+    check_cart_prices(order_data, quote)
+    
+    order_date, order_number = await order_numbers.allocate(tenant_id)
+    payment_status = PaymentStatus.PAID if order_data.payment_method != "CASH" else PaymentStatus.UNPAID
+    
     try:
-        from app.core.cache import cache
-        queue_payload = {
-            "order_id": new_order.id,
+        await order_ingest.submit(tenant_id, {
             "order_number": order_number,
+            "order_date": order_date.isoformat(),
             "tenant_id": tenant_id,
-            "items": [item.dict() for item in order_data.items],
-            "created_at": new_order.created_at.isoformat()
-        }
-        cache.lpush("kitchen_orders", queue_payload)
-    except Exception as e:
-        # Log error but don't fail the request if redis is down
-        print(f"Failed to push to redis queue: {e}")
+            "total_amount": str(quote.total_amount),
+            "payment_status": payment_status.value,
+            "items": [
+                {
+                    "menu_item_id": line.menu_item_id,
+                    "quantity": line.quantity,
+                    "unit_price": str(line.unit_price),
+                    "subtotal": str(line.subtotal)
+                }
+                for line in quote.lines
+            ],
+            "created_at": datetime.now(timezone.utc).isoformat()
+        })
+    except IngestBackpressure as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "2"}
+        )
     
     return {
-        "id": new_order.id,
+        "id": None,
         "order_number": order_number,
-        "message": "Order placed successfully"
+        "order_date": order_date.isoformat(),
+        "message": "Order accepted"
     }
+
+
+async def submit_order(db: AsyncSession, tenant_id: int, order_data: OrderCreate) -> Tuple[int, dict]:
+    """
+    Create an order using the configured ingestion mode.
+    
+    Args:
+        db: Database session
+        tenant_id: Tenant ID
+        order_data: Submitted order
+        
+    Returns:
+        Tuple[int, dict]: Response status code and body
+    """
+    if settings.ORDER_INGEST_MODE == "write_behind":
+        try:
+            return status.HTTP_202_ACCEPTED, await accept_order(db, tenant_id, order_data)
+        except redis.RedisError as e:
+            # Fall back to writing synchronously rather than losing the order
+            print(f"Ingest stream unavailable, writing order directly: {e}")
+    
+    return status.HTTP_201_CREATED, await place_order(db, tenant_id, order_data)
+
+
+@router.post("", status_code=status.HTTP_201_CREATED)
+async def create_order(
+    order_data: OrderCreate,
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key", max_length=128),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create a new customer order from the kiosk.
+    
+    Prices are recomputed on the server; carts with stale or tampered prices
+    are rejected. In write-behind mode the order is queued and 202 is
+    returned. When an Idempotency-Key header is sent, retries with the same
+    key replay the first response instead of creating another order.
+    """
+    # For now, we use a default tenant_id = 1 (Test Restaurant)
+    # In multi-tenant, this would come from the request context or URL
+    tenant_id = 1
+    
+    if not idempotency_key:
+        status_code, result = await submit_order(db, tenant_id, order_data)
+        return JSONResponse(status_code=status_code, content=result)
+    
+    fingerprint = hashlib.sha256(order_data.model_dump_json().encode("utf-8")).hexdigest()
+    try:
+        stored, lock = await idempotency_store.begin(tenant_id, idempotency_key, fingerprint)
+    except IdempotencyKeyMismatch as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    except IdempotencyInProgress as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except redis.RedisError as e:
+        # Without Redis we can't deduplicate; accept the order rather than fail it
+        print(f"Idempotency store unavailable: {e}")
+        status_code, result = await submit_order(db, tenant_id, order_data)
+        return JSONResponse(status_code=status_code, content=result)
+    
+    if stored is not None:
+        return JSONResponse(
+            status_code=stored.status_code,
+            content=stored.body,
+            headers={"Idempotent-Replayed": "true"}
+        )
+    
+    try:
+        status_code, result = await submit_order(db, tenant_id, order_data)
+    except BaseException:
+        await idempotency_store.release(tenant_id, idempotency_key, lock)
+        raise
+    
+    try:
+        await idempotency_store.complete(
+            tenant_id, idempotency_key, fingerprint, lock, status_code, result
+        )
+    except redis.RedisError as e:
+        print(f"Failed to store idempotent response: {e}")
+    return JSONResponse(status_code=status_code, content=result)
+
+
+@router.get("/{order_number}", response_model=OrderResponse)
+async def get_order(
+    order_number: str,
+    order_date: date | None = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get an order by its number (public endpoint for kiosk).
+    
+    Order numbers restart every day, so the number alone is ambiguous;
+    the lookup is by number and UTC day, which defaults to today.
+    
+    Args:
+        order_number: Order number (e.g. A-042)
+        order_date: UTC day the number belongs to (default: today)
+        db: Database session
+        
+    Returns:
+        OrderResponse: The order with its items
+        
+    Raises:
+        HTTPException: 404 if there is no such order
+    """
+    # For now, we use a default tenant_id = 1 (Test Restaurant)
+    tenant_id = 1
+    
+    result = await db.execute(
+        select(Order).options(
+            selectinload(Order.items).selectinload(OrderItem.menu_item)
+        ).where(
+            Order.tenant_id == tenant_id,
+            Order.order_date == (order_date or datetime.now(timezone.utc).date()),
+            Order.order_number == order_number
+        )
+    )
+    order = result.scalar_one_or_none()
+    
+    if not order:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Order not found"
+        )
+    
+    return order
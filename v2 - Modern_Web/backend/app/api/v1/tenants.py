@@ -1,6 +1,7 @@
 """Tenant management API endpoints."""
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from app.database import get_db
 from app.models import Tenant, TenantStatus
@@ -28,7 +29,7 @@ class TenantResponse(BaseModel):
 @router.post("/", response_model=TenantResponse, status_code=status.HTTP_201_CREATED)
 async def create_tenant(
     tenant_data: TenantCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Create a new tenant.
@@ -41,7 +42,8 @@ async def create_tenant(
         TenantResponse: Created tenant
     """
     # Check if slug already exists
-    existing_tenant = db.query(Tenant).filter(Tenant.slug == tenant_data.slug).first()
+    result = await db.execute(select(Tenant).where(Tenant.slug == tenant_data.slug))
+    existing_tenant = result.scalar_one_or_none()
     if existing_tenant:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -50,8 +52,8 @@ async def create_tenant(
     
     new_tenant = Tenant(**tenant_data.dict())
     db.add(new_tenant)
-    db.commit()
-    db.refresh(new_tenant)
+    await db.commit()
+    await db.refresh(new_tenant)
     
     return new_tenant
 
@@ -59,7 +61,7 @@ async def create_tenant(
 @router.get("/{tenant_id}", response_model=TenantResponse)
 async def get_tenant(
     tenant_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get tenant by ID.
@@ -71,7 +73,7 @@ async def get_tenant(
     Returns:
         TenantResponse: Tenant details
     """
-    tenant = db.query(Tenant).filter(Tenant.id == tenant_id).first()
+    tenant = await db.get(Tenant, tenant_id)
     
     if not tenant:
         raise HTTPException(
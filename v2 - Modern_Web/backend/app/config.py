@@ -14,6 +14,7 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str
+    ASYNC_DATABASE_URL: str = ""  # Derived from DATABASE_URL when empty
     DATABASE_HOST: str = "localhost"
     DATABASE_PORT: int = 3306
     DATABASE_USER: str = "root"
@@ -26,6 +27,54 @@ class Settings(BaseSettings):
     REDIS_DB: int = 0
     REDIS_PASSWORD: str = ""
     
+    # Menu cache
+    MENU_CACHE_LOCAL_SIZE: int = 256
+    MENU_CACHE_TTL: int = 300
+    
+    # Idempotency keys
+    IDEMPOTENCY_TTL: int = 86400
+    IDEMPOTENCY_LOCK_TTL: int = 30
+    IDEMPOTENCY_WAIT_TIMEOUT: float = 10.0
+    
+    # Outbox relay
+    OUTBOX_BATCH_SIZE: int = 200
+    OUTBOX_POLL_INTERVAL: float = 0.2
+    
+    # Order events pushed to KDS clients (entries kept per tenant stream)
+    ORDER_EVENTS_MAXLEN: int = 1000
+    
+    # Order ingestion: "sync" writes to MySQL in the request, "write_behind"
+    # appends to a Redis Stream and returns 202 (see ingest_writer.py)
+    ORDER_INGEST_MODE: str = "sync"
+    ORDER_INGEST_SHARDS: int = 4
+    ORDER_INGEST_MAX_PENDING: int = 5000
+    ORDER_INGEST_BATCH_SIZE: int = 500
+    
+    # Kitchen queue (Redis Stream): pending time before a crashed worker's
+    # orders are reclaimed, and deliveries before one is dead-lettered
+    KITCHEN_QUEUE_CLAIM_IDLE_MS: int = 60000
+    KITCHEN_QUEUE_MAX_DELIVERIES: int = 5
+    
+    # Kitchen worker: orders in flight per process, and seconds to finish
+    # them after SIGTERM (keep below the container stop grace period)
+    KITCHEN_WORKER_CONCURRENCY: int = 32
+    KITCHEN_WORKER_DRAIN_TIMEOUT: float = 8.0
+    # Orders per stream read, rollup transaction and ack pipeline, and the
+    # longest wait (ms) to fill a batch once its first order arrives
+    KITCHEN_WORKER_BATCH_SIZE: int = 32
+    KITCHEN_WORKER_BATCH_MAX_WAIT_MS: int = 50
+    # Order lines each tenant may start per deficit round robin turn, so
+    # one tenant's burst can't delay the others' tickets
+    KITCHEN_WORKER_TENANT_QUANTUM: int = 8
+    
+    # Kitchen stations categories can be routed to (comma-separated); each
+    # has its own ticket queue. Must include "kitchen", the default station
+    KITCHEN_STATIONS: str = "kitchen,grill,drinks,desserts"
+    
+    # Order numbers: blocks reserved from "db" (order_sequences) or "redis" (INCRBY)
+    ORDER_NUMBER_BACKEND: str = "db"
+    ORDER_NUMBER_BLOCK_SIZE: int = 20
+    
     # JWT
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
@@ -40,6 +89,11 @@ class Settings(BaseSettings):
         """Convert comma-separated CORS origins to list."""
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
     
+    @property
+    def kitchen_stations_list(self) -> List[str]:
+        """Convert comma-separated kitchen stations to list."""
+        return [station.strip() for station in self.KITCHEN_STATIONS.split(",")]
+    
     # Email
     SMTP_HOST: str = ""
     SMTP_PORT: int = 587
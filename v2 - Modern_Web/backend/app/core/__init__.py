@@ -5,7 +5,8 @@ from app.core.security import (
     create_access_token,
     decode_access_token
 )
-from app.core.cache import cache
+from app.core.cache import cache, invalidator
+from app.core.bootstrap import bootstrap_cache
 
 __all__ = [
     "verify_password",
@@ -13,4 +14,6 @@ __all__ = [
     "create_access_token",
     "decode_access_token",
     "cache",
+    "invalidator",
+    "bootstrap_cache",
 ]
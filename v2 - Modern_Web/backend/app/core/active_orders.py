@@ -0,0 +1,366 @@
+"""Redis read model of each tenant's live (not completed/cancelled) orders."""
+import asyncio
+import json
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import redis
+import redis.asyncio as aioredis
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+from app.core.cache import cache
+from app.core.order_events import order_events_topic
+from app.database import SessionLocal
+from app.models import MenuItem, Order, OrderItem, OrderStatus
+
+# Statuses that take an order off the kitchen queue
+FINAL_STATUSES = {OrderStatus.COMPLETED.value, OrderStatus.CANCELLED.value}
+
+# Cards outlive any reasonable shift, in case a final event is lost
+CARD_TTL = 2 * 86400
+
+# Update a card's status only if the card still exists
+SET_STATUS_SCRIPT = """
+if redis.call("exists", KEYS[1]) == 1 then
+    return redis.call("hset", KEYS[1], "status", ARGV[1])
+end
+return 0
+"""
+
+# Delete the rebuild lock only if we still own it
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# Suffix of the keys a rebuild writes before swapping them in
+REBUILD_SUFFIX = ":rebuild"
+
+# Rebuild lock expiry in seconds, in case its owner dies
+REBUILD_LOCK_TTL = 60
+
+
+def _timestamp(created_at) -> float:
+    """Sort score for a creation time, treating naive values as UTC."""
+    if isinstance(created_at, str):
+        created_at = datetime.fromisoformat(created_at)
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return created_at.timestamp()
+
+
+class ActiveOrdersProjection:
+    """
+    Materialized kitchen queue per tenant.
+
+    kds:active:{tenant} is a sorted set of order IDs scored by creation
+    time, and kds:order:{tenant}:{id} is a hash with the pre-rendered card
+    (same shape as OrderResponse) and its current status. The outbox relay
+    applies order events to it, so reads cost O(active orders) and never
+    touch MySQL. kds:ready:{tenant} marks a projection that is complete;
+    without it (a fresh deploy or a Redis flush) readers fall back to the
+    database and schedule a rebuild.
+
+    Reads are async, for the KDS polling endpoint; the relay and rebuilds
+    write with the sync client from their own threads.
+    """
+
+    def __init__(self, redis_client, async_client: Optional[aioredis.Redis] = None):
+        """
+        Initialize the projection.
+
+        Args:
+            redis_client: Redis client for writes
+            async_client: Async Redis client for reads (default: the shared cache's)
+        """
+        self.client = redis_client
+        self._async_client = async_client
+        self._set_status = self.client.register_script(SET_STATUS_SCRIPT)
+        self._release = self.client.register_script(RELEASE_LOCK_SCRIPT)
+        self._rebuilds: Dict[int, asyncio.Task] = {}
+
+    @property
+    def async_client(self) -> aioredis.Redis:
+        """Async Redis client; the shared cache's unless one was given."""
+        return self._async_client if self._async_client is not None else cache.async_client
+
+    def _keys(self, tenant_id: int) -> Tuple[str, str]:
+        """Sorted set and ready marker keys for a tenant."""
+        return f"kds:active:{tenant_id}", f"kds:ready:{tenant_id}"
+
+    def _card_key(self, tenant_id: int, order_id: int) -> str:
+        """Card hash key for an order."""
+        return f"kds:order:{tenant_id}:{order_id}"
+
+    def apply(self, pipe, db: Session, events: Iterable[Tuple[int, dict]], suffix: str = "") -> None:
+        """
+        Queue the projection updates for a batch of order events.
+
+        Args:
+            pipe: Redis pipeline the relay executes after this call
+            db: Database session (to look up item names for new cards)
+            events: (tenant_id, event) pairs in outbox order
+            suffix: Key suffix, to apply the events to a rebuild's keys
+        """
+        events = list(events)
+        items = {
+            (tenant_id, item["menu_item_id"])
+            for tenant_id, event in events if event["type"] == "order.created"
+            for item in event["order"]["items"]
+        }
+        menu = {}
+        if items:
+            menu = {
+                (tenant_id, item_id): {"name": name, "image_url": image_url}
+                for tenant_id, item_id, name, image_url in db.execute(
+                    select(MenuItem.tenant_id, MenuItem.id, MenuItem.name, MenuItem.image_url).where(
+                        MenuItem.tenant_id.in_({tenant_id for tenant_id, _ in items}),
+                        MenuItem.id.in_({item_id for _, item_id in items})
+                    )
+                ).all()
+            }
+
+        for tenant_id, event in events:
+            order = event["order"]
+            active_key = self._keys(tenant_id)[0] + suffix
+            card_key = self._card_key(tenant_id, order["id"]) + suffix
+
+            if event["type"] == "order.created":
+                card = dict(order, items=[
+                    dict(item, special_instructions=None, menu_item=menu.get((tenant_id, item["menu_item_id"])))
+                    for item in order["items"]
+                ])
+                pipe.hset(card_key, mapping={"card": json.dumps(card), "status": order["status"]})
+                pipe.expire(card_key, CARD_TTL)
+                pipe.zadd(active_key, {order["id"]: _timestamp(order["created_at"])})
+            elif event["type"] == "order.status_changed":
+                if order["status"] in FINAL_STATUSES:
+                    pipe.zrem(active_key, order["id"])
+                    pipe.delete(card_key)
+                else:
+                    self._set_status(keys=[card_key], args=[order["status"]], client=pipe)
+
+    async def read(
+        self,
+        tenant_id: int,
+        statuses: Iterable[str],
+        since: datetime,
+        limit: int
+    ) -> Optional[List[dict]]:
+        """
+        Read a tenant's active orders, oldest first.
+
+        Args:
+            tenant_id: Tenant ID
+            statuses: Status values to include
+            since: Skip orders created before this
+            limit: Maximum number of orders
+
+        Returns:
+            Optional[List[dict]]: Order cards, or None if the projection isn't
+            built (or Redis is down) and the caller should query MySQL
+        """
+        active_key, ready_key = self._keys(tenant_id)
+        statuses = set(statuses)
+        try:
+            pipe = self.async_client.pipeline(transaction=False)
+            pipe.exists(ready_key)
+            pipe.zrangebyscore(active_key, _timestamp(since), "+inf")
+            ready, order_ids = await pipe.execute()
+            if not ready:
+                return None
+            pipe = self.async_client.pipeline(transaction=False)
+            for order_id in order_ids:
+                pipe.hgetall(self._card_key(tenant_id, order_id))
+            cards = await pipe.execute()
+        except redis.RedisError as e:
+            print(f"Active orders projection unavailable: {e}")
+            return None
+
+        orders = []
+        expired = []
+        for order_id, card in zip(order_ids, cards):
+            if "card" not in card:
+                expired.append(order_id)
+                continue
+            if card["status"] in statuses:
+                orders.append(dict(json.loads(card["card"]), status=card["status"]))
+                if len(orders) >= limit:
+                    break
+
+        if expired:
+            try:
+                await self.async_client.zrem(active_key, *expired)
+            except redis.RedisError:
+                pass
+        return orders
+
+    def rebuild(self, db: Session, tenant_id: int) -> int:
+        """
+        Regenerate a tenant's projection from MySQL and mark it ready.
+
+        The snapshot is written to temporary keys while the relay keeps
+        updating the live ones. Events the relay streamed after the
+        snapshot began are then replayed onto the temporary keys, and
+        the keys are renamed in, in one transaction that watches the
+        event stream. The relay streams each event before applying it,
+        so an event that arrives in between aborts the swap. The replay
+        is then retried, and no update is overwritten.
+
+        Args:
+            db: Database session
+            tenant_id: Tenant ID
+
+        Returns:
+            int: Number of active orders in the projection
+        """
+        stream = order_events_topic(tenant_id)
+        # Events up to here are in the snapshot
+        last = self.client.xrevrange(stream, count=1)
+        since = last[0][0] if last else "0-0"
+
+        orders = db.execute(
+            select(Order).options(
+                selectinload(Order.items).selectinload(OrderItem.menu_item)
+            ).where(
+                Order.tenant_id == tenant_id,
+                Order.status.notin_([OrderStatus(status) for status in FINAL_STATUSES])
+            )
+        ).scalars().all()
+
+        active_key, ready_key = self._keys(tenant_id)
+        build_key = active_key + REBUILD_SUFFIX
+        pipe = self.client.pipeline(transaction=False)
+        pipe.delete(build_key)
+        for order in orders:
+            card = {
+                "id": order.id,
+                "order_number": order.order_number,
+                "order_date": order.order_date.isoformat(),
+                "status": order.status.value,
+                "payment_status": order.payment_status.value,
+                "total_amount": float(order.total_amount),
+                "created_at": order.created_at.isoformat(),
+                "items": [
+                    {
+                        "id": item.id,
+                        "menu_item_id": item.menu_item_id,
+                        "quantity": item.quantity,
+                        "unit_price": float(item.unit_price),
+                        "subtotal": float(item.subtotal),
+                        "special_instructions": item.special_instructions,
+                        "menu_item": {
+                            "name": item.menu_item.name,
+                            "image_url": item.menu_item.image_url
+                        } if item.menu_item else None,
+                    }
+                    for item in order.items
+                ],
+            }
+            card_key = self._card_key(tenant_id, order.id) + REBUILD_SUFFIX
+            pipe.hset(card_key, mapping={"card": json.dumps(card), "status": order.status.value})
+            pipe.expire(card_key, CARD_TTL)
+            pipe.zadd(build_key, {order.id: _timestamp(order.created_at)})
+        pipe.execute()
+        snapshot = {order.id for order in orders}
+
+        with self.client.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    pipe.watch(stream)
+                    events = [
+                        json.loads(fields["event"])
+                        for _, fields in pipe.xrange(stream, min=f"({since}")
+                    ]
+                    stale = pipe.zrange(active_key, 0, -1)
+                    pipe.multi()
+                    # Cards from the database are more complete than ones built from events
+                    events = [
+                        event for event in events
+                        if not (event["type"] == "order.created" and event["order"]["id"] in snapshot)
+                    ]
+                    active = self._replay(snapshot, events)
+                    self.apply(pipe, db, [(tenant_id, event) for event in events], suffix=REBUILD_SUFFIX)
+                    if active:
+                        pipe.rename(build_key, active_key)
+                    else:
+                        pipe.delete(build_key, active_key)
+                    for order_id in active:
+                        card_key = self._card_key(tenant_id, order_id)
+                        pipe.rename(card_key + REBUILD_SUFFIX, card_key)
+                    gone = [
+                        self._card_key(tenant_id, order_id) for order_id in stale if int(order_id) not in active
+                    ]
+                    if gone:
+                        pipe.delete(*gone)
+                    pipe.set(ready_key, 1)
+                    pipe.execute()
+                    return len(active)
+                except redis.WatchError:
+                    continue
+
+    @staticmethod
+    def _replay(snapshot: Set[int], events: List[dict]) -> Set[int]:
+        """IDs of the orders still active after applying events to a snapshot."""
+        active = set(snapshot)
+        for event in events:
+            order_id = event["order"]["id"]
+            if event["type"] == "order.created":
+                active.add(order_id)
+            elif event["type"] == "order.status_changed" and event["order"]["status"] in FINAL_STATUSES:
+                active.discard(order_id)
+        return active
+
+    def rebuild_if_missing(self, tenant_id: int) -> bool:
+        """
+        Rebuild a tenant's projection unless it is ready or being rebuilt.
+
+        A Redis lock keeps API processes from rebuilding the same tenant
+        at once.
+
+        Args:
+            tenant_id: Tenant ID
+
+        Returns:
+            bool: Whether this call rebuilt it
+        """
+        _, ready_key = self._keys(tenant_id)
+        lock_key = f"kds:rebuilding:{tenant_id}"
+        token = uuid.uuid4().hex
+        if self.client.exists(ready_key) or not self.client.set(lock_key, token, nx=True, ex=REBUILD_LOCK_TTL):
+            return False
+        try:
+            db = SessionLocal()
+            try:
+                count = self.rebuild(db, tenant_id)
+            finally:
+                db.close()
+            print(f"Rebuilt active orders projection for tenant {tenant_id}: {count} orders")
+            return True
+        finally:
+            self._release(keys=[lock_key], args=[token])
+
+    def schedule_rebuild(self, tenant_id: int) -> None:
+        """
+        Rebuild a tenant's projection in the background, once per process.
+
+        Args:
+            tenant_id: Tenant ID
+        """
+        task = self._rebuilds.get(tenant_id)
+        if task is not None and not task.done():
+            return
+        self._rebuilds[tenant_id] = asyncio.create_task(self._rebuild_in_background(tenant_id))
+
+    async def _rebuild_in_background(self, tenant_id: int) -> None:
+        """Run rebuild_if_missing off the event loop, logging failures."""
+        try:
+            await asyncio.to_thread(self.rebuild_if_missing, tenant_id)
+        except Exception as e:
+            print(f"Failed to rebuild active orders projection for tenant {tenant_id}: {e}")
+
+
+# Global active orders projection
+active_orders = ActiveOrdersProjection(cache.client)
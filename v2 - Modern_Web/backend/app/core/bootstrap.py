@@ -0,0 +1,102 @@
+"""Versioned, pre-serialized kiosk bootstrap bundles."""
+import hashlib
+import threading
+from typing import Dict, NamedTuple, Optional
+
+
+class BootstrapBundle(NamedTuple):
+    """A pre-serialized bootstrap payload for one tenant."""
+    version: int
+    etag: str
+    payload: bytes
+
+
+class BootstrapBundleCache:
+    """
+    In-process store of bootstrap bundles keyed by tenant.
+
+    Bundles are built lazily on the first read after an invalidation and then
+    served as raw bytes, so repeated kiosk refreshes never touch the database.
+    """
+
+    def __init__(self):
+        """Initialize empty bundle and version maps."""
+        self._bundles: Dict[int, BootstrapBundle] = {}
+        self._versions: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, tenant_id: int) -> Optional[BootstrapBundle]:
+        """
+        Get the current bundle for a tenant.
+
+        Args:
+            tenant_id: Tenant ID
+
+        Returns:
+            Optional[BootstrapBundle]: Cached bundle, or None if it must be rebuilt
+        """
+        return self._bundles.get(tenant_id)
+
+    def current_version(self, tenant_id: int) -> int:
+        """
+        Get the version the next bundle for a tenant should be tagged with.
+
+        Args:
+            tenant_id: Tenant ID
+
+        Returns:
+            int: Current bundle version
+        """
+        with self._lock:
+            return self._versions.setdefault(tenant_id, 1)
+
+    def store(self, tenant_id: int, version: int, payload: bytes) -> BootstrapBundle:
+        """
+        Store a freshly built bundle.
+
+        The bundle is only kept if no invalidation happened while it was being
+        built; otherwise it is still returned to the caller but not cached.
+
+        Args:
+            tenant_id: Tenant ID
+            version: Version the payload was built for
+            payload: Serialized JSON payload
+
+        Returns:
+            BootstrapBundle: The stored bundle
+        """
+        bundle = BootstrapBundle(
+            version=version,
+            etag=f'"{hashlib.sha1(payload).hexdigest()}"',
+            payload=payload
+        )
+        with self._lock:
+            if self._versions.get(tenant_id) == version:
+                self._bundles[tenant_id] = bundle
+        return bundle
+
+    def invalidate(self, tenant_id: int) -> int:
+        """
+        Drop the bundle for a tenant and bump its version.
+
+        Args:
+            tenant_id: Tenant ID
+
+        Returns:
+            int: New bundle version
+        """
+        with self._lock:
+            self._bundles.pop(tenant_id, None)
+            self._versions[tenant_id] = self._versions.get(tenant_id, 1) + 1
+            return self._versions[tenant_id]
+
+    def clear(self) -> None:
+        """Drop every bundle, bumping each tenant's version."""
+        with self._lock:
+            for tenant_id in self._versions:
+                self._versions[tenant_id] += 1
+            self._bundles.clear()
+
+
+# Global bootstrap bundle cache
+bootstrap_cache = BootstrapBundleCache()
@@ -1,9 +1,23 @@
 """Redis cache wrapper utilities."""
 import redis
+import redis.asyncio as aioredis
 import json
-from typing import Optional, Any
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional, Any, Awaitable, Callable, Dict
 from app.config import settings
 
+# Cache a loaded value only if the key wasn't invalidated since the load started
+SET_IF_GENERATION_SCRIPT = """
+if (redis.call("get", KEYS[2]) or "0") == ARGV[1] then
+    redis.call("set", KEYS[1], ARGV[2], "EX", ARGV[3])
+    return 1
+end
+return 0
+"""
+
 
 class RedisCache:
     """Redis cache client wrapper."""
@@ -17,6 +31,20 @@ class RedisCache:
             password=settings.REDIS_PASSWORD if settings.REDIS_PASSWORD else None,
             decode_responses=True
         )
+        self._async_client: Optional[aioredis.Redis] = None
+    
+    @property
+    def async_client(self) -> aioredis.Redis:
+        """Async Redis client for request handlers, created lazily inside the event loop."""
+        if self._async_client is None:
+            self._async_client = aioredis.Redis(
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
+                db=settings.REDIS_DB,
+                password=settings.REDIS_PASSWORD if settings.REDIS_PASSWORD else None,
+                decode_responses=True
+            )
+        return self._async_client
     
     def get(self, key: str) -> Optional[Any]:
         """
@@ -114,6 +142,325 @@ class RedisCache:
                 return (key, value)
         return None
 
+    def publish(self, channel: str, message: Any) -> int:
+        """
+        Publish a message on a pub/sub channel.
+        
+        Args:
+            channel: Channel name
+            message: Message to publish
+            
+        Returns:
+            int: Number of subscribers that received the message
+        """
+        if not isinstance(message, str):
+            message = json.dumps(message)
+        return self.client.publish(channel, message)
+
+
+class LocalLRUCache:
+    """Thread-safe in-process LRU cache."""
+    
+    def __init__(self, maxsize: int = 256):
+        """
+        Initialize the LRU cache.
+        
+        Args:
+            maxsize: Maximum number of entries kept in memory
+        """
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Get a value and mark it as recently used."""
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+    
+    def set(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def delete(self, key: str) -> None:
+        """Remove a value if present."""
+        with self._lock:
+            self._data.pop(key, None)
+    
+    def clear(self) -> None:
+        """Remove all values."""
+        with self._lock:
+            self._data.clear()
+
+
+class CacheInvalidator:
+    """
+    Broadcast cache invalidations to every API process over Redis pub/sub.
+    
+    Handlers are registered per namespace. Publishing applies the handler in
+    the current process immediately and then notifies the other processes,
+    which skip messages they originated themselves. Publishing is async, for
+    request handlers; the subscriber runs in its own thread.
+    """
+    
+    CHANNEL = "cache:invalidate"
+    
+    def __init__(self, redis_cache: RedisCache):
+        """
+        Initialize the invalidator.
+        
+        Args:
+            redis_cache: Redis cache used for publishing and subscribing
+        """
+        self.redis_cache = redis_cache
+        self.origin = uuid.uuid4().hex
+        self._handlers: Dict[str, Callable[[str], None]] = {}
+        self._resets: Dict[str, Callable[[], None]] = {}
+        self._thread = None
+    
+    def register(
+        self,
+        namespace: str,
+        handler: Callable[[str], None],
+        reset: Optional[Callable[[], None]] = None
+    ) -> None:
+        """
+        Register an invalidation handler.
+        
+        Args:
+            namespace: Namespace the handler is responsible for
+            handler: Called with the invalidated key
+            reset: Called to drop everything if the subscription is interrupted
+        """
+        self._handlers[namespace] = handler
+        if reset is not None:
+            self._resets[namespace] = reset
+    
+    async def publish(self, namespace: str, key: str) -> None:
+        """
+        Invalidate a key locally and in every other process.
+        
+        Args:
+            namespace: Handler namespace
+            key: Key to invalidate
+        """
+        self._dispatch(namespace, key)
+        try:
+            await self.redis_cache.async_client.publish(self.CHANNEL, json.dumps({
+                "origin": self.origin,
+                "namespace": namespace,
+                "key": key
+            }))
+        except redis.RedisError as e:
+            print(f"Failed to publish cache invalidation: {e}")
+    
+    def start(self) -> None:
+        """Start the background subscriber thread for this process."""
+        if self._thread is not None:
+            return
+        try:
+            pubsub = self.redis_cache.client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{self.CHANNEL: self._on_message})
+            self._thread = pubsub.run_in_thread(
+                sleep_time=0.01,
+                daemon=True,
+                exception_handler=self._on_error
+            )
+        except redis.RedisError as e:
+            print(f"Cache invalidation listener unavailable: {e}")
+    
+    def stop(self) -> None:
+        """Stop the background subscriber thread."""
+        if self._thread is not None:
+            self._thread.stop()
+            self._thread = None
+    
+    def _dispatch(self, namespace: str, key: str) -> None:
+        """Run the handler registered for a namespace."""
+        handler = self._handlers.get(namespace)
+        if handler is not None:
+            handler(key)
+    
+    def _on_message(self, message: dict) -> None:
+        """Handle an invalidation message from another process."""
+        try:
+            data = json.loads(message["data"])
+        except (json.JSONDecodeError, TypeError):
+            return
+        if data.get("origin") != self.origin:
+            self._dispatch(data.get("namespace"), str(data.get("key")))
+    
+    def _on_error(self, error: Exception, pubsub, thread) -> None:
+        """Drop local state while disconnected, since invalidations may be missed."""
+        for reset in self._resets.values():
+            reset()
+        time.sleep(1)
+
+
+class TieredCache:
+    """
+    Two-tier read-through cache: in-process LRU in front of Redis.
+    
+    Values must be JSON serializable. Misses on both tiers call the loader
+    (normally a database query) and populate both tiers. Redis errors are
+    treated as misses so reads keep working when Redis is down.
+    
+    Every Redis key has a generation counter that invalidation bumps. A
+    loaded value is only written back if the generation is still the one
+    read before loading, so a slow load that raced an invalidation in any
+    process can't put the old value back.
+    """
+    
+    def __init__(
+        self,
+        namespace: str,
+        redis_cache: RedisCache,
+        invalidator: CacheInvalidator,
+        local_maxsize: int = 256,
+        redis_ttl: int = 300
+    ):
+        """
+        Initialize the tiered cache.
+        
+        Args:
+            namespace: Prefix for Redis keys and invalidation messages
+            redis_cache: Shared Redis cache; the async client is used
+            invalidator: Invalidation bus
+            local_maxsize: Maximum number of entries in the in-process tier
+            redis_ttl: Expiration of Redis entries in seconds
+        """
+        self.namespace = namespace
+        self.redis_cache = redis_cache
+        self.invalidator = invalidator
+        self.local = LocalLRUCache(local_maxsize)
+        self.redis_ttl = redis_ttl
+        self._generation = 0
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "local": {"hits": 0, "misses": 0},
+            "redis": {"hits": 0, "misses": 0, "errors": 0},
+            "loads": 0,
+        }
+        invalidator.register(namespace, self._drop_local, reset=self._reset_local)
+    
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Get a value from the first tier that has it, loading it on a full miss.
+        
+        Args:
+            key: Cache key within the namespace
+            loader: Coroutine function producing the value on a miss
+            
+        Returns:
+            Any: Cached or freshly loaded value
+        """
+        value = self.local.get(key)
+        if value is not None:
+            self._count("local", "hits")
+            return value
+        self._count("local", "misses")
+        
+        # Remember the generations so a load racing an invalidation isn't cached
+        generation = self._generation
+        redis_generation = None
+        redis_key = self._redis_key(key)
+        client = self.redis_cache.async_client
+        
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.get(redis_key)
+            pipe.get(self._generation_key(key))
+            raw, redis_generation = await pipe.execute()
+            value = json.loads(raw) if raw is not None else None
+            redis_generation = redis_generation or "0"
+            self._count("redis", "hits" if value is not None else "misses")
+        except redis.RedisError:
+            value = None
+            self._count("redis", "errors")
+        
+        if value is None:
+            value = await loader()
+            self._count("loads")
+            if redis_generation is not None and generation == self._generation:
+                try:
+                    await client.eval(
+                        SET_IF_GENERATION_SCRIPT, 2, redis_key, self._generation_key(key),
+                        redis_generation, json.dumps(value), self.redis_ttl
+                    )
+                except redis.RedisError:
+                    self._count("redis", "errors")
+        
+        if generation == self._generation:
+            self.local.set(key, value)
+        return value
+    
+    async def invalidate(self, *keys: str) -> None:
+        """
+        Invalidate keys in Redis and in every process's local tier.
+        
+        Args:
+            keys: Keys within the namespace
+        """
+        try:
+            pipe = self.redis_cache.async_client.pipeline(transaction=True)
+            for key in keys:
+                pipe.incr(self._generation_key(key))
+                pipe.delete(self._redis_key(key))
+            await pipe.execute()
+        except redis.RedisError:
+            self._count("redis", "errors")
+        for key in keys:
+            await self.invalidator.publish(self.namespace, key)
+    
+    def stats(self) -> dict:
+        """
+        Get per-tier hit/miss counters.
+        
+        Returns:
+            dict: Counters for the local and Redis tiers and loader calls
+        """
+        with self._stats_lock:
+            return {
+                "local": dict(self._stats["local"]),
+                "redis": dict(self._stats["redis"]),
+                "loads": self._stats["loads"],
+            }
+    
+    def _redis_key(self, key: str) -> str:
+        """Build the namespaced Redis key."""
+        return f"{self.namespace}:{key}"
+    
+    def _generation_key(self, key: str) -> str:
+        """Build the Redis key of a key's generation counter; it never expires."""
+        return f"{self.namespace}:{key}:generation"
+    
+    def _drop_local(self, key: str) -> None:
+        """Drop a key from the local tier."""
+        self._generation += 1
+        self.local.delete(key)
+    
+    def _reset_local(self) -> None:
+        """Drop the whole local tier."""
+        self._generation += 1
+        self.local.clear()
+    
+    def _count(self, tier: str, counter: Optional[str] = None) -> None:
+        """Increment a stats counter."""
+        with self._stats_lock:
+            if counter is None:
+                self._stats[tier] += 1
+            else:
+                self._stats[tier][counter] += 1
+
 
 # Global cache instance
 cache = RedisCache()
+
+# Global invalidation bus
+invalidator = CacheInvalidator(cache)
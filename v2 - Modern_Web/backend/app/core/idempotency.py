@@ -0,0 +1,184 @@
+"""Idempotency keys for safely retried requests."""
+import asyncio
+import json
+import time
+import uuid
+from typing import Any, NamedTuple, Optional, Tuple
+import redis
+import redis.asyncio as aioredis
+from app.config import settings
+
+# Delete the lock only if we still own it
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# Store the response, then delete the lock only if we still own it
+COMPLETE_SCRIPT = """
+redis.call("set", KEYS[1], ARGV[2], "EX", ARGV[3])
+if redis.call("get", KEYS[2]) == ARGV[1] then
+    return redis.call("del", KEYS[2])
+end
+return 0
+"""
+
+
+class StoredResponse(NamedTuple):
+    """A response recorded for an idempotency key."""
+    status_code: int
+    body: Any
+
+
+class IdempotencyKeyMismatch(Exception):
+    """Raised when a key is reused with a different request body."""
+
+
+class IdempotencyInProgress(Exception):
+    """Raised when the original request for a key is still running."""
+
+
+class IdempotencyStore:
+    """
+    Record the first response for an idempotency key in Redis.
+
+    The first request for a key takes a short lock and runs; concurrent
+    duplicates wait for it to finish and then replay its response without
+    touching the database. Keys are scoped per tenant and expire after a TTL.
+    The lock holds a random owner token next to the body fingerprint, so a
+    request whose lock expired and was taken over can't release the new
+    owner's lock.
+    """
+
+    def __init__(
+        self,
+        redis_client: Optional[aioredis.Redis] = None,
+        ttl: int = 86400,
+        lock_ttl: int = 30,
+        wait_timeout: float = 10.0,
+        poll_interval: float = 0.05
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            redis_client: Async Redis client (default: one built from settings
+                on first use, inside the event loop)
+            ttl: How long responses are kept, in seconds
+            lock_ttl: Lock expiry in seconds, in case the owner dies
+            wait_timeout: How long duplicates wait for the original request
+            poll_interval: Delay between checks while waiting
+        """
+        self._client = redis_client
+        self.ttl = ttl
+        self.lock_ttl = lock_ttl
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+
+    @property
+    def client(self) -> aioredis.Redis:
+        """Async Redis client, created lazily inside the event loop."""
+        if self._client is None:
+            self._client = aioredis.Redis(
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
+                db=settings.REDIS_DB,
+                password=settings.REDIS_PASSWORD if settings.REDIS_PASSWORD else None,
+                decode_responses=True
+            )
+        return self._client
+
+    async def begin(self, tenant_id: int, key: str, fingerprint: str) -> Tuple[Optional[StoredResponse], Optional[str]]:
+        """
+        Claim a key or wait for its stored response.
+
+        Args:
+            tenant_id: Tenant ID
+            key: Client supplied idempotency key
+            fingerprint: Hash of the request body
+
+        Returns:
+            Tuple[Optional[StoredResponse], Optional[str]]: The stored response
+            to replay, or None and the lock the caller now owns; the caller
+            must run the request and pass the lock to complete or release
+
+        Raises:
+            IdempotencyKeyMismatch: If the key was used for a different body
+            IdempotencyInProgress: If the original request didn't finish in time
+        """
+        result_key, lock_key = self._keys(tenant_id, key)
+        lock = f"{uuid.uuid4().hex}:{fingerprint}"
+        deadline = time.monotonic() + self.wait_timeout
+
+        while True:
+            stored = await self.client.get(result_key)
+            if stored:
+                data = json.loads(stored)
+                if data["fingerprint"] != fingerprint:
+                    raise IdempotencyKeyMismatch("Idempotency-Key was already used for a different request")
+                return StoredResponse(status_code=data["status_code"], body=data["body"]), None
+
+            if await self.client.set(lock_key, lock, nx=True, ex=self.lock_ttl):
+                return None, lock
+
+            owner = await self.client.get(lock_key)
+            if owner is not None and owner.partition(":")[2] != fingerprint:
+                raise IdempotencyKeyMismatch("Idempotency-Key was already used for a different request")
+
+            if time.monotonic() >= deadline:
+                raise IdempotencyInProgress("A request with this Idempotency-Key is still in progress")
+            await asyncio.sleep(self.poll_interval)
+
+    async def complete(
+        self,
+        tenant_id: int,
+        key: str,
+        fingerprint: str,
+        lock: str,
+        status_code: int,
+        body: Any
+    ) -> None:
+        """
+        Store the response for a key and release its lock if still held.
+
+        Args:
+            tenant_id: Tenant ID
+            key: Client supplied idempotency key
+            fingerprint: Hash of the request body
+            lock: Lock returned by begin
+            status_code: Response status code
+            body: JSON serializable response body
+        """
+        result_key, lock_key = self._keys(tenant_id, key)
+        record = json.dumps({"fingerprint": fingerprint, "status_code": status_code, "body": body})
+        await self.client.eval(COMPLETE_SCRIPT, 2, result_key, lock_key, lock, record, self.ttl)
+
+    async def release(self, tenant_id: int, key: str, lock: str) -> None:
+        """
+        Release a key without storing a response, so the client can retry.
+
+        Args:
+            tenant_id: Tenant ID
+            key: Client supplied idempotency key
+            lock: Lock returned by begin
+        """
+        _, lock_key = self._keys(tenant_id, key)
+        try:
+            await self.client.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, lock)
+        except redis.RedisError as e:
+            print(f"Failed to release idempotency lock: {e}")
+
+    def _keys(self, tenant_id: int, key: str) -> tuple:
+        """Build the result and lock keys."""
+        base = f"idempotency:{tenant_id}:{key}"
+        return base, f"{base}:lock"
+
+
+# Global idempotency store
+idempotency_store = IdempotencyStore(
+    ttl=settings.IDEMPOTENCY_TTL,
+    lock_ttl=settings.IDEMPOTENCY_LOCK_TTL,
+    wait_timeout=settings.IDEMPOTENCY_WAIT_TIMEOUT
+)
@@ -0,0 +1,370 @@
+"""Write-behind order ingestion over Redis Streams."""
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+import redis
+import redis.asyncio as aioredis
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.core.cache import cache
+from app.models import Order, OrderItem, OrderStatus, PaymentStatus, OutboxEvent
+from app.core.outbox import KITCHEN_QUEUE
+from app.core.order_events import order_events_topic, order_created_event
+
+STREAM_PREFIX = "orders:ingest"
+GROUP = "order-writers"
+DEAD_LETTER_STREAM = f"{STREAM_PREFIX}:dead"
+
+# Order numbers accepted per tenant and day, kept for reconciliation
+ACCEPTED_TTL = 3 * 86400
+
+
+class IngestBackpressure(Exception):
+    """Raised when the ingest stream for a tenant is saturated."""
+
+
+def accepted_key(tenant_id: int, day: str) -> str:
+    """Key of the set of order numbers accepted for a tenant on a day (YYYYMMDD)."""
+    return f"{STREAM_PREFIX}:accepted:{tenant_id}:{day}"
+
+
+class OrderIngestStream:
+    """
+    Append validated orders to sharded Redis Streams.
+
+    A tenant always maps to the same shard, and each shard is consumed by one
+    writer, so orders are persisted in the order they were accepted.
+    Submitting is async, since it runs on the order placement path.
+    """
+
+    def __init__(self, redis_client: Optional[aioredis.Redis] = None, shards: int = 4, max_pending: int = 5000):
+        """
+        Initialize the stream.
+
+        Args:
+            redis_client: Async Redis client (default: the shared cache's)
+            shards: Number of stream shards
+            max_pending: Per-shard backlog above which new orders are refused
+        """
+        self._client = redis_client
+        self.shards = shards
+        self.max_pending = max_pending
+
+    @property
+    def client(self) -> aioredis.Redis:
+        """Async Redis client; the shared cache's unless one was given."""
+        return self._client if self._client is not None else cache.async_client
+
+    def stream_for(self, tenant_id: int) -> str:
+        """Get the stream key a tenant's orders go to."""
+        return f"{STREAM_PREFIX}:{tenant_id % self.shards}"
+
+    def all_streams(self) -> List[str]:
+        """Get every shard's stream key."""
+        return [f"{STREAM_PREFIX}:{shard}" for shard in range(self.shards)]
+
+    async def submit(self, tenant_id: int, order: dict) -> str:
+        """
+        Append an order to its tenant's shard.
+
+        Args:
+            tenant_id: Tenant ID
+            order: Serialized order (see OrderIngestWriter for the fields)
+
+        Returns:
+            str: Stream entry ID
+
+        Raises:
+            IngestBackpressure: If the shard backlog is over the limit
+        """
+        stream = self.stream_for(tenant_id)
+        # Writers delete entries once persisted, so the length is the backlog
+        if await self.client.xlen(stream) >= self.max_pending:
+            raise IngestBackpressure("Order ingestion is saturated, retry shortly")
+
+        day = order["order_date"].replace("-", "")
+        pipe = self.client.pipeline(transaction=True)
+        pipe.xadd(stream, {"order": json.dumps(order)})
+        pipe.sadd(accepted_key(tenant_id, day), order["order_number"])
+        pipe.expire(accepted_key(tenant_id, day), ACCEPTED_TTL)
+        entry_id, _, _ = await pipe.execute()
+        return entry_id
+
+
+class OrderIngestWriter:
+    """
+    Consume ingest stream shards and write orders to MySQL in batches.
+
+    Each batch (up to batch_size entries) is inserted in one transaction with
+    multi-row inserts for orders, items and outbox messages (kitchen queue and
+    order.created events), then acked and deleted from the stream.
+    Redelivered entries whose order number already exists for the tenant and
+    day are skipped.
+    """
+
+    def __init__(self, redis_client, streams: List[str], consumer: str, batch_size: int = 500):
+        """
+        Initialize the writer.
+
+        Args:
+            redis_client: Redis client
+            streams: Stream shards owned by this writer
+            consumer: Consumer name, stable across restarts
+            batch_size: Maximum entries per stream read and transaction
+        """
+        self.client = redis_client
+        self.streams = streams
+        self.consumer = consumer
+        self.batch_size = batch_size
+        self.metrics = {"persisted_total": 0, "duplicates_total": 0, "dead_total": 0, "batches_total": 0}
+
+    def ensure_groups(self) -> None:
+        """Create the consumer group on every owned shard."""
+        for stream in self.streams:
+            try:
+                self.client.xgroup_create(stream, GROUP, id="0", mkstream=True)
+            except redis.ResponseError as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+
+    def read(self, block_ms: int = 1000, pending: bool = False) -> List[Tuple[str, List[Tuple[str, dict]]]]:
+        """
+        Read a batch from every owned shard.
+
+        Args:
+            block_ms: How long to block waiting for new entries
+            pending: Re-read entries delivered to this consumer but never acked
+
+        Returns:
+            list: (stream, [(entry_id, fields)]) pairs
+        """
+        start = "0" if pending else ">"
+        return self.client.xreadgroup(
+            GROUP,
+            self.consumer,
+            {stream: start for stream in self.streams},
+            count=self.batch_size,
+            block=None if pending else block_ms
+        ) or []
+
+    def process(self, db: Session, stream: str, entries: List[Tuple[str, dict]]) -> int:
+        """
+        Persist a batch from one shard, then ack and delete it.
+
+        Args:
+            db: Database session
+            stream: Shard the entries came from
+            entries: (entry_id, fields) pairs in stream order
+
+        Returns:
+            int: Number of orders inserted
+        """
+        if not entries:
+            return 0
+
+        orders = []
+        dead = []
+        for _, fields in entries:
+            try:
+                orders.append(json.loads(fields["order"]))
+            except (KeyError, TypeError, json.JSONDecodeError):
+                dead.append(dict(fields, error="unreadable entry"))
+
+        failed = 0
+        try:
+            inserted = self._persist(db, orders)
+        except IntegrityError:
+            db.rollback()
+            # Isolate the offending orders so the rest of the batch still lands
+            inserted = 0
+            for order in orders:
+                try:
+                    inserted += self._persist(db, [order])
+                except IntegrityError as e:
+                    db.rollback()
+                    failed += 1
+                    dead.append({"order": json.dumps(order), "error": str(e.orig)})
+
+        ids = [entry_id for entry_id, _ in entries]
+        pipe = self.client.pipeline(transaction=False)
+        for fields in dead:
+            pipe.xadd(DEAD_LETTER_STREAM, fields)
+        pipe.xack(stream, GROUP, *ids)
+        pipe.xdel(stream, *ids)
+        pipe.execute()
+
+        self.metrics["persisted_total"] += inserted
+        self.metrics["duplicates_total"] += len(orders) - inserted - failed
+        self.metrics["dead_total"] += len(dead)
+        self.metrics["batches_total"] += 1
+        return inserted
+
+    def _persist(self, db: Session, orders: List[dict]) -> int:
+        """Insert orders that aren't in the database yet, in one transaction."""
+        def order_key(order: dict) -> Tuple[int, date, str]:
+            return order["tenant_id"], date.fromisoformat(order["order_date"]), order["order_number"]
+
+        # Order numbers repeat across tenants and days, so match on all three
+        keys = {order_key(order) for order in orders}
+        existing = {
+            tuple(row) for row in db.execute(
+                select(Order.tenant_id, Order.order_date, Order.order_number).where(
+                    Order.tenant_id.in_({tenant_id for tenant_id, _, _ in keys}),
+                    Order.order_date.in_({order_date for _, order_date, _ in keys}),
+                    Order.order_number.in_({number for _, _, number in keys})
+                )
+            ).all()
+        }
+        new_orders = [order for order in orders if order_key(order) not in existing]
+        if not new_orders:
+            return 0
+
+        db.execute(insert(Order), [
+            {
+                "tenant_id": order["tenant_id"],
+                "order_number": order["order_number"],
+                "order_date": date.fromisoformat(order["order_date"]),
+                "total_amount": Decimal(order["total_amount"]),
+                "status": OrderStatus.PENDING,
+                "payment_status": PaymentStatus(order["payment_status"]),
+                "created_at": datetime.fromisoformat(order["created_at"]),
+            }
+            for order in new_orders
+        ])
+        new_keys = {order_key(order) for order in new_orders}
+        order_ids: Dict[Tuple[int, date, str], int] = {
+            (tenant_id, order_date, number): order_id
+            for tenant_id, order_date, number, order_id in db.execute(
+                select(Order.tenant_id, Order.order_date, Order.order_number, Order.id).where(
+                    Order.tenant_id.in_({tenant_id for tenant_id, _, _ in new_keys}),
+                    Order.order_date.in_({order_date for _, order_date, _ in new_keys}),
+                    Order.order_number.in_({number for _, _, number in new_keys})
+                )
+            ).all()
+            if (tenant_id, order_date, number) in new_keys
+        }
+
+        items = [
+            {
+                "order_id": order_ids[order_key(order)],
+                "menu_item_id": item["menu_item_id"],
+                "quantity": item["quantity"],
+                "unit_price": Decimal(item["unit_price"]),
+                "subtotal": Decimal(item["subtotal"]),
+            }
+            for order in new_orders
+            for item in order["items"]
+        ]
+        if items:
+            db.execute(insert(OrderItem), items)
+
+        now = datetime.now(timezone.utc)
+        db.execute(insert(OutboxEvent), [
+            {
+                "topic": KITCHEN_QUEUE,
+                "payload": {
+                    "order_id": order_ids[order_key(order)],
+                    "order_number": order["order_number"],
+                    "order_date": order["order_date"],
+                    "tenant_id": order["tenant_id"],
+                    "items": [
+                        {
+                            "menu_item_id": item["menu_item_id"],
+                            "quantity": item["quantity"],
+                            "unit_price": float(item["unit_price"]),
+                        }
+                        for item in order["items"]
+                    ],
+                    "created_at": order["created_at"],
+                },
+                "created_at": now,
+            }
+            for order in new_orders
+        ] + [
+            {
+                "topic": order_events_topic(order["tenant_id"]),
+                "payload": order_created_event({
+                    "id": order_ids[order_key(order)],
+                    "order_number": order["order_number"],
+                    "order_date": order["order_date"],
+                    "status": OrderStatus.PENDING.value,
+                    "payment_status": order["payment_status"],
+                    "total_amount": float(order["total_amount"]),
+                    "created_at": order["created_at"],
+                    "items": [
+                        {
+                            "menu_item_id": item["menu_item_id"],
+                            "quantity": item["quantity"],
+                            "unit_price": float(item["unit_price"]),
+                            "subtotal": float(item["subtotal"]),
+                        }
+                        for item in order["items"]
+                    ],
+                }),
+                "created_at": now,
+            }
+            for order in new_orders
+        ])
+        db.commit()
+        return len(new_orders)
+
+
+def reconcile(redis_client, db: Session, ingest: OrderIngestStream, day: str) -> Dict[int, dict]:
+    """
+    Find accepted orders that are neither queued nor in the database.
+
+    Args:
+        redis_client: Redis client
+        db: Database session
+        ingest: Ingest stream (for shard keys)
+        day: Day to check, as YYYYMMDD
+
+    Returns:
+        Dict[int, dict]: Per tenant counts of accepted, queued, persisted and
+        missing orders, plus the missing order numbers
+    """
+    order_date = datetime.strptime(day, "%Y%m%d").date()
+    queued = set()
+    for stream in ingest.all_streams():
+        for _, fields in redis_client.xrange(stream):
+            try:
+                order = json.loads(fields["order"])
+            except (KeyError, TypeError, json.JSONDecodeError):
+                continue
+            if order.get("order_date") == order_date.isoformat():
+                queued.add((order["tenant_id"], order["order_number"]))
+
+    report = {}
+    for key in redis_client.scan_iter(match=accepted_key("*", day)):
+        tenant_id = int(key.split(":")[3])
+        accepted = redis_client.smembers(key)
+        waiting = {number for number in accepted if (tenant_id, number) in queued}
+        candidates = list(accepted - waiting)
+        persisted = set()
+        for start in range(0, len(candidates), 1000):
+            persisted.update(db.execute(
+                select(Order.order_number).where(
+                    Order.tenant_id == tenant_id,
+                    Order.order_date == order_date,
+                    Order.order_number.in_(candidates[start:start + 1000])
+                )
+            ).scalars())
+        missing = sorted(set(candidates) - persisted)
+        report[tenant_id] = {
+            "accepted": len(accepted),
+            "queued": len(waiting),
+            "persisted": len(persisted),
+            "missing": len(missing),
+            "missing_order_numbers": missing,
+        }
+    return report
+
+
+# Global ingest stream used by the API in write-behind mode
+order_ingest = OrderIngestStream(
+    shards=settings.ORDER_INGEST_SHARDS,
+    max_pending=settings.ORDER_INGEST_MAX_PENDING
+)
@@ -0,0 +1,426 @@
+"""Asyncio runtime for kitchen queue workers."""
+import asyncio
+import signal
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple
+import redis
+from app.core.fair_scheduler import DeficitRoundRobin
+from app.core.queue import AsyncKitchenQueue
+
+# Redis hash per consumer with its latest metrics: metrics:kitchen_worker:{consumer}
+# (and its per-tenant metrics in metrics:kitchen_worker:{consumer}:tenants)
+METRICS_KEY_PREFIX = "metrics:kitchen_worker"
+
+# Redis hash with each tenant's queue depth: {tenant_id}:backlog and {tenant_id}:in_progress
+QUEUE_METRICS_KEY = "metrics:kitchen_queue"
+
+# Metrics of a worker that stopped reporting expire after this many seconds
+METRICS_TTL = 60
+
+# Seconds between attempts to reclaim orders from crashed workers
+RECLAIM_INTERVAL = 15
+
+# Seconds between checks for tenants that queued their first order
+TENANT_REFRESH_INTERVAL = 5
+
+# Seconds between metric reports
+REPORT_INTERVAL = 10
+
+# Longest a read waits for new orders, which bounds how late a stop is noticed
+READ_BLOCK_MS = 1000
+
+# Latest ticket latencies kept per tenant for the p99 gauge
+LATENCY_WINDOW = 1000
+
+# Tenants listed in each printed report, largest backlog first
+REPORT_TOP_TENANTS = 5
+
+
+def ticket_cost(message: dict) -> int:
+    """Scheduling cost of an order: its number of lines, as kitchen work grows with them."""
+    return max(1, len(message.get("items") or []))
+
+
+def percentile(values, fraction: float) -> float:
+    """Nearest-rank percentile of a non-empty collection."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class KitchenWorker:
+    """
+    Process kitchen orders concurrently on one event loop, fairly across tenants.
+
+    Orders are read from every tenant's stream into a deficit round robin
+    scheduler (costed by ticket_cost, tenant_quantum per turn), and free
+    slots out of concurrency are filled from it, so a tenant's burst only
+    queues behind itself: every other tenant with orders gets a turn each
+    round. A tenant's stream is read again only once its scheduled orders
+    have started, and the scheduler holds at most about concurrency orders,
+    so unread orders stay in the streams for other workers. When nothing is
+    scheduled, a read blocks for new orders and then waits up to
+    max_wait_ms to fill a batch of batch_size.
+
+    Orders start in batches of up to batch_size: a batch first goes through
+    batch_handler in one call (for batched database writes), then each order
+    goes through handler concurrently, and the orders that succeeded are
+    acked in one pipeline. Messages for the same order are handled one at a
+    time in the order they were read. A failed order stays pending and is
+    redelivered by reclaim; a failed batch_handler call is retried one order
+    at a time, so one bad order doesn't hold back the rest. On SIGTERM (or
+    SIGINT) the worker stops reading and waits up to drain_timeout seconds
+    for in-flight orders; any still running or not yet started are left
+    unacked for another worker to reclaim.
+    """
+
+    def __init__(
+        self,
+        queue: AsyncKitchenQueue,
+        consumer: str,
+        handler: Callable[[dict], Awaitable[None]],
+        batch_handler: Optional[Callable[[List[dict]], Awaitable[None]]] = None,
+        concurrency: int = 32,
+        batch_size: int = 32,
+        max_wait_ms: int = 50,
+        drain_timeout: float = 30.0,
+        tenant_quantum: int = 8
+    ):
+        """
+        Initialize the worker.
+
+        Args:
+            queue: Kitchen queue on an async Redis client
+            consumer: Consumer name in the kitchen-workers group
+            handler: Coroutine function handling one order message
+            batch_handler: Coroutine function called once per batch with all
+                its messages, before handler
+            concurrency: Maximum number of orders in flight
+            batch_size: Maximum number of orders per read, start and ack
+            max_wait_ms: Longest wait to fill a batch after its first order
+            drain_timeout: Seconds to wait for in-flight orders on shutdown
+            tenant_quantum: Order lines a tenant may start per scheduling turn
+        """
+        self.queue = queue
+        self.consumer = consumer
+        self.handler = handler
+        self.batch_handler = batch_handler
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.max_wait_ms = max_wait_ms
+        self.drain_timeout = drain_timeout
+        self.metrics = {
+            "processed_total": 0,
+            "failed_total": 0,
+            "batches_total": 0,
+            "redis_round_trips_total": 0,
+            "in_flight": 0,
+            "scheduled": 0,
+            "tenants": 0,
+            "throughput_per_second": 0.0,
+        }
+        self._scheduler = DeficitRoundRobin(tenant_quantum, cost=lambda entry: ticket_cost(entry[1]))
+        self._tenants: List[int] = []
+        self._processed: Dict[int, int] = {}
+        self._latencies: Dict[int, Deque[float]] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._claimed = 0  # Orders started and not yet handled
+        self._slot_freed = asyncio.Event()
+        self._order_locks: Dict[object, asyncio.Lock] = {}
+        self._order_users: Dict[object, int] = {}
+        self._stopping = asyncio.Event()
+        self._last_refresh = 0.0
+        self._last_report = time.monotonic()
+        self._last_processed = 0
+
+    def stop(self) -> None:
+        """Stop reading new orders and let in-flight ones finish."""
+        if not self._stopping.is_set():
+            print(f"Stopping; draining {self._claimed} in-flight orders...")
+        self._stopping.set()
+        self._slot_freed.set()
+
+    async def run(self, handle_signals: bool = True) -> None:
+        """
+        Consume orders until stopped, then drain.
+
+        Args:
+            handle_signals: Stop on SIGTERM and SIGINT; pass False when the
+                caller stops several workers on one loop itself
+        """
+        if handle_signals:
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGTERM, signal.SIGINT):
+                try:
+                    loop.add_signal_handler(sig, self.stop)
+                except (NotImplementedError, RuntimeError):
+                    pass  # No signal handlers outside the main thread or on Windows
+
+        # Finish anything this consumer read but never acked before a restart
+        resuming = True
+        last_reclaim = 0.0
+        while not self._stopping.is_set():
+            free = self.concurrency - self._claimed
+            if free <= 0:
+                self._slot_freed.clear()
+                await self._slot_freed.wait()
+                continue
+            try:
+                if time.monotonic() - self._last_refresh >= TENANT_REFRESH_INTERVAL:
+                    await self._refresh_tenants()
+                if resuming:
+                    await self._resume()
+                    resuming = False
+                elif time.monotonic() - last_reclaim >= RECLAIM_INTERVAL:
+                    # Take over orders a crashed worker left unacked
+                    await self._reclaim()
+                    last_reclaim = time.monotonic()
+                await self._read()
+            except (redis.RedisError, OSError) as e:
+                print(f"Redis error: {e}. Retrying in 5s...")
+                await self._sleep(5)
+                continue
+
+            scheduled = self._scheduler.pop(min(free, self.batch_size))
+            if scheduled:
+                entries = [(tenant_id, entry_id, message) for tenant_id, (entry_id, message) in scheduled]
+                self._claimed += len(entries)
+                task = asyncio.create_task(self._process_batch(entries))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            else:
+                # Let finished orders run before the next read
+                await asyncio.sleep(0)
+
+            if time.monotonic() - self._last_report >= REPORT_INTERVAL:
+                await self.report()
+
+        await self._drain()
+        await self.report()
+
+    async def _refresh_tenants(self) -> None:
+        """Pick up tenants that queued their first order, creating their consumer groups."""
+        tenants = await self._call(self.queue.tenants())
+        new = set(tenants) - set(self._tenants)
+        if new:
+            await self.queue.ensure_group(sorted(new))
+        self._tenants = tenants
+        self._last_refresh = time.monotonic()
+
+    async def _resume(self) -> None:
+        """Schedule the orders delivered to this consumer but never acked."""
+        after: Dict[int, str] = {}
+        tenant_ids = self._tenants
+        while tenant_ids:
+            entries = await self._call(self.queue.read(
+                self.consumer,
+                tenant_ids,
+                count=self.batch_size,
+                pending={tenant_id: after.get(tenant_id, "0") for tenant_id in tenant_ids}
+            ))
+            self._schedule(entries)
+            for tenant_id, entry_id, _ in entries:
+                after[tenant_id] = entry_id
+            tenant_ids = sorted({tenant_id for tenant_id, _, _ in entries})
+
+    async def _reclaim(self) -> None:
+        """Schedule orders other workers left pending for too long, tenant by tenant."""
+        reclaimed = 0
+        for tenant_id in self._tenants:
+            room = self.concurrency - len(self._scheduler)
+            if room <= 0:
+                break
+            entries = await self._call(self.queue.reclaim(self.consumer, tenant_id, count=room))
+            self._schedule(entries)
+            reclaimed += len(entries)
+        if reclaimed:
+            print(f" [!] Reclaimed {reclaimed} orders from other workers")
+
+    async def _read(self) -> None:
+        """Read new orders from the tenants with none scheduled."""
+        room = self.concurrency - len(self._scheduler)
+        tenant_ids = [tenant_id for tenant_id in self._tenants if not self._scheduler.backlog(tenant_id)]
+        if room <= 0 or not tenant_ids:
+            if not self._scheduler:
+                # No tenants yet: nothing to block on
+                await self._sleep(READ_BLOCK_MS / 1000)
+            return
+        count = max(1, min(self.batch_size, room // len(tenant_ids)))
+
+        if self._scheduler:
+            # Orders are waiting for slots; just top up the other tenants
+            self._schedule(await self._call(self.queue.read(self.consumer, tenant_ids, count=count, block_ms=None)))
+            return
+        entries = await self._call(self.queue.read(self.consumer, tenant_ids, count=count, block_ms=READ_BLOCK_MS))
+        if entries and len(entries) < self.batch_size and self.max_wait_ms > 0:
+            await self._sleep(self.max_wait_ms / 1000)
+            entries.extend(await self._call(self.queue.read(self.consumer, tenant_ids, count=count, block_ms=None)))
+        self._schedule(entries)
+
+    def _schedule(self, entries: List[Tuple[int, str, dict]]) -> None:
+        """Queue read entries in the fair scheduler."""
+        for tenant_id, entry_id, message in entries:
+            self._scheduler.push(tenant_id, (entry_id, message))
+
+    async def _call(self, request: Awaitable):
+        """Await a Redis request, counting the round trip."""
+        self.metrics["redis_round_trips_total"] += 1
+        return await request
+
+    async def report(self) -> None:
+        """Update the gauges, print the metrics and publish them to Redis."""
+        now = time.monotonic()
+        elapsed = max(now - self._last_report, 1e-9)
+        processed = self.metrics["processed_total"]
+        self.metrics["throughput_per_second"] = round((processed - self._last_processed) / elapsed, 2)
+        self.metrics["scheduled"] = len(self._scheduler)
+        self.metrics["tenants"] = len(self._tenants)
+        self._last_report = now
+        self._last_processed = processed
+
+        print(
+            f" [metrics] processed={processed} failed={self.metrics['failed_total']} "
+            f"in_flight={self.metrics['in_flight']} scheduled={self.metrics['scheduled']} "
+            f"batches={self.metrics['batches_total']} round_trips={self.metrics['redis_round_trips_total']} "
+            f"throughput={self.metrics['throughput_per_second']}/s"
+        )
+        try:
+            depths = await self._call(self.queue.depth(self._tenants)) if self._tenants else {}
+            scheduled = self._scheduler.backlogs()
+            tenant_metrics = {}
+            for tenant_id in self._tenants:
+                tenant_metrics[f"{tenant_id}:scheduled"] = scheduled.get(tenant_id, 0)
+                tenant_metrics[f"{tenant_id}:processed_total"] = self._processed.get(tenant_id, 0)
+                latencies = self._latencies.get(tenant_id)
+                if latencies:
+                    tenant_metrics[f"{tenant_id}:p99_latency_ms"] = round(percentile(latencies, 0.99))
+            for tenant_id in sorted(depths, key=lambda t: depths[t]["backlog"], reverse=True)[:REPORT_TOP_TENANTS]:
+                if depths[tenant_id]["backlog"]:
+                    print(
+                        f" [metrics] tenant {tenant_id}: backlog={depths[tenant_id]['backlog']} "
+                        f"in_progress={depths[tenant_id]['in_progress']} "
+                        f"p99_latency_ms={tenant_metrics.get(f'{tenant_id}:p99_latency_ms', '-')}"
+                    )
+
+            key = f"{METRICS_KEY_PREFIX}:{self.consumer}"
+            pipe = self.queue.client.pipeline(transaction=False)
+            pipe.hset(key, mapping=self.metrics)
+            pipe.expire(key, METRICS_TTL)
+            if tenant_metrics:
+                pipe.hset(f"{key}:tenants", mapping=tenant_metrics)
+                pipe.expire(f"{key}:tenants", METRICS_TTL)
+            if depths:
+                pipe.hset(QUEUE_METRICS_KEY, mapping={
+                    f"{tenant_id}:{field}": value
+                    for tenant_id, depth in depths.items()
+                    for field, value in depth.items()
+                })
+                pipe.expire(QUEUE_METRICS_KEY, METRICS_TTL)
+            await pipe.execute()
+        except (redis.RedisError, OSError) as e:
+            print(f"Failed to publish metrics: {e}")
+
+    async def _process_batch(self, entries: List[Tuple[int, str, dict]]) -> None:
+        """Run a batch through batch_handler and handler, then ack the orders that succeeded."""
+        claimed = len(entries)
+        released = 0
+
+        def release() -> None:
+            # Free an order's slot as soon as it is handled, before the batch is acked
+            nonlocal released
+            released += 1
+            self._claimed -= 1
+            self._slot_freed.set()
+
+        try:
+            if self.batch_handler is not None:
+                try:
+                    await self.batch_handler([message for _, _, message in entries])
+                except Exception as e:
+                    print(f"Error processing a batch of {len(entries)} orders: {e}")
+                    entries = await self._isolate_failures(entries)
+
+            results = await asyncio.gather(*(
+                self._process(tenant_id, entry_id, message, release) for tenant_id, entry_id, message in entries
+            ))
+            done = [(tenant_id, entry_id) for (tenant_id, entry_id, _), ok in zip(entries, results) if ok]
+            if done:
+                try:
+                    await self._call(self.queue.ack(done))
+                except (redis.RedisError, OSError) as e:
+                    # Unacked orders are redelivered; handlers must tolerate repeats
+                    print(f"Failed to ack {len(done)} orders: {e}")
+                    return
+            self.metrics["processed_total"] += len(done)
+            self.metrics["batches_total"] += 1
+            for tenant_id, entry_id in done:
+                self._record_latency(tenant_id, entry_id)
+        finally:
+            self._claimed -= claimed - released
+            self._slot_freed.set()
+
+    def _record_latency(self, tenant_id: int, entry_id: str) -> None:
+        """Count a processed order and its ticket latency, from queueing (the entry ID's timestamp) to ack."""
+        self._processed[tenant_id] = self._processed.get(tenant_id, 0) + 1
+        latencies = self._latencies.setdefault(tenant_id, deque(maxlen=LATENCY_WINDOW))
+        latencies.append(max(0.0, time.time() * 1000 - int(entry_id.split("-")[0])))
+
+    async def _isolate_failures(self, entries: List[Tuple[int, str, dict]]) -> List[Tuple[int, str, dict]]:
+        """Retry batch_handler one order at a time and keep the orders that pass."""
+        passed = []
+        for tenant_id, entry_id, message in entries:
+            try:
+                await self.batch_handler([message])
+                passed.append((tenant_id, entry_id, message))
+            except Exception as e:
+                # Left pending; reclaim redelivers it (or dead-letters it)
+                self.metrics["failed_total"] += 1
+                print(f"Error processing order {message.get('order_id', entry_id)}: {e}")
+        return passed
+
+    async def _process(self, tenant_id: int, entry_id: str, message: dict, release: Callable[[], None]) -> bool:
+        """Handle one order after earlier messages for the same order, then release its slot."""
+        key = (tenant_id, message.get("order_id", entry_id))
+        lock = self._order_locks.setdefault(key, asyncio.Lock())
+        self._order_users[key] = self._order_users.get(key, 0) + 1
+        try:
+            async with lock:
+                self.metrics["in_flight"] += 1
+                try:
+                    await self.handler(message)
+                    return True
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    # Left pending; reclaim redelivers it (or dead-letters it)
+                    self.metrics["failed_total"] += 1
+                    print(f"Error processing order {key[1]}: {e}")
+                    return False
+                finally:
+                    self.metrics["in_flight"] -= 1
+        finally:
+            release()
+            self._order_users[key] -= 1
+            if not self._order_users[key]:
+                del self._order_users[key]
+                del self._order_locks[key]
+
+    async def _drain(self) -> None:
+        """Wait for in-flight orders, cancelling any that outlast drain_timeout."""
+        if self._scheduler:
+            print(f"Left {len(self._scheduler)} scheduled orders unacked for other workers to reclaim")
+        if not self._tasks:
+            return
+        _, pending = await asyncio.wait(set(self._tasks), timeout=self.drain_timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending)
+            print(f"Left {len(pending)} batches unacked for other workers to reclaim")
+
+    async def _sleep(self, seconds: float) -> None:
+        """Sleep, waking early when stopped."""
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
@@ -0,0 +1,49 @@
+"""Shared caches for menu reads and their invalidation."""
+from app.config import settings
+from app.core.cache import cache, invalidator, TieredCache
+from app.core.bootstrap import bootstrap_cache
+from app.core.pricing import pricing_engine
+
+# Menu reads: in-process LRU -> Redis -> MySQL
+menu_cache = TieredCache(
+    "menu",
+    cache,
+    invalidator,
+    local_maxsize=settings.MENU_CACHE_LOCAL_SIZE,
+    redis_ttl=settings.MENU_CACHE_TTL
+)
+
+invalidator.register(
+    "bootstrap",
+    lambda key: bootstrap_cache.invalidate(int(key)),
+    reset=bootstrap_cache.clear
+)
+
+invalidator.register(
+    "pricing",
+    lambda key: pricing_engine.invalidate(int(key)),
+    reset=pricing_engine.clear
+)
+
+
+async def invalidate_bootstrap(tenant_id: int) -> None:
+    """
+    Drop a tenant's bootstrap bundle in every API process.
+    
+    Args:
+        tenant_id: Tenant ID
+    """
+    await invalidator.publish("bootstrap", str(tenant_id))
+
+
+async def invalidate_menu(tenant_id: int) -> None:
+    """
+    Drop cached menu reads, the tenant's bootstrap bundle and its price
+    snapshot in every API process.
+    
+    Args:
+        tenant_id: Tenant whose menu changed
+    """
+    await menu_cache.invalidate("items", "categories")
+    await invalidate_bootstrap(tenant_id)
+    await invalidator.publish("pricing", str(tenant_id))
@@ -0,0 +1,162 @@
+"""Menu change log helpers for delta sync."""
+from typing import Iterable
+from sqlalchemy import Select, insert, literal, select
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import MenuChange, MenuChangeType, MenuVersion
+
+
+def _innermost_transaction(db: AsyncSession):
+    """The savepoint or transaction a bump would be rolled back with."""
+    return db.sync_session.get_nested_transaction() or db.sync_session.get_transaction()
+
+
+async def next_menu_version(db: AsyncSession, tenant_id: int) -> int:
+    """
+    Take the tenant's menu version for the current transaction.
+    
+    The first call in a transaction bumps the counter row, which locks it
+    until commit, so a tenant's menu writes commit in version order: a kiosk
+    that has seen version N can never miss a change numbered N or lower that
+    commits later. Later calls in the same transaction return the same
+    version, so everything one transaction changes shares one version; after
+    a commit or rollback the next call bumps the counter again.
+    
+    Args:
+        db: Database session
+        tenant_id: Tenant ID
+        
+    Returns:
+        int: The transaction's version
+    """
+    transaction = _innermost_transaction(db)
+    taken = db.info.setdefault("menu_versions", {})
+    if tenant_id in taken and taken[tenant_id][0] is transaction:
+        return taken[tenant_id][1]
+    
+    dialect = db.bind.dialect.name
+    table = MenuVersion.__table__
+    if dialect == "mysql":
+        stmt = mysql.insert(MenuVersion).values(tenant_id=tenant_id, version=1)
+        stmt = stmt.on_duplicate_key_update(version=table.c.version + 1)
+    else:
+        dialect_insert = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}.get(dialect)
+        if dialect_insert is None:
+            raise ValueError(f"Menu versions are not supported on {dialect}")
+        stmt = dialect_insert(MenuVersion).values(tenant_id=tenant_id, version=1)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["tenant_id"],
+            set_={"version": table.c.version + 1}
+        )
+    await db.execute(stmt)
+    result = await db.execute(
+        select(MenuVersion.version).where(MenuVersion.tenant_id == tenant_id)
+    )
+    version = result.scalar_one()
+    # Bumping began a transaction if none was open; remember the one it belongs to
+    taken[tenant_id] = (_innermost_transaction(db), version)
+    return version
+
+
+async def record_menu_change(
+    db: AsyncSession,
+    tenant_id: int,
+    menu_item_id: int,
+    change_type: MenuChangeType
+) -> MenuChange:
+    """
+    Add a change log entry to the current transaction, under its version.
+    
+    Args:
+        db: Database session
+        tenant_id: Tenant ID
+        menu_item_id: Changed menu item ID
+        change_type: Whether the item was inserted/updated or deleted
+        
+    Returns:
+        MenuChange: Pending change log entry
+    """
+    change = MenuChange(
+        tenant_id=tenant_id,
+        version=await next_menu_version(db, tenant_id),
+        menu_item_id=menu_item_id,
+        change_type=change_type
+    )
+    db.add(change)
+    return change
+
+
+async def record_menu_changes(
+    db: AsyncSession,
+    tenant_id: int,
+    menu_item_ids: Iterable[int],
+    change_type: MenuChangeType
+) -> None:
+    """
+    Add change log entries for many items with one multi-row insert.
+    
+    The entries get the transaction's version.
+    
+    Args:
+        db: Database session
+        tenant_id: Tenant ID
+        menu_item_ids: Changed menu item IDs
+        change_type: Whether the items were inserted/updated or deleted
+    """
+    menu_item_ids = list(menu_item_ids)
+    if not menu_item_ids:
+        return
+    version = await next_menu_version(db, tenant_id)
+    rows = [
+        {"tenant_id": tenant_id, "version": version, "menu_item_id": menu_item_id, "change_type": change_type}
+        for menu_item_id in menu_item_ids
+    ]
+    await db.execute(insert(MenuChange), rows)
+
+
+async def record_menu_changes_from_select(
+    db: AsyncSession,
+    tenant_id: int,
+    menu_item_ids: Select,
+    change_type: MenuChangeType
+) -> None:
+    """
+    Add change log entries for the items a query selects, server-side.
+    
+    Runs as a single INSERT ... SELECT, so no item IDs travel to the client.
+    The entries get the transaction's version.
+    
+    Args:
+        db: Database session
+        tenant_id: Tenant ID
+        menu_item_ids: Query selecting (tenant_id, menu_item_id) pairs of the tenant's items
+        change_type: Whether the items were inserted/updated or deleted
+    """
+    version = await next_menu_version(db, tenant_id)
+    rows = menu_item_ids.add_columns(
+        literal(version, MenuChange.version.type),
+        literal(change_type, MenuChange.change_type.type)
+    )
+    await db.execute(
+        insert(MenuChange).from_select(["tenant_id", "menu_item_id", "version", "change_type"], rows)
+    )
+
+
+async def latest_menu_version(db: AsyncSession, tenant_id: int) -> int:
+    """
+    Get the newest committed menu version for a tenant.
+    
+    Writes still in flight hold newer versions, so a delta sync from the
+    returned version picks them up once they commit.
+    
+    Args:
+        db: Database session
+        tenant_id: Tenant ID
+        
+    Returns:
+        int: The tenant's menu version, or 0 if its menu never changed
+    """
+    result = await db.execute(
+        select(MenuVersion.version).where(MenuVersion.tenant_id == tenant_id)
+    )
+    return result.scalar() or 0
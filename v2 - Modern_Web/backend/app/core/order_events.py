@@ -0,0 +1,218 @@
+"""Per-tenant order event streams and the in-process fan-out hub."""
+import asyncio
+import json
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+import redis
+import redis.asyncio as aioredis
+from app.config import settings
+
+# Stream and pub/sub channel per tenant: orders:events:{tenant_id}
+ORDER_EVENTS_PREFIX = "orders:events"
+
+# Events buffered per connected client before it is told to resync
+SUBSCRIBER_QUEUE_SIZE = 256
+
+# Most events replayed to a reconnecting client
+REPLAY_LIMIT = 1000
+
+
+def order_events_topic(tenant_id: int) -> str:
+    """Stream (and channel) holding a tenant's order events."""
+    return f"{ORDER_EVENTS_PREFIX}:{tenant_id}"
+
+
+def is_order_events_topic(topic: str) -> bool:
+    """Check whether an outbox topic is an order event stream."""
+    return topic.startswith(f"{ORDER_EVENTS_PREFIX}:")
+
+
+def tenant_from_topic(topic: str) -> int:
+    """Tenant ID of an order event stream or channel."""
+    return int(topic.rsplit(":", 1)[1])
+
+
+def order_created_event(order: dict) -> dict:
+    """
+    Build an order.created event.
+
+    Args:
+        order: Order fields (id, order_number, status, payment_status,
+            total_amount, created_at, items)
+
+    Returns:
+        dict: Event payload
+    """
+    return {"type": "order.created", "order": order}
+
+
+def order_status_event(
+    order_id: int,
+    order_number: Optional[str],
+    status: str,
+    previous_status: Optional[str]
+) -> dict:
+    """
+    Build an order.status_changed event.
+
+    Args:
+        order_id: Order ID
+        order_number: Order number, if known
+        status: New status value
+        previous_status: Status before the change, if known
+
+    Returns:
+        dict: Event payload
+    """
+    return {
+        "type": "order.status_changed",
+        "order": {"id": order_id, "order_number": order_number, "status": status},
+        "previous_status": previous_status,
+    }
+
+
+def parse_stream_id(entry_id: str) -> Tuple[int, int]:
+    """Turn a stream entry ID ("ms-seq") into a comparable tuple."""
+    ms, _, seq = entry_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+class OrderEventHub:
+    """
+    Fan order events out to the KDS clients connected to this process.
+
+    The relay appends each event to the tenant's stream and then publishes
+    it with its stream ID. Each API process holds one pattern subscription
+    for all tenants and copies events into per-client queues. Reconnecting
+    clients replay missed events from the stream by ID.
+    """
+
+    def __init__(self):
+        """Initialize with no subscribers; Redis connects on first use."""
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = defaultdict(set)
+        self._client: Optional[aioredis.Redis] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def client(self) -> aioredis.Redis:
+        """Async Redis client, created lazily inside the event loop."""
+        if self._client is None:
+            self._client = aioredis.Redis(
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
+                db=settings.REDIS_DB,
+                password=settings.REDIS_PASSWORD if settings.REDIS_PASSWORD else None,
+                decode_responses=True
+            )
+        return self._client
+
+    def subscribe(self, tenant_id: int) -> asyncio.Queue:
+        """
+        Register a client for a tenant's events.
+
+        The queue receives (entry_id, event) pairs, or None when the client
+        fell behind or the subscription dropped and it must resume by ID.
+
+        Args:
+            tenant_id: Tenant ID
+
+        Returns:
+            asyncio.Queue: Queue of events for this client
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers[tenant_id].add(queue)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen())
+        return queue
+
+    def unsubscribe(self, tenant_id: int, queue: asyncio.Queue) -> None:
+        """
+        Remove a client.
+
+        Args:
+            tenant_id: Tenant ID
+            queue: Queue returned by subscribe
+        """
+        queues = self._subscribers.get(tenant_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[tenant_id]
+
+    async def last_id(self, tenant_id: int) -> str:
+        """
+        Get the ID of the newest event in a tenant's stream.
+
+        Args:
+            tenant_id: Tenant ID
+
+        Returns:
+            str: Entry ID, or "0-0" if the stream is empty
+        """
+        entries = await self.client.xrevrange(order_events_topic(tenant_id), count=1)
+        return entries[0][0] if entries else "0-0"
+
+    async def replay(self, tenant_id: int, since: str) -> Tuple[List[Tuple[str, dict]], bool]:
+        """
+        Read events after an ID.
+
+        Args:
+            tenant_id: Tenant ID
+            since: Last entry ID the client saw
+
+        Returns:
+            Tuple[list, bool]: (entry_id, event) pairs, and whether events may
+            have been trimmed in between, in which case the client must reload
+        """
+        stream = order_events_topic(tenant_id)
+        entries = await self.client.xrange(stream, min=f"({since}", count=REPLAY_LIMIT)
+        events = [(entry_id, json.loads(fields["event"])) for entry_id, fields in entries]
+
+        gap = len(entries) == REPLAY_LIMIT
+        if not gap:
+            first = await self.client.xrange(stream, count=1)
+            # The stream is capped; anything older than its first entry is gone
+            gap = bool(first) and parse_stream_id(since) < parse_stream_id(first[0][0]) and (
+                await self.client.xlen(stream) >= settings.ORDER_EVENTS_MAXLEN
+            )
+        return events, gap
+
+    async def _listen(self) -> None:
+        """Receive published events and copy them to subscriber queues."""
+        while self._subscribers:
+            pubsub = self.client.pubsub()
+            try:
+                await pubsub.psubscribe(f"{ORDER_EVENTS_PREFIX}:*")
+                while self._subscribers:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message is None or message["type"] != "pmessage":
+                        continue
+                    tenant_id = tenant_from_topic(message["channel"])
+                    data = json.loads(message["data"])
+                    self._dispatch(tenant_id, (data["id"], data["event"]))
+            except (redis.RedisError, OSError) as e:
+                print(f"Order event subscription lost: {e}")
+                # Events published while disconnected are only in the streams
+                for tenant_id in list(self._subscribers):
+                    self._dispatch(tenant_id, None)
+                await asyncio.sleep(1)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except (redis.RedisError, OSError):
+                    pass
+
+    def _dispatch(self, tenant_id: int, item: Optional[Tuple[str, dict]]) -> None:
+        """Queue an event for every client of a tenant, dropping slow clients."""
+        for queue in list(self._subscribers.get(tenant_id, ())):
+            try:
+                queue.put_nowait(item)
+            except asyncio.QueueFull:
+                # Make room for the resync marker; the client replays from its last ID
+                self.unsubscribe(tenant_id, queue)
+                queue.get_nowait()
+                queue.put_nowait(None)
+
+
+# Global order event hub
+order_event_hub = OrderEventHub()
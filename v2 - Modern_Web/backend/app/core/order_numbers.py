@@ -0,0 +1,141 @@
+"""Short per-tenant, per-day order numbers from block-allocated sequences."""
+import asyncio
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from typing import Dict, Optional, Tuple
+import redis.asyncio as aioredis
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from app.config import settings
+from app.core.cache import cache
+from app.database import AsyncSessionLocal
+from app.models import OrderSequence
+
+# Numbers shown after each letter prefix (A-001 .. A-999, then B-001)
+NUMBERS_PER_PREFIX = 999
+
+# Redis counters only need to outlive their day
+REDIS_SEQUENCE_TTL = 2 * 86400
+
+
+def format_order_number(value: int) -> str:
+    """
+    Format a sequence value as a customer facing order number.
+
+    1 -> A-001, 999 -> A-999, 1000 -> B-001, ..., 25975 -> AA-001.
+
+    Args:
+        value: Sequence value, starting at 1
+
+    Returns:
+        str: Order number
+    """
+    index, number = divmod(value - 1, NUMBERS_PER_PREFIX)
+    prefix = ""
+    index += 1
+    while index:
+        index, letter = divmod(index - 1, 26)
+        prefix = chr(ord("A") + letter) + prefix
+    return f"{prefix}-{number + 1:03d}"
+
+
+class OrderNumberAllocator:
+    """
+    Hand out order numbers from blocks reserved per tenant and day.
+
+    Each process reserves block_size numbers at a time, either with one
+    Redis INCRBY or one UPDATE of the order_sequences row, and serves
+    the rest from memory. Numbers are unique per tenant and day without
+    retries. Numbers left in a block when a process restarts are skipped,
+    and concurrent workers interleave blocks, so numbers are increasing
+    per worker but not gap-free. Each tenant has its own lock around its
+    block, so one tenant's reservation never holds up another's orders.
+    """
+
+    def __init__(self, redis_client: Optional[aioredis.Redis] = None, backend: str = "db", block_size: int = 20):
+        """
+        Initialize the allocator.
+
+        Args:
+            redis_client: Async Redis client for the "redis" backend (default:
+                the shared cache's)
+            backend: "db" or "redis"
+            block_size: Numbers reserved per round trip
+        """
+        if backend not in ("db", "redis"):
+            raise ValueError(f"Unknown order number backend: {backend}")
+        self._client = redis_client
+        self.backend = backend
+        self.block_size = block_size
+        self._blocks: Dict[Tuple[int, date], Tuple[int, int]] = {}
+        self._locks: Dict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+    @property
+    def client(self) -> aioredis.Redis:
+        """Async Redis client; the shared cache's unless one was given."""
+        return self._client if self._client is not None else cache.async_client
+
+    async def allocate(self, tenant_id: int) -> Tuple[date, str]:
+        """
+        Get the next order number for a tenant.
+
+        Args:
+            tenant_id: Tenant ID
+
+        Returns:
+            Tuple[date, str]: UTC day the number belongs to, and the order number
+        """
+        day = datetime.now(timezone.utc).date()
+        key = (tenant_id, day)
+        async with self._locks[tenant_id]:
+            next_value, end = self._blocks.get(key, (0, 0))
+            if next_value >= end:
+                end = await self._reserve(tenant_id, day) + 1
+                next_value = end - self.block_size
+                # Blocks from previous days will never be used again
+                self._blocks = {k: v for k, v in self._blocks.items() if k[1] >= day}
+            self._blocks[key] = (next_value + 1, end)
+        return day, format_order_number(next_value)
+
+    async def _reserve(self, tenant_id: int, day: date) -> int:
+        """Reserve the next block and return its last value."""
+        if self.backend == "redis":
+            key = f"order_seq:{tenant_id}:{day:%Y%m%d}"
+            pipe = self.client.pipeline()
+            pipe.incrby(key, self.block_size)
+            pipe.expire(key, REDIS_SEQUENCE_TTL)
+            last_value, _ = await pipe.execute()
+            return last_value
+
+        # Separate short transaction, so the row lock isn't held by the order
+        async with AsyncSessionLocal() as db:
+            while True:
+                result = await db.execute(
+                    update(OrderSequence)
+                    .where(OrderSequence.tenant_id == tenant_id, OrderSequence.day == day)
+                    .values(last_value=OrderSequence.last_value + self.block_size)
+                )
+                if result.rowcount:
+                    last_value = await db.scalar(
+                        select(OrderSequence.last_value)
+                        .where(OrderSequence.tenant_id == tenant_id, OrderSequence.day == day)
+                    )
+                    await db.commit()
+                    return last_value
+
+                # First block of the day; another worker may create the row first
+                try:
+                    await db.execute(
+                        insert(OrderSequence).values(tenant_id=tenant_id, day=day, last_value=self.block_size)
+                    )
+                    await db.commit()
+                    return self.block_size
+                except IntegrityError:
+                    await db.rollback()
+
+
+# Global order number allocator
+order_numbers = OrderNumberAllocator(
+    backend=settings.ORDER_NUMBER_BACKEND,
+    block_size=settings.ORDER_NUMBER_BLOCK_SIZE
+)
@@ -0,0 +1,182 @@
+"""Transactional outbox for messages bound for Redis queues."""
+import json
+import time
+from datetime import datetime, timezone
+from typing import Any
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models import OrderStatus, OutboxEvent
+from app.core.order_events import is_order_events_topic, tenant_from_topic
+from app.core.active_orders import active_orders
+from app.core.queue import kitchen_queue, station_queue
+from app.core.rollups import load_orders, reverse_orders
+
+# Outbox topic delivered to the kitchen queue stream
+KITCHEN_QUEUE = "kitchen_orders"
+
+# Outbox topic delivered to the ticket queue of each message's station
+STATION_TICKETS = "kitchen_tickets"
+
+# Redis hash holding the relay's latest metrics
+METRICS_KEY = "metrics:outbox_relay"
+
+
+def add_outbox_event(db, topic: str, payload: Any) -> OutboxEvent:
+    """
+    Add a message to the outbox in the current transaction.
+    
+    Args:
+        db: Database session (sync or async)
+        topic: Destination Redis queue, the kitchen or station ticket queues, or an order event stream
+        payload: JSON serializable message
+        
+    Returns:
+        OutboxEvent: Pending outbox row
+    """
+    event = OutboxEvent(
+        topic=topic,
+        payload=payload,
+        created_at=datetime.now(timezone.utc)
+    )
+    db.add(event)
+    return event
+
+
+def _age_seconds(created_at: datetime, now: datetime) -> float:
+    """Age of a timestamp, treating naive values as UTC."""
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return max((now - created_at).total_seconds(), 0.0)
+
+
+class OutboxRelay:
+    """
+    Drain the outbox into Redis in batches.
+    
+    Each batch is pushed with one pipeline and then deleted from the outbox.
+    A crash between the two re-sends the batch, so delivery is at-least-once
+    and consumers must tolerate duplicates.
+    
+    Order events are appended to their tenant's capped stream first, and then
+    published with their stream IDs so live clients and clients replaying
+    from the stream see the same sequence. They are also applied to the
+    active orders projection in the same pipeline. Cancellations are taken
+    out of the sales rollups in the batch's transaction, before anything is
+    pushed, so a failure there retries the batch without sending it twice.
+    """
+    
+    def __init__(self, redis_client, batch_size: int = 200):
+        """
+        Initialize the relay.
+        
+        Args:
+            redis_client: Redis client to push messages with
+            batch_size: Maximum number of messages per batch
+        """
+        self.client = redis_client
+        self.batch_size = batch_size
+        self.metrics = {
+            "relayed_total": 0,
+            "batches_total": 0,
+            "last_batch_size": 0,
+            "last_batch_max_lag_seconds": 0.0,
+            "last_relayed_at": 0.0,
+        }
+    
+    def drain_once(self, db: Session) -> int:
+        """
+        Relay one batch of outbox messages.
+        
+        Args:
+            db: Database session
+            
+        Returns:
+            int: Number of messages relayed
+        """
+        rows = db.execute(
+            select(OutboxEvent)
+            .order_by(OutboxEvent.id)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        ).scalars().all()
+        
+        if not rows:
+            db.commit()
+            return 0
+        
+        now = datetime.now(timezone.utc)
+        max_lag = max(_age_seconds(row.created_at, now) for row in rows)
+        self.metrics["relayed_total"] += len(rows)
+        self.metrics["batches_total"] += 1
+        self.metrics["last_batch_size"] = len(rows)
+        self.metrics["last_batch_max_lag_seconds"] = round(max_lag, 3)
+        self.metrics["last_relayed_at"] = time.time()
+        
+        events = [row for row in rows if is_order_events_topic(row.topic)]
+        cancelled = [
+            row.payload["order"]["id"] for row in events
+            if row.payload["type"] == "order.status_changed"
+            and row.payload["order"]["status"] == OrderStatus.CANCELLED.value
+        ]
+        if cancelled:
+            self._subtract_cancelled(db, cancelled)
+        
+        event_ids = []
+        if events:
+            pipe = self.client.pipeline(transaction=False)
+            for row in events:
+                pipe.xadd(
+                    row.topic,
+                    {"event": json.dumps(row.payload)},
+                    maxlen=settings.ORDER_EVENTS_MAXLEN,
+                    approximate=True
+                )
+            event_ids = pipe.execute()
+        
+        pipe = self.client.pipeline(transaction=False)
+        for row, entry_id in zip(events, event_ids):
+            pipe.publish(row.topic, json.dumps({"id": entry_id, "event": row.payload}))
+        if events:
+            active_orders.apply(pipe, db, [(tenant_from_topic(row.topic), row.payload) for row in events])
+        for row in rows:
+            if row.topic == KITCHEN_QUEUE:
+                kitchen_queue.add(row.payload, pipe=pipe)
+            elif row.topic == STATION_TICKETS:
+                station_queue(row.payload["station"]).add(row.payload, pipe=pipe)
+            elif not is_order_events_topic(row.topic):
+                pipe.lpush(row.topic, json.dumps(row.payload))
+        pipe.hset(METRICS_KEY, mapping=self.metrics)
+        pipe.execute()
+        
+        db.execute(delete(OutboxEvent).where(OutboxEvent.id.in_([row.id for row in rows])))
+        db.commit()
+        return len(rows)
+    
+    def _subtract_cancelled(self, db: Session, order_ids: list) -> None:
+        """Take cancelled orders out of the sales rollups, exactly once per order."""
+        orders = load_orders(db, order_ids)
+        try:
+            with db.begin_nested():
+                reverse_orders(db, orders)
+        except IntegrityError:
+            # The worker counted some of them first; the retry subtracts those
+            with db.begin_nested():
+                reverse_orders(db, orders)
+    
+    def backlog(self, db: Session) -> dict:
+        """
+        Measure messages still waiting in the outbox.
+        
+        Args:
+            db: Database session
+            
+        Returns:
+            dict: Pending message count and age of the oldest one in seconds
+        """
+        count, oldest = db.execute(
+            select(func.count(OutboxEvent.id), func.min(OutboxEvent.created_at))
+        ).one()
+        lag = _age_seconds(oldest, datetime.now(timezone.utc)) if oldest else 0.0
+        return {"backlog": count, "oldest_lag_seconds": round(lag, 3)}
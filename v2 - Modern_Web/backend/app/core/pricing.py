@@ -0,0 +1,184 @@
+"""Server-side cart pricing from cached per-tenant price snapshots."""
+import threading
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import MenuItem
+
+CENT = Decimal("0.01")
+
+
+class PriceEntry(NamedTuple):
+    """Price data for one menu item."""
+    price: Decimal
+    discount_percentage: Decimal
+    is_available: bool
+
+
+class QuoteLine(NamedTuple):
+    """A priced cart line."""
+    menu_item_id: int
+    quantity: int
+    unit_price: Decimal
+    discount_percentage: Decimal
+    subtotal: Decimal
+
+
+class Quote(NamedTuple):
+    """A priced cart."""
+    lines: List[QuoteLine]
+    total_amount: Decimal
+
+
+class PricingError(Exception):
+    """Raised when a cart references items that cannot be sold."""
+
+    def __init__(self, message: str, menu_item_ids: List[int]):
+        """
+        Initialize the error.
+
+        Args:
+            message: Human readable reason
+            menu_item_ids: Offending menu item IDs
+        """
+        super().__init__(message)
+        self.menu_item_ids = menu_item_ids
+
+
+def discounted_price(price: Decimal, discount_percentage: Decimal) -> Decimal:
+    """
+    Apply a percentage discount to a price, rounded to the cent.
+
+    Args:
+        price: List price
+        discount_percentage: Discount between 0 and 100
+
+    Returns:
+        Decimal: Unit price charged to the customer
+    """
+    return (price * (100 - discount_percentage) / 100).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+class PricingEngine:
+    """
+    Price carts from an in-memory price/discount snapshot per tenant.
+
+    Snapshots are loaded with one query on first use and dropped on menu
+    writes, so pricing a cart normally costs no database queries.
+    """
+
+    def __init__(self):
+        """Initialize empty snapshot and version maps."""
+        self._snapshots: Dict[int, Dict[int, PriceEntry]] = {}
+        self._versions: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    async def get_snapshot(self, db: AsyncSession, tenant_id: int) -> Dict[int, PriceEntry]:
+        """
+        Get the price snapshot for a tenant, loading it if needed.
+
+        Args:
+            db: Database session used on a snapshot miss
+            tenant_id: Tenant ID
+
+        Returns:
+            Dict[int, PriceEntry]: Price entries keyed by menu item ID
+        """
+        snapshot = self._snapshots.get(tenant_id)
+        if snapshot is not None:
+            return snapshot
+
+        with self._lock:
+            version = self._versions.setdefault(tenant_id, 0)
+
+        result = await db.execute(
+            select(
+                MenuItem.id, MenuItem.price, MenuItem.discount_percentage, MenuItem.is_available
+            ).where(MenuItem.tenant_id == tenant_id)
+        )
+        snapshot = {
+            item_id: PriceEntry(
+                price=price,
+                discount_percentage=discount or Decimal(0),
+                is_available=bool(is_available)
+            )
+            for item_id, price, discount, is_available in result.all()
+        }
+
+        with self._lock:
+            # Don't cache a snapshot that raced a menu write
+            if self._versions.get(tenant_id) == version:
+                self._snapshots[tenant_id] = snapshot
+        return snapshot
+
+    async def quote(
+        self,
+        db: AsyncSession,
+        tenant_id: int,
+        items: Iterable[Tuple[int, int]]
+    ) -> Quote:
+        """
+        Price a cart.
+
+        Args:
+            db: Database session used on a snapshot miss
+            tenant_id: Tenant ID
+            items: (menu_item_id, quantity) pairs
+
+        Returns:
+            Quote: Priced lines and total
+
+        Raises:
+            PricingError: If an item is unknown or unavailable
+        """
+        snapshot = await self.get_snapshot(db, tenant_id)
+        lines = []
+        unknown = []
+        unavailable = []
+
+        for menu_item_id, quantity in items:
+            entry = snapshot.get(menu_item_id)
+            if entry is None:
+                unknown.append(menu_item_id)
+                continue
+            if not entry.is_available:
+                unavailable.append(menu_item_id)
+                continue
+            unit_price = discounted_price(entry.price, entry.discount_percentage)
+            lines.append(QuoteLine(
+                menu_item_id=menu_item_id,
+                quantity=quantity,
+                unit_price=unit_price,
+                discount_percentage=entry.discount_percentage,
+                subtotal=unit_price * quantity
+            ))
+
+        if unknown:
+            raise PricingError("Menu items not found", unknown)
+        if unavailable:
+            raise PricingError("Menu items are no longer available", unavailable)
+
+        return Quote(lines=lines, total_amount=sum((line.subtotal for line in lines), Decimal(0)))
+
+    def invalidate(self, tenant_id: int) -> None:
+        """
+        Drop the snapshot for a tenant.
+
+        Args:
+            tenant_id: Tenant ID
+        """
+        with self._lock:
+            self._snapshots.pop(tenant_id, None)
+            self._versions[tenant_id] = self._versions.get(tenant_id, 0) + 1
+
+    def clear(self) -> None:
+        """Drop every snapshot."""
+        with self._lock:
+            for tenant_id in self._versions:
+                self._versions[tenant_id] += 1
+            self._snapshots.clear()
+
+
+# Global pricing engine
+pricing_engine = PricingEngine()
@@ -0,0 +1,470 @@
+"""Kitchen order queue on per-tenant Redis Streams with a consumer group."""
+import json
+from typing import Dict, Iterable, List, Optional, Tuple
+import redis
+from app.config import settings
+from app.core.cache import cache
+
+KITCHEN_STREAM = "kitchen:orders"
+KITCHEN_GROUP = "kitchen-workers"
+KITCHEN_DEAD_LETTER_STREAM = f"{KITCHEN_STREAM}:dead"
+
+# Ticket queues of the kitchen stations: kitchen:station:{station}:{tenant_id}
+STATION_STREAM_PREFIX = "kitchen:station"
+
+
+def station_prefix(station: str) -> str:
+    """Key prefix of a kitchen station's ticket queue."""
+    return f"{STATION_STREAM_PREFIX}:{station}"
+
+
+class _KitchenQueueBase:
+    """
+    Deliver kitchen orders to any number of workers, at least once.
+
+    Each tenant has its own stream ({prefix}:{tenant_id}), registered in the
+    {prefix}:tenants set when its first order is added, so one tenant's
+    backlog never sits in front of another's and workers can choose whose
+    orders to read next. Every worker reads as its own consumer in one
+    consumer group per stream, so each entry goes to exactly one of them. An
+    entry stays pending until the worker acks it; entries left pending by a
+    crashed worker for longer than claim_idle_ms are claimed by another
+    worker with XAUTOCLAIM. Entries delivered max_deliveries times without an
+    ack are moved to the dead letter stream. Acked entries are deleted, so a
+    stream's length is that tenant's backlog.
+
+    This base builds the commands and interprets their replies without any
+    I/O; KitchenQueue and AsyncKitchenQueue send them on a sync or an async
+    client.
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        prefix: str = KITCHEN_STREAM,
+        claim_idle_ms: int = 60000,
+        max_deliveries: int = 5
+    ):
+        """
+        Initialize the queue.
+
+        Args:
+            redis_client: Redis client (sync for KitchenQueue, redis.asyncio
+                for AsyncKitchenQueue)
+            prefix: Key prefix of the tenant streams and the tenant set
+            claim_idle_ms: Pending time after which an entry is reclaimed
+            max_deliveries: Deliveries before an entry is dead-lettered
+        """
+        self.client = redis_client
+        self.prefix = prefix
+        self.tenants_key = f"{prefix}:tenants"
+        self.claim_idle_ms = claim_idle_ms
+        self.max_deliveries = max_deliveries
+        self._claim_cursors: Dict[int, str] = {}
+
+    def stream(self, tenant_id: int) -> str:
+        """Key of a tenant's stream."""
+        return f"{self.prefix}:{tenant_id}"
+
+    def _queue_add(self, pipe, message: dict) -> None:
+        """Queue registering the tenant and appending the message on a pipeline."""
+        tenant_id = message["tenant_id"]
+        pipe.sadd(self.tenants_key, tenant_id)
+        pipe.xadd(self.stream(tenant_id), {"order": json.dumps(message)})
+
+    @staticmethod
+    def _tenant_ids(members) -> List[int]:
+        """Sort the members of the tenant set as IDs."""
+        return sorted(int(tenant_id) for tenant_id in members)
+
+    @staticmethod
+    def _ignore_busy_group(error: redis.ResponseError) -> None:
+        """Re-raise an XGROUP CREATE error unless the group already exists."""
+        if "BUSYGROUP" not in str(error):
+            raise error
+
+    def _read_args(
+        self,
+        consumer: str,
+        tenant_ids: Iterable[int],
+        count: int,
+        block_ms: Optional[int],
+        pending: Optional[Dict[int, str]]
+    ) -> Optional[dict]:
+        """XREADGROUP arguments, or None if there is nothing to read."""
+        if pending is not None:
+            streams = {self.stream(tenant_id): pending.get(tenant_id, "0") for tenant_id in tenant_ids}
+        else:
+            streams = {self.stream(tenant_id): ">" for tenant_id in tenant_ids}
+        if not streams:
+            return None
+        return {
+            "groupname": KITCHEN_GROUP,
+            "consumername": consumer,
+            "streams": streams,
+            "count": count,
+            "block": None if pending else block_ms,
+        }
+
+    def _by_tenant(self, response) -> List[Tuple[int, list]]:
+        """Turn an XREADGROUP response into (tenant_id, entries) pairs."""
+        offset = len(self.prefix) + 1
+        return [(int(stream[offset:]), entries) for stream, entries in response or []]
+
+    def _claim_args(self, consumer: str, tenant_id: int, count: int) -> dict:
+        """XAUTOCLAIM arguments continuing from the tenant's cursor."""
+        return {
+            "name": self.stream(tenant_id),
+            "groupname": KITCHEN_GROUP,
+            "consumername": consumer,
+            "min_idle_time": self.claim_idle_ms,
+            "start_id": self._claim_cursors.get(tenant_id, "0-0"),
+            "count": count,
+        }
+
+    def _claimed(self, tenant_id: int, response) -> list:
+        """Advance the tenant's cursor past an XAUTOCLAIM response and return its entries."""
+        self._claim_cursors[tenant_id], entries, *_ = response
+        return entries
+
+    def _queue_delivery_counts(self, pipe, tenant_id: int, entries) -> None:
+        """Queue reading the delivery count of exactly these entries, one XPENDING each."""
+        # A range over the first to last ID could also hold other consumers'
+        # entries and push some of the claimed ones past the count
+        for entry_id, _ in entries:
+            pipe.xpending_range(self.stream(tenant_id), KITCHEN_GROUP, min=entry_id, max=entry_id, count=1)
+
+    def _queue_reclaimed(self, pipe, tenant_id: int, entries, pending: list) -> List[Tuple[int, str, dict]]:
+        """Queue dead-lettering over-delivered and unreadable claimed entries; return the rest parsed."""
+        deliveries = {item["message_id"]: item["times_delivered"] for items in pending for item in items}
+        keep = []
+        dead = []
+        for entry_id, fields in entries:
+            (dead if deliveries.get(entry_id, 0) > self.max_deliveries else keep).append((entry_id, fields))
+        if dead:
+            print(f"Dead-lettered {len(dead)} kitchen orders")
+            self._queue_dead_letters(pipe, tenant_id, dead, "too many deliveries")
+        return self._queue_decode(pipe, [(tenant_id, keep)])
+
+    def _queue_dead_letters(self, pipe, tenant_id: int, entries, error: str) -> None:
+        """Queue copying a tenant's entries to the dead letter stream and acking them."""
+        if not entries:
+            return
+        for entry_id, fields in entries:
+            pipe.xadd(
+                KITCHEN_DEAD_LETTER_STREAM,
+                dict(fields or {}, tenant_id=tenant_id, entry_id=entry_id, error=error)
+            )
+        self._queue_ack(pipe, tenant_id, [entry_id for entry_id, _ in entries])
+
+    def _queue_acks(self, pipe, entries: List[Tuple[int, str]]) -> None:
+        """Queue acking (tenant_id, entry_id) pairs, one XACK and XDEL per tenant."""
+        by_tenant: Dict[int, List[str]] = {}
+        for tenant_id, entry_id in entries:
+            by_tenant.setdefault(tenant_id, []).append(entry_id)
+        for tenant_id, entry_ids in by_tenant.items():
+            self._queue_ack(pipe, tenant_id, entry_ids)
+
+    def _queue_ack(self, pipe, tenant_id: int, entry_ids: List[str]) -> None:
+        """Queue XACK and XDEL for a tenant's entries on a pipeline."""
+        stream = self.stream(tenant_id)
+        pipe.xack(stream, KITCHEN_GROUP, *entry_ids)
+        pipe.xdel(stream, *entry_ids)
+
+    def _queue_depth(self, pipe, tenant_ids: List[int]) -> None:
+        """Queue XLEN and XPENDING for each tenant on a pipeline."""
+        for tenant_id in tenant_ids:
+            pipe.xlen(self.stream(tenant_id))
+            pipe.xpending(self.stream(tenant_id), KITCHEN_GROUP)
+
+    def _depths(self, tenant_ids: List[int], results: list) -> Dict[int, dict]:
+        """Pair XLEN and XPENDING results with their tenants."""
+        depths = {}
+        for tenant_id, length, pending in zip(tenant_ids, results[::2], results[1::2]):
+            if isinstance(length, Exception):
+                raise length
+            # A stream without a group yet has nothing in progress
+            in_progress = 0 if isinstance(pending, Exception) else pending["pending"]
+            depths[tenant_id] = {"backlog": length, "in_progress": in_progress}
+        return depths
+
+    def _queue_decode(self, pipe, groups: List[Tuple[int, list]]) -> List[Tuple[int, str, dict]]:
+        """Parse entry payloads; queue dead-lettering unreadable ones and acking deleted ones."""
+        decoded = []
+        for tenant_id, entries in groups:
+            unreadable = []
+            deleted = []
+            for entry_id, fields in entries:
+                if not fields:
+                    # Pending entry that was already deleted from the stream
+                    deleted.append(entry_id)
+                    continue
+                try:
+                    decoded.append((tenant_id, entry_id, json.loads(fields["order"])))
+                except (KeyError, TypeError, json.JSONDecodeError):
+                    unreadable.append((entry_id, fields))
+            self._queue_dead_letters(pipe, tenant_id, unreadable, "unreadable entry")
+            if deleted:
+                self._queue_ack(pipe, tenant_id, deleted)
+        return decoded
+
+
+class KitchenQueue(_KitchenQueueBase):
+    """Kitchen queue on a sync Redis client (the outbox relay and scripts)."""
+
+    def add(self, message: dict, pipe=None) -> Optional[str]:
+        """
+        Append a message to its tenant's stream.
+
+        Args:
+            message: Kitchen order message with its tenant_id
+            pipe: Pipeline to queue the commands on instead of sending them
+
+        Returns:
+            Optional[str]: Entry ID, or None when queued on a pipeline
+        """
+        target = pipe or self.client.pipeline(transaction=False)
+        self._queue_add(target, message)
+        if pipe is None:
+            return target.execute()[-1]
+        return None
+
+    def tenants(self) -> List[int]:
+        """
+        List the tenants that have ever queued an order.
+
+        Returns:
+            List[int]: Tenant IDs in ascending order
+        """
+        return self._tenant_ids(self.client.smembers(self.tenants_key))
+
+    def ensure_group(self, tenant_ids: Iterable[int]) -> None:
+        """Create the consumer group (and the stream) of each tenant if missing."""
+        for tenant_id in tenant_ids:
+            try:
+                self.client.xgroup_create(self.stream(tenant_id), KITCHEN_GROUP, id="0", mkstream=True)
+            except redis.ResponseError as e:
+                self._ignore_busy_group(e)
+
+    def read(
+        self,
+        consumer: str,
+        tenant_ids: Iterable[int],
+        count: int = 1,
+        block_ms: Optional[int] = 5000,
+        pending: Optional[Dict[int, str]] = None
+    ) -> List[Tuple[int, str, dict]]:
+        """
+        Read entries for a consumer from several tenants' streams at once.
+
+        Args:
+            consumer: Consumer name
+            tenant_ids: Tenants to read from
+            count: Maximum number of entries per tenant
+            block_ms: How long to block waiting for new entries, or None
+                to return at once
+            pending: Instead of new entries, re-read entries delivered to
+                this consumer but never acked, after these entry IDs per
+                tenant ("0" for all)
+
+        Returns:
+            List[Tuple[int, str, dict]]: (tenant_id, entry_id, message) triples
+        """
+        args = self._read_args(consumer, tenant_ids, count, block_ms, pending)
+        if args is None:
+            return []
+        return self._decode(self._by_tenant(self.client.xreadgroup(**args)))
+
+    def reclaim(self, consumer: str, tenant_id: int, count: int = 100) -> List[Tuple[int, str, dict]]:
+        """
+        Claim entries of a tenant that other consumers left pending for too long.
+
+        Successive calls walk the tenant's pending list with a cursor, so a
+        long list is reclaimed a page at a time.
+
+        Args:
+            consumer: Consumer name taking over the entries
+            tenant_id: Tenant whose stream to reclaim from
+            count: Maximum number of entries to claim
+
+        Returns:
+            List[Tuple[int, str, dict]]: Claimed (tenant_id, entry_id, message)
+            triples, minus the ones that were dead-lettered
+        """
+        entries = self._claimed(tenant_id, self.client.xautoclaim(**self._claim_args(consumer, tenant_id, count)))
+        if not entries:
+            return []
+
+        pipe = self.client.pipeline(transaction=False)
+        self._queue_delivery_counts(pipe, tenant_id, entries)
+        pending = pipe.execute()
+        pipe = self.client.pipeline(transaction=False)
+        claimed = self._queue_reclaimed(pipe, tenant_id, entries, pending)
+        if len(pipe):
+            pipe.execute()
+        return claimed
+
+    def ack(self, entries: List[Tuple[int, str]], pipe=None) -> None:
+        """
+        Acknowledge and delete processed entries.
+
+        Args:
+            entries: (tenant_id, entry_id) pairs
+            pipe: Pipeline to queue the commands on instead of sending them
+        """
+        if not entries:
+            return
+        target = pipe or self.client.pipeline(transaction=False)
+        self._queue_acks(target, entries)
+        if pipe is None:
+            target.execute()
+
+    def depth(self, tenant_ids: Optional[Iterable[int]] = None) -> Dict[int, dict]:
+        """
+        Measure the queue of each tenant.
+
+        Args:
+            tenant_ids: Tenants to measure (default: every registered tenant)
+
+        Returns:
+            Dict[int, dict]: Per tenant, entries not yet acked and how many
+            of them are being processed
+        """
+        tenant_ids = self.tenants() if tenant_ids is None else list(tenant_ids)
+        pipe = self.client.pipeline(transaction=False)
+        self._queue_depth(pipe, tenant_ids)
+        return self._depths(tenant_ids, pipe.execute(raise_on_error=False))
+
+    def _decode(self, groups: List[Tuple[int, list]]) -> List[Tuple[int, str, dict]]:
+        """Parse entry payloads, dead-lettering unreadable ones."""
+        pipe = self.client.pipeline(transaction=False)
+        decoded = self._queue_decode(pipe, groups)
+        if len(pipe):
+            pipe.execute()
+        return decoded
+
+
+class AsyncKitchenQueue(_KitchenQueueBase):
+    """Kitchen queue on a redis.asyncio client (workers and API routes); see KitchenQueue."""
+
+    async def add(self, message: dict, pipe=None) -> Optional[str]:
+        """Append a message to its tenant's stream (see KitchenQueue.add)."""
+        target = pipe or self.client.pipeline(transaction=False)
+        self._queue_add(target, message)
+        if pipe is None:
+            return (await target.execute())[-1]
+        return None
+
+    async def tenants(self) -> List[int]:
+        """List the tenants that have ever queued an order (see KitchenQueue.tenants)."""
+        return self._tenant_ids(await self.client.smembers(self.tenants_key))
+
+    async def ensure_group(self, tenant_ids: Iterable[int]) -> None:
+        """Create the consumer group (and the stream) of each tenant if missing."""
+        for tenant_id in tenant_ids:
+            try:
+                await self.client.xgroup_create(self.stream(tenant_id), KITCHEN_GROUP, id="0", mkstream=True)
+            except redis.ResponseError as e:
+                self._ignore_busy_group(e)
+
+    async def read(
+        self,
+        consumer: str,
+        tenant_ids: Iterable[int],
+        count: int = 1,
+        block_ms: Optional[int] = 5000,
+        pending: Optional[Dict[int, str]] = None
+    ) -> List[Tuple[int, str, dict]]:
+        """Read entries for a consumer from several tenants' streams (see KitchenQueue.read)."""
+        args = self._read_args(consumer, tenant_ids, count, block_ms, pending)
+        if args is None:
+            return []
+        return await self._decode(self._by_tenant(await self.client.xreadgroup(**args)))
+
+    async def reclaim(self, consumer: str, tenant_id: int, count: int = 100) -> List[Tuple[int, str, dict]]:
+        """Claim a tenant's entries other consumers left pending for too long (see KitchenQueue.reclaim)."""
+        entries = self._claimed(tenant_id, await self.client.xautoclaim(**self._claim_args(consumer, tenant_id, count)))
+        if not entries:
+            return []
+
+        pipe = self.client.pipeline(transaction=False)
+        self._queue_delivery_counts(pipe, tenant_id, entries)
+        pending = await pipe.execute()
+        pipe = self.client.pipeline(transaction=False)
+        claimed = self._queue_reclaimed(pipe, tenant_id, entries, pending)
+        if len(pipe):
+            await pipe.execute()
+        return claimed
+
+    async def ack(self, entries: List[Tuple[int, str]], pipe=None) -> None:
+        """Acknowledge and delete processed entries (see KitchenQueue.ack)."""
+        if not entries:
+            return
+        target = pipe or self.client.pipeline(transaction=False)
+        self._queue_acks(target, entries)
+        if pipe is None:
+            await target.execute()
+
+    async def depth(self, tenant_ids: Optional[Iterable[int]] = None) -> Dict[int, dict]:
+        """Measure the queue of each tenant (see KitchenQueue.depth)."""
+        tenant_ids = await self.tenants() if tenant_ids is None else list(tenant_ids)
+        pipe = self.client.pipeline(transaction=False)
+        self._queue_depth(pipe, tenant_ids)
+        return self._depths(tenant_ids, await pipe.execute(raise_on_error=False))
+
+    async def _decode(self, groups: List[Tuple[int, list]]) -> List[Tuple[int, str, dict]]:
+        """Parse entry payloads, dead-lettering unreadable ones."""
+        pipe = self.client.pipeline(transaction=False)
+        decoded = self._queue_decode(pipe, groups)
+        if len(pipe):
+            await pipe.execute()
+        return decoded
+
+
+# Global kitchen queue
+kitchen_queue = KitchenQueue(
+    cache.client,
+    claim_idle_ms=settings.KITCHEN_QUEUE_CLAIM_IDLE_MS,
+    max_deliveries=settings.KITCHEN_QUEUE_MAX_DELIVERIES
+)
+
+_async_kitchen_queue: Optional[AsyncKitchenQueue] = None
+_station_queues: Dict[str, KitchenQueue] = {}
+
+
+def async_kitchen_queue() -> AsyncKitchenQueue:
+    """
+    Get the kitchen queue for async code such as API routes.
+
+    Returns:
+        AsyncKitchenQueue: The queue on the shared async Redis client
+    """
+    global _async_kitchen_queue
+    if _async_kitchen_queue is None:
+        _async_kitchen_queue = AsyncKitchenQueue(
+            cache.async_client,
+            claim_idle_ms=settings.KITCHEN_QUEUE_CLAIM_IDLE_MS,
+            max_deliveries=settings.KITCHEN_QUEUE_MAX_DELIVERIES
+        )
+    return _async_kitchen_queue
+
+
+def station_queue(station: str) -> KitchenQueue:
+    """
+    Get the ticket queue of a kitchen station.
+
+    Args:
+        station: Station name
+
+    Returns:
+        KitchenQueue: The station's queue on the global Redis client
+    """
+    queue = _station_queues.get(station)
+    if queue is None:
+        queue = _station_queues[station] = KitchenQueue(
+            cache.client,
+            prefix=station_prefix(station),
+            claim_idle_ms=settings.KITCHEN_QUEUE_CLAIM_IDLE_MS,
+            max_deliveries=settings.KITCHEN_QUEUE_MAX_DELIVERIES
+        )
+    return queue
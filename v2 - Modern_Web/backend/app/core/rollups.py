@@ -0,0 +1,279 @@
+"""Incremental hourly sales rollups."""
+from collections import defaultdict
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import and_, exists, insert, or_, select, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models import Order, OrderItem, OrderStatus, SalesHourly, ItemSalesHourly, RollupLedger
+
+CENT = Decimal("0.01")
+
+# Orders loaded per backfill batch
+BACKFILL_BATCH_SIZE = 1000
+
+
+def hour_bucket(created_at) -> datetime:
+    """Truncate a creation time (datetime or ISO string) to its naive UTC hour."""
+    if isinstance(created_at, str):
+        created_at = datetime.fromisoformat(created_at)
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return created_at.replace(minute=0, second=0, microsecond=0)
+
+
+def _increment(dialect: str, model, rows: List[dict], keys: List[str], columns: List[str]):
+    """Build a multi-row INSERT that adds to the counters of existing rows."""
+    table = model.__table__
+    if dialect == "mysql":
+        stmt = mysql.insert(model).values(rows)
+        return stmt.on_duplicate_key_update({column: table.c[column] + stmt.inserted[column] for column in columns})
+
+    dialect_insert = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}.get(dialect)
+    if dialect_insert is None:
+        raise ValueError(f"Sales rollups are not supported on {dialect}")
+    stmt = dialect_insert(model).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=keys,
+        set_={column: table.c[column] + stmt.excluded[column] for column in columns}
+    )
+
+
+def _add_to_rollups(db: Session, orders: List[dict], sign: int) -> None:
+    """Add (sign=1) or subtract (sign=-1) orders' sales in the hourly rollups."""
+    sales: Dict[Tuple[int, datetime], list] = defaultdict(lambda: [0, Decimal(0)])
+    item_sales: Dict[Tuple[int, datetime, int], list] = defaultdict(lambda: [0, Decimal(0)])
+    for order in orders:
+        hour = hour_bucket(order["created_at"])
+        revenue = Decimal(0)
+        for item in order["items"]:
+            amount = (Decimal(str(item["unit_price"])) * item["quantity"]).quantize(CENT)
+            revenue += amount
+            totals = item_sales[(order["tenant_id"], hour, item["menu_item_id"])]
+            totals[0] += sign * item["quantity"]
+            totals[1] += sign * amount
+        totals = sales[(order["tenant_id"], hour)]
+        totals[0] += sign
+        totals[1] += sign * revenue
+
+    dialect = db.get_bind().dialect.name
+    db.execute(_increment(
+        dialect,
+        SalesHourly,
+        [
+            {"tenant_id": tenant_id, "hour": hour, "order_count": count, "revenue": revenue}
+            for (tenant_id, hour), (count, revenue) in sales.items()
+        ],
+        keys=["tenant_id", "hour"],
+        columns=["order_count", "revenue"]
+    ))
+    if item_sales:
+        db.execute(_increment(
+            dialect,
+            ItemSalesHourly,
+            [
+                {"tenant_id": tenant_id, "hour": hour, "menu_item_id": item_id, "quantity": quantity, "revenue": revenue}
+                for (tenant_id, hour, item_id), (quantity, revenue) in item_sales.items()
+            ],
+            keys=["tenant_id", "hour", "menu_item_id"],
+            columns=["quantity", "revenue"]
+        ))
+
+
+def apply_orders(db: Session, orders: Iterable[dict]) -> int:
+    """
+    Add orders to the hourly rollups in the current transaction.
+
+    Orders already in the ledger are skipped, including cancelled orders
+    that reverse_orders got to first. Two writers racing on the same order
+    both insert its ledger row, and the loser fails with IntegrityError;
+    see record_orders.
+
+    Args:
+        db: Database session
+        orders: Kitchen queue messages (order_id, tenant_id, created_at and
+            items with menu_item_id, quantity and unit_price)
+
+    Returns:
+        int: Number of orders counted
+    """
+    orders = {order["order_id"]: order for order in orders}
+    if not orders:
+        return 0
+    counted = set(db.execute(
+        select(RollupLedger.order_id).where(RollupLedger.order_id.in_(list(orders)))
+    ).scalars().all())
+    new_orders = [order for order_id, order in orders.items() if order_id not in counted]
+    if not new_orders:
+        return 0
+
+    now = datetime.now(timezone.utc)
+    db.execute(insert(RollupLedger), [
+        {"order_id": order["order_id"], "tenant_id": order["tenant_id"], "applied_at": now}
+        for order in new_orders
+    ])
+    _add_to_rollups(db, new_orders, 1)
+    return len(new_orders)
+
+
+def reverse_orders(db: Session, orders: Iterable[dict]) -> int:
+    """
+    Take cancelled orders out of the hourly rollups in the current transaction.
+
+    Counted orders are subtracted again and their ledger row is marked
+    reversed, so a redelivered cancellation is skipped. Orders that were
+    not counted yet get a reversed ledger row instead, so the worker and
+    the backfill never count them.
+
+    Args:
+        db: Database session
+        orders: Cancelled orders, in the kitchen queue message format
+
+    Returns:
+        int: Number of orders subtracted
+    """
+    orders = {order["order_id"]: order for order in orders}
+    if not orders:
+        return 0
+    ledger = dict(db.execute(
+        select(RollupLedger.order_id, RollupLedger.reversed_at)
+        .where(RollupLedger.order_id.in_(list(orders)))
+        .with_for_update()
+    ).all())
+
+    now = datetime.now(timezone.utc)
+    uncounted = [order for order_id, order in orders.items() if order_id not in ledger]
+    if uncounted:
+        db.execute(insert(RollupLedger), [
+            {"order_id": order["order_id"], "tenant_id": order["tenant_id"], "applied_at": now, "reversed_at": now}
+            for order in uncounted
+        ])
+
+    counted = [order for order_id, order in orders.items() if order_id in ledger and ledger[order_id] is None]
+    if not counted:
+        return 0
+    db.execute(
+        update(RollupLedger)
+        .where(RollupLedger.order_id.in_([order["order_id"] for order in counted]))
+        .values(reversed_at=now)
+    )
+    _add_to_rollups(db, counted, -1)
+    return len(counted)
+
+
+def load_orders(db: Session, order_ids: List[int]) -> List[dict]:
+    """Load orders with their items in the kitchen queue message format."""
+    if not order_ids:
+        return []
+    rows = db.execute(
+        select(Order.id, Order.tenant_id, Order.created_at).where(Order.id.in_(order_ids))
+    ).all()
+    items = defaultdict(list)
+    for order_id, menu_item_id, quantity, unit_price in db.execute(
+        select(OrderItem.order_id, OrderItem.menu_item_id, OrderItem.quantity, OrderItem.unit_price)
+        .where(OrderItem.order_id.in_([row.id for row in rows]))
+    ).all():
+        items[order_id].append({"menu_item_id": menu_item_id, "quantity": quantity, "unit_price": unit_price})
+    return [
+        {"order_id": row.id, "tenant_id": row.tenant_id, "created_at": row.created_at, "items": items[row.id]}
+        for row in rows
+    ]
+
+
+def record_orders(db: Session, orders: Iterable[dict]) -> int:
+    """
+    Count orders in the rollups and commit, exactly once per order.
+
+    Args:
+        db: Database session
+        orders: Kitchen queue messages
+
+    Returns:
+        int: Number of orders counted by this call
+    """
+    orders = list(orders)
+    try:
+        counted = apply_orders(db, orders)
+        db.commit()
+        return counted
+    except IntegrityError:
+        # Another writer counted some of them first; the retry skips those
+        db.rollback()
+        counted = apply_orders(db, orders)
+        db.commit()
+        return counted
+
+
+def record_cancellations(db: Session, orders: Iterable[dict]) -> int:
+    """
+    Take cancelled orders out of the rollups and commit, exactly once per order.
+
+    Args:
+        db: Database session
+        orders: Cancelled orders, in the kitchen queue message format
+
+    Returns:
+        int: Number of orders subtracted by this call
+    """
+    orders = list(orders)
+    try:
+        reversed_count = reverse_orders(db, orders)
+        db.commit()
+        return reversed_count
+    except IntegrityError:
+        # The worker counted some of them first; the retry subtracts those
+        db.rollback()
+        reversed_count = reverse_orders(db, orders)
+        db.commit()
+        return reversed_count
+
+
+def backfill(db: Session, tenant_id: Optional[int] = None, since: Optional[datetime] = None) -> int:
+    """
+    Count historical orders that are missing from the rollups.
+
+    Cancelled orders are not counted, and cancelled orders that were counted
+    but never subtracted again are subtracted. Orders are read in ID order
+    in batches of BACKFILL_BATCH_SIZE, each committed on its own, so the
+    backfill can be interrupted and resumed and can run while the worker
+    is live.
+
+    Args:
+        db: Database session
+        tenant_id: Only this tenant (default: all)
+        since: Only orders created at or after this time
+
+    Returns:
+        int: Number of orders counted or subtracted
+    """
+    conditions = [or_(
+        ~exists().where(RollupLedger.order_id == Order.id),
+        and_(
+            Order.status == OrderStatus.CANCELLED,
+            exists().where(RollupLedger.order_id == Order.id, RollupLedger.reversed_at.is_(None))
+        )
+    )]
+    if tenant_id is not None:
+        conditions.append(Order.tenant_id == tenant_id)
+    if since is not None:
+        conditions.append(Order.created_at >= since)
+
+    total = 0
+    last_id = 0
+    while True:
+        rows = db.execute(
+            select(Order.id, Order.status)
+            .where(Order.id > last_id, *conditions)
+            .order_by(Order.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            return total
+        last_id = rows[-1].id
+
+        cancelled = {row.id for row in rows if row.status == OrderStatus.CANCELLED}
+        orders = load_orders(db, [row.id for row in rows])
+        total += record_orders(db, [order for order in orders if order["order_id"] not in cancelled])
+        total += record_cancellations(db, [order for order in orders if order["order_id"] in cancelled])
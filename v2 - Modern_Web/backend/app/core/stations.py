@@ -0,0 +1,205 @@
+"""Kitchen station routing: orders split into per-station tickets."""
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models import Category, MenuItem, Order, OrderStatus, OrderTicket, TicketStatus, DEFAULT_STATION
+from app.core.outbox import add_outbox_event, STATION_TICKETS
+from app.core.order_events import order_events_topic, order_status_event
+
+
+def check_station(station: str) -> str:
+    """
+    Validate a category's station against KITCHEN_STATIONS.
+
+    Args:
+        station: Station name
+
+    Returns:
+        str: The station
+
+    Raises:
+        ValueError: If the station isn't configured
+    """
+    if station not in settings.kitchen_stations_list:
+        raise ValueError(f"station must be one of {', '.join(settings.kitchen_stations_list)}")
+    return station
+
+
+def routed_station(station: Optional[str]) -> str:
+    """Station that gets an item of a category on this station (DEFAULT_STATION if unknown)."""
+    return station if station in settings.kitchen_stations_list else DEFAULT_STATION
+
+
+def split_orders(db: Session, orders: Iterable[dict]) -> List[dict]:
+    """
+    Split orders into per-station tickets in the current transaction.
+
+    Each item goes to the station of its category (DEFAULT_STATION once its
+    menu item is deleted or when the station was dropped from
+    KITCHEN_STATIONS), and each station an order has items for gets one
+    ticket, queued to the station through the outbox. The order's status is
+    left to the kitchen display, which starts it with expected_status
+    pending. Orders that already have tickets, as when the kitchen queue
+    redelivers a message, and orders no longer pending or preparing are
+    skipped. Two writers racing on the same order both insert its tickets,
+    and the loser fails with IntegrityError; see dispatch_orders.
+
+    Args:
+        db: Database session
+        orders: Kitchen queue messages (order_id, order_number, tenant_id and
+            items with menu_item_id and quantity)
+
+    Returns:
+        List[dict]: Ticket messages queued to the stations
+    """
+    orders = {order["order_id"]: order for order in orders if order["items"]}
+    if not orders:
+        return []
+    split = set(db.execute(
+        select(OrderTicket.order_id).where(OrderTicket.order_id.in_(list(orders)))
+    ).scalars().all())
+    new_ids = [order_id for order_id in orders if order_id not in split]
+    if not new_ids:
+        return []
+    # Lock the orders so a concurrent cancellation can't land between the check and the inserts
+    current = db.execute(
+        select(Order.id).where(
+            Order.id.in_(new_ids),
+            Order.status.in_([OrderStatus.PENDING, OrderStatus.PREPARING])
+        ).with_for_update()
+    ).scalars().all()
+    if not current:
+        return []
+
+    item_ids = {item["menu_item_id"] for order_id in current for item in orders[order_id]["items"]}
+    stations = dict(db.execute(
+        select(MenuItem.id, Category.station).join(Category, MenuItem.category_id == Category.id).where(
+            MenuItem.id.in_(item_ids)
+        )
+    ).all())
+
+    tickets = []
+    for order_id in current:
+        order = orders[order_id]
+        items_by_station: Dict[str, list] = defaultdict(list)
+        for item in order["items"]:
+            items_by_station[routed_station(stations.get(item["menu_item_id"]))].append(item)
+        for station, items in sorted(items_by_station.items()):
+            ticket = OrderTicket(order_id=order_id, tenant_id=order["tenant_id"], station=station)
+            db.add(ticket)
+            tickets.append((ticket, order, items))
+    db.flush()
+
+    messages = []
+    for ticket, order, items in tickets:
+        message = {
+            "ticket_id": ticket.id,
+            "order_id": order["order_id"],
+            "order_number": order.get("order_number"),
+            "order_date": order.get("order_date"),
+            "tenant_id": order["tenant_id"],
+            "station": ticket.station,
+            "items": [{"menu_item_id": item["menu_item_id"], "quantity": item["quantity"]} for item in items],
+        }
+        add_outbox_event(db, STATION_TICKETS, message)
+        messages.append(message)
+    return messages
+
+
+def dispatch_orders(db: Session, orders: Iterable[dict]) -> List[dict]:
+    """
+    Split orders into per-station tickets and commit, exactly once per order.
+
+    Args:
+        db: Database session
+        orders: Kitchen queue messages
+
+    Returns:
+        List[dict]: Ticket messages queued by this call
+    """
+    orders = list(orders)
+    try:
+        messages = split_orders(db, orders)
+        db.commit()
+        return messages
+    except IntegrityError:
+        # Another worker split some of them first; the retry skips those
+        db.rollback()
+        messages = split_orders(db, orders)
+        db.commit()
+        return messages
+
+
+def complete_ticket(db: Session, tenant_id: int, ticket_id: int) -> Optional[dict]:
+    """
+    Mark a station's ticket done and commit, readying the order after its last ticket.
+
+    The order row is locked first, so when several stations finish the same
+    order at once, each sees the tickets the others completed and exactly
+    one of them moves the order from preparing to ready. An order the kitchen
+    display hasn't started yet stays pending. Completing a ticket that is
+    already done changes nothing.
+
+    Args:
+        db: Database session
+        tenant_id: Tenant ID
+        ticket_id: Ticket ID
+
+    Returns:
+        Optional[dict]: ticket_id, order_id, station, whether this call
+        completed the ticket, and the order's status; None if there is no
+        such ticket
+    """
+    ticket = db.execute(
+        select(OrderTicket.order_id, OrderTicket.station).where(
+            OrderTicket.id == ticket_id,
+            OrderTicket.tenant_id == tenant_id
+        )
+    ).first()
+    if ticket is None:
+        return None
+    order_id, station = ticket
+
+    order_number, order_status = db.execute(
+        select(Order.order_number, Order.status).where(Order.id == order_id).with_for_update()
+    ).one()
+    completed = db.execute(
+        update(OrderTicket).where(
+            OrderTicket.id == ticket_id,
+            OrderTicket.status == TicketStatus.OPEN
+        ).values(
+            status=TicketStatus.DONE,
+            completed_at=datetime.now(timezone.utc)
+        ).execution_options(synchronize_session=False)
+    ).rowcount == 1
+
+    if completed and order_status == OrderStatus.PREPARING:
+        open_tickets = select(OrderTicket.id).where(
+            OrderTicket.order_id == order_id,
+            OrderTicket.status == TicketStatus.OPEN
+        ).exists()
+        ready = db.execute(
+            update(Order).where(
+                Order.id == order_id,
+                Order.status == OrderStatus.PREPARING,
+                ~open_tickets
+            ).values(status=OrderStatus.READY).execution_options(synchronize_session=False)
+        ).rowcount == 1
+        if ready:
+            order_status = OrderStatus.READY
+            add_outbox_event(db, order_events_topic(tenant_id), order_status_event(
+                order_id, order_number, OrderStatus.READY.value, OrderStatus.PREPARING.value
+            ))
+    db.commit()
+
+    return {
+        "ticket_id": ticket_id,
+        "order_id": order_id,
+        "station": station,
+        "completed": completed,
+        "order_status": order_status.value,
+    }
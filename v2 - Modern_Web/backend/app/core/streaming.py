@@ -0,0 +1,134 @@
+"""Incremental CSV/NDJSON parsing and streamed generation."""
+import csv
+import io
+import json
+import zlib
+from itertools import islice
+from typing import Any, AsyncIterable, AsyncIterator, BinaryIO, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Bytes buffered before a streamed response yields a chunk
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# zlib window bits that produce a gzip header and trailer
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+def text_reader(binary: BinaryIO) -> io.TextIOWrapper:
+    """Wrap an uploaded file for line-by-line decoding (UTF-8, BOM tolerated)."""
+    return io.TextIOWrapper(binary, encoding="utf-8-sig", newline="")
+
+
+def iter_csv(binary: BinaryIO) -> Tuple[List[str], Iterator[Tuple[int, dict]]]:
+    """
+    Parse a CSV file one row at a time.
+
+    Args:
+        binary: Binary file object
+
+    Returns:
+        Tuple[List[str], Iterator]: Header, and (line number, row dict) pairs
+    """
+    reader = csv.reader(text_reader(binary))
+    header = [column.strip() for column in next(reader, [])]
+
+    def rows() -> Iterator[Tuple[int, dict]]:
+        for values in reader:
+            if not any(value.strip() for value in values):
+                continue
+            yield reader.line_num, dict(zip(header, values))
+
+    return header, rows()
+
+
+def iter_ndjson(binary: BinaryIO) -> Iterator[Tuple[int, Any, Optional[str]]]:
+    """
+    Parse a newline-delimited JSON file one line at a time.
+
+    Args:
+        binary: Binary file object
+
+    Yields:
+        Tuple[int, Any, Optional[str]]: Line number, parsed value (None on
+        error) and the parse error, if any
+    """
+    for line_number, line in enumerate(text_reader(binary), start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line), None
+        except json.JSONDecodeError as e:
+            yield line_number, None, f"Invalid JSON: {e.msg}"
+
+
+def chunked(iterable: Iterable, size: int) -> Iterator[list]:
+    """Split an iterable into lists of at most size items."""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+async def stream_csv(header: Sequence[str], rows: AsyncIterable[Sequence[Any]]) -> AsyncIterator[bytes]:
+    """
+    Render rows as CSV, yielding roughly STREAM_CHUNK_SIZE bytes at a time.
+
+    Args:
+        header: Column names
+        rows: Row values
+
+    Yields:
+        bytes: Encoded CSV
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    async for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= STREAM_CHUNK_SIZE:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+async def stream_ndjson(rows: AsyncIterable[Any]) -> AsyncIterator[bytes]:
+    """
+    Render values as newline-delimited JSON, yielding in chunks.
+
+    Args:
+        rows: JSON serializable values
+
+    Yields:
+        bytes: Encoded NDJSON
+    """
+    parts = []
+    size = 0
+    async for row in rows:
+        line = json.dumps(row, default=str) + "\n"
+        parts.append(line)
+        size += len(line)
+        if size >= STREAM_CHUNK_SIZE:
+            yield "".join(parts).encode("utf-8")
+            parts = []
+            size = 0
+    if parts:
+        yield "".join(parts).encode("utf-8")
+
+
+async def stream_gzip(chunks: AsyncIterable[bytes], level: int = 6) -> AsyncIterator[bytes]:
+    """
+    Compress a byte stream into a gzip file on the fly.
+
+    Args:
+        chunks: Uncompressed chunks
+        level: Compression level (1-9)
+
+    Yields:
+        bytes: Gzip data
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
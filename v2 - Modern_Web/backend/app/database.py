@@ -1,10 +1,40 @@
 """Database configuration and session management."""
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
 
-# Create database engine
+# Async drivers for each supported sync driver
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+
+def get_async_database_url() -> str:
+    """
+    Get the database URL for the async engine.
+
+    Uses ASYNC_DATABASE_URL when set, otherwise swaps the driver in
+    DATABASE_URL for its async counterpart (pymysql -> aiomysql,
+    sqlite -> aiosqlite).
+
+    Returns:
+        str: Async database URL
+    """
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+
+    url = make_url(settings.DATABASE_URL)
+    drivername = ASYNC_DRIVERS.get(url.drivername, url.drivername)
+    return url.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+# Create database engine (scripts, worker and migrations)
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
@@ -12,22 +42,33 @@ engine = create_engine(
     echo=settings.ENVIRONMENT == "development"
 )
 
-# Create session factory
+# Create async database engine (API routes)
+async_engine = create_async_engine(
+    get_async_database_url(),
+    pool_pre_ping=True,
+    pool_recycle=3600,
+    echo=settings.ENVIRONMENT == "development"
+)
+
+# Create session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
 
 # Base class for ORM models
 Base = declarative_base()
 
 
-def get_db():
+async def get_db():
     """
-    Dependency for getting database session.
-    
+    Dependency for getting an async database session.
+
     Yields:
-        Session: SQLAlchemy database session
+        AsyncSession: SQLAlchemy async database session
     """
-    db = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
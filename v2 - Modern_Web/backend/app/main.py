@@ -4,7 +4,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 from app.config import settings
-from app.api.v1 import auth, menu, orders, tenants, admin, branding, upload
+from app.api.v1 import auth, menu, orders, tenants, admin, branding, upload, menu_io, analytics, order_export, kitchen
+from app.core.cache import invalidator
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -22,6 +23,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Include routers
@@ -30,6 +32,10 @@ app.include_router(menu.router, prefix=f"{settings.API_V1_PREFIX}/menu", tags=["
 app.include_router(orders.router, prefix=f"{settings.API_V1_PREFIX}/orders", tags=["Orders"])
 app.include_router(tenants.router, prefix=f"{settings.API_V1_PREFIX}/tenants", tags=["Tenants"])
 app.include_router(admin.router, prefix=f"{settings.API_V1_PREFIX}/admin", tags=["Admin"])
+app.include_router(menu_io.router, prefix=f"{settings.API_V1_PREFIX}/admin/menu", tags=["Admin"])
+app.include_router(order_export.router, prefix=f"{settings.API_V1_PREFIX}/admin/orders", tags=["Admin"])
+app.include_router(kitchen.router, prefix=f"{settings.API_V1_PREFIX}/admin/kitchen", tags=["Kitchen"])
+app.include_router(analytics.router, prefix=f"{settings.API_V1_PREFIX}/admin/analytics", tags=["Analytics"])
 app.include_router(branding.router, prefix=f"{settings.API_V1_PREFIX}/brand", tags=["Branding"])
 app.include_router(upload.router, prefix=f"{settings.API_V1_PREFIX}/upload", tags=["Upload"])
 
@@ -39,6 +45,18 @@ upload_dir.mkdir(exist_ok=True)
 app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 
 
+@app.on_event("startup")
+async def start_cache_invalidation():
+    """Subscribe this process to cache invalidation broadcasts."""
+    invalidator.start()
+
+
+@app.on_event("shutdown")
+async def stop_cache_invalidation():
+    """Stop the cache invalidation subscriber."""
+    invalidator.stop()
+
+
 @app.get("/")
 async def root():
     """Health check endpoint."""
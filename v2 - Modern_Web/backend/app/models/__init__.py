@@ -1,9 +1,14 @@
 """Models package initialization."""
 from app.models.tenant import Tenant, TenantStatus
 from app.models.user import User, UserRole
-from app.models.menu import Category, MenuItem
-from app.models.order import Order, OrderItem, OrderStatus, PaymentStatus
+from app.models.menu import Category, MenuItem, MenuChange, MenuChangeType, MenuVersion, DEFAULT_STATION
+from app.models.order import (
+    Order, OrderItem, OrderSequence, OrderStatus, OrderTicket, PaymentStatus, TicketStatus,
+    ORDER_STATUS_TRANSITIONS, can_transition, transition_sources
+)
 from app.models.brand import BrandConfig
+from app.models.outbox import OutboxEvent
+from app.models.analytics import SalesHourly, ItemSalesHourly, RollupLedger
 
 __all__ = [
     "Tenant",
@@ -12,9 +17,23 @@ __all__ = [
     "UserRole",
     "Category",
     "MenuItem",
+    "MenuChange",
+    "MenuChangeType",
+    "MenuVersion",
+    "DEFAULT_STATION",
     "Order",
     "OrderItem",
+    "OrderSequence",
     "OrderStatus",
+    "OrderTicket",
     "PaymentStatus",
+    "TicketStatus",
+    "ORDER_STATUS_TRANSITIONS",
+    "can_transition",
+    "transition_sources",
     "BrandConfig",
+    "OutboxEvent",
+    "SalesHourly",
+    "ItemSalesHourly",
+    "RollupLedger",
 ]
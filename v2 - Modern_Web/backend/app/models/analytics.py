@@ -0,0 +1,53 @@
+"""Sales rollup models for analytics."""
+from sqlalchemy import Column, Integer, DECIMAL, DateTime, ForeignKey, Index
+from app.database import Base
+
+
+class SalesHourly(Base):
+    """
+    Orders and revenue per tenant and hour.
+
+    Rows are incremented as the worker consumes orders, so reports read at
+    most one row per hour in range no matter how many orders exist.
+    """
+
+    __tablename__ = "sales_hourly"
+
+    tenant_id = Column(Integer, ForeignKey("tenants.id", ondelete="CASCADE"), primary_key=True)
+    hour = Column(DateTime, primary_key=True)  # UTC, truncated to the hour
+    order_count = Column(Integer, nullable=False, default=0)
+    revenue = Column(DECIMAL(12, 2), nullable=False, default=0)
+
+
+class ItemSalesHourly(Base):
+    """Quantity sold and revenue per tenant, hour and menu item."""
+
+    __tablename__ = "item_sales_hourly"
+    __table_args__ = (
+        # Top items for a tenant over a time range
+        Index("ix_item_sales_hourly_tenant_id_hour", "tenant_id", "hour"),
+    )
+
+    tenant_id = Column(Integer, ForeignKey("tenants.id", ondelete="CASCADE"), primary_key=True)
+    hour = Column(DateTime, primary_key=True)  # UTC, truncated to the hour
+    menu_item_id = Column(Integer, primary_key=True)  # No FK: history outlives deleted items
+    quantity = Column(Integer, nullable=False, default=0)
+    revenue = Column(DECIMAL(12, 2), nullable=False, default=0)
+
+
+class RollupLedger(Base):
+    """
+    Orders already counted in the rollups.
+
+    Written in the same transaction as the increments, so a redelivered
+    order or a backfill over live data is never counted twice. A cancelled
+    order's row is marked reversed when it is subtracted again, or created
+    reversed if it was cancelled before it was counted.
+    """
+
+    __tablename__ = "rollup_ledger"
+
+    order_id = Column(Integer, primary_key=True, autoincrement=False)  # No FK: cleared orders stay counted
+    tenant_id = Column(Integer, nullable=False)
+    applied_at = Column(DateTime(timezone=True), nullable=False)
+    reversed_at = Column(DateTime(timezone=True), nullable=True)  # Set once the order is out of the rollups
@@ -1,26 +1,39 @@
 """Menu models for categories and items."""
-from sqlalchemy import Column, Integer, String, Text, DECIMAL, Boolean, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, DECIMAL, Boolean, ForeignKey, JSON, Enum, Index, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy import DateTime
 from app.database import Base
+import enum
+
+# Kitchen station of categories that weren't assigned one
+DEFAULT_STATION = "kitchen"
 
 
 class Category(Base):
     """Menu category model."""
     
     __tablename__ = "categories"
+    __table_args__ = (
+        # Natural key for bulk import upserts
+        UniqueConstraint("tenant_id", "name", name="uq_categories_tenant_id_name"),
+    )
     
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     tenant_id = Column(Integer, ForeignKey("tenants.id", ondelete="CASCADE"), nullable=False, index=True)
     name = Column(String(50), nullable=False)
     display_order = Column(Integer, default=0)
     is_active = Column(Boolean, default=True)
+    station = Column(String(30), nullable=False, default=DEFAULT_STATION, server_default=DEFAULT_STATION)  # Kitchen station preparing its items
 
 
 class MenuItem(Base):
     """Menu item model."""
     
     __tablename__ = "menu_items"
+    __table_args__ = (
+        # Natural key for bulk import upserts
+        UniqueConstraint("tenant_id", "name", name="uq_menu_items_tenant_id_name"),
+    )
     
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     tenant_id = Column(Integer, ForeignKey("tenants.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -33,3 +46,41 @@ class MenuItem(Base):
     is_available = Column(Boolean, default=True)
     dietary_tags = Column(JSON)  # ["veg", "gluten-free", etc.]
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class MenuChangeType(str, enum.Enum):
+    """Menu change type enumeration."""
+    UPSERT = "upsert"
+    DELETE = "delete"
+
+
+class MenuChange(Base):
+    """
+    Menu change log entry.
+    
+    Versions come from the tenant's menu_versions counter, which every write
+    transaction locks (see app.core.menu_changes), so they become visible in
+    order and kiosks can ask for all changes after the last version they saw.
+    All entries written by one transaction share its version.
+    """
+    
+    __tablename__ = "menu_changes"
+    __table_args__ = (
+        Index("ix_menu_changes_tenant_id_version", "tenant_id", "version"),
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    tenant_id = Column(Integer, ForeignKey("tenants.id", ondelete="CASCADE"), nullable=False)
+    version = Column(Integer, nullable=False)
+    menu_item_id = Column(Integer, nullable=False)  # No FK: tombstones outlive their items
+    change_type = Column(Enum(MenuChangeType), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class MenuVersion(Base):
+    """Per-tenant menu version counter (see app.core.menu_changes)."""
+    
+    __tablename__ = "menu_versions"
+    
+    tenant_id = Column(Integer, ForeignKey("tenants.id", ondelete="CASCADE"), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
@@ -1,8 +1,9 @@
 """Order models."""
-from sqlalchemy import Column, Integer, String, DECIMAL, Enum, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DECIMAL, Enum, Date, DateTime, ForeignKey, Text, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
+from typing import List
 import enum
 
 
@@ -15,6 +16,32 @@ class OrderStatus(str, enum.Enum):
     CANCELLED = "cancelled"
 
 
+# Legal status changes; completed and cancelled are final
+ORDER_STATUS_TRANSITIONS = {
+    OrderStatus.PENDING: {OrderStatus.PREPARING, OrderStatus.CANCELLED},
+    OrderStatus.PREPARING: {OrderStatus.READY, OrderStatus.CANCELLED},
+    OrderStatus.READY: {OrderStatus.COMPLETED},
+    OrderStatus.COMPLETED: set(),
+    OrderStatus.CANCELLED: set(),
+}
+
+
+def can_transition(current: OrderStatus, new: OrderStatus) -> bool:
+    """Check whether an order may move from one status to another."""
+    return new in ORDER_STATUS_TRANSITIONS[current]
+
+
+def transition_sources(new: OrderStatus) -> List[OrderStatus]:
+    """Statuses an order may move to the given status from."""
+    return [current for current, targets in ORDER_STATUS_TRANSITIONS.items() if new in targets]
+
+
+class TicketStatus(str, enum.Enum):
+    """Kitchen station ticket status enumeration."""
+    OPEN = "open"
+    DONE = "done"
+
+
 class PaymentStatus(str, enum.Enum):
     """Payment status enumeration."""
     UNPAID = "unpaid"
@@ -28,7 +55,8 @@ class Order(Base):
     
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     tenant_id = Column(Integer, ForeignKey("tenants.id", ondelete="CASCADE"), nullable=False, index=True)
-    order_number = Column(String(20), unique=True, nullable=False, index=True)
+    order_number = Column(String(20), nullable=False, index=True)
+    order_date = Column(Date, nullable=False)  # UTC day the order number belongs to
     total_amount = Column(DECIMAL(10, 2), nullable=False)
     status = Column(Enum(OrderStatus), default=OrderStatus.PENDING, index=True)
     payment_status = Column(Enum(PaymentStatus), default=PaymentStatus.UNPAID)
@@ -37,6 +65,15 @@ class Order(Base):
 
     items = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Order numbers restart every day for each tenant
+        UniqueConstraint("tenant_id", "order_date", "order_number", name="uq_orders_tenant_date_number"),
+        # Keyset pagination of a tenant's orders, newest first
+        Index("ix_orders_tenant_id_created_at_id", "tenant_id", "created_at", "id"),
+        # Kitchen queue: a tenant's orders in a few statuses, oldest first
+        Index("ix_orders_tenant_id_status_created_at", "tenant_id", "status", "created_at"),
+    )
+
 
 class OrderItem(Base):
     """Order item model."""
@@ -53,3 +90,38 @@ class OrderItem(Base):
 
     order = relationship("Order", back_populates="items")
     menu_item = relationship("MenuItem")
+
+
+class OrderTicket(Base):
+    """
+    One kitchen station's part of an order (see app.core.stations).
+    
+    The kitchen worker creates a ticket per station an order has items for;
+    the order becomes ready once all its tickets are done.
+    """
+    
+    __tablename__ = "order_tickets"
+    __table_args__ = (
+        # One ticket per station, so a redelivered order isn't split twice
+        UniqueConstraint("order_id", "station", name="uq_order_tickets_order_id_station"),
+        # A station's open tickets, oldest first
+        Index("ix_order_tickets_tenant_id_station_status_created_at", "tenant_id", "station", "status", "created_at"),
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    order_id = Column(Integer, ForeignKey("orders.id", ondelete="CASCADE"), nullable=False)
+    tenant_id = Column(Integer, ForeignKey("tenants.id", ondelete="CASCADE"), nullable=False)
+    station = Column(String(30), nullable=False)
+    status = Column(Enum(TicketStatus), nullable=False, default=TicketStatus.OPEN)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class OrderSequence(Base):
+    """Per-tenant, per-day order number counter (see app.core.order_numbers)."""
+    
+    __tablename__ = "order_sequences"
+    
+    tenant_id = Column(Integer, ForeignKey("tenants.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    last_value = Column(Integer, nullable=False, default=0)
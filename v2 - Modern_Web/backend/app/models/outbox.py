@@ -0,0 +1,19 @@
+"""Transactional outbox model."""
+from sqlalchemy import Column, Integer, String, DateTime, JSON
+from app.database import Base
+
+
+class OutboxEvent(Base):
+    """
+    Message waiting to be relayed to Redis.
+    
+    Rows are written in the same transaction as the change they describe and
+    deleted by the relay once the message has been pushed.
+    """
+    
+    __tablename__ = "outbox_events"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    topic = Column(String(100), nullable=False)  # Destination queue
+    payload = Column(JSON, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Benchmark concurrent request throughput with sync vs async database sessions.
+
+Runs the same menu query through two routes on one event loop:
+  - sync:  `async def` route using the blocking `SessionLocal` (old pattern)
+  - async: `async def` route using `AsyncSession` from `get_db`
+
+Each request first issues a statement that sleeps for --latency-ms inside the
+database, standing in for the MySQL network round trip. "ping p95" is how long
+an unrelated request waits for the event loop while the benchmark runs.
+
+Usage:
+    python benchmarks/bench_async_db.py [--requests 500] [--concurrency 50] [--latency-ms 5]
+
+Defaults to a throwaway SQLite database (aiosqlite). Set DATABASE_URL to
+benchmark against MySQL instead; the tables are created if missing and seeded
+under a dedicated tenant.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.gettempdir()}/kiosk_bench_async.db")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("ENVIRONMENT", "benchmark")
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import event, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import Base, SessionLocal, async_engine, engine, get_db
+from app.models import Category, MenuItem, Tenant
+
+BENCH_SLUG = "benchmark-async-db"
+
+
+def install_sleep_function() -> None:
+    """Register bench_sleep(ms) on SQLite connections of both engines."""
+    if engine.dialect.name != "sqlite":
+        return
+
+    def bench_sleep(ms):
+        time.sleep(ms / 1000)
+        return 0
+
+    def on_connect(dbapi_connection, connection_record):
+        dbapi_connection.create_function("bench_sleep", 1, bench_sleep)
+
+    event.listen(engine, "connect", on_connect)
+    event.listen(async_engine.sync_engine, "connect", on_connect)
+
+
+def latency_statement(latency_ms: int):
+    """Build a statement that waits latency_ms inside the database."""
+    if engine.dialect.name == "sqlite":
+        return text("SELECT bench_sleep(:ms)").bindparams(ms=latency_ms)
+    return text("SELECT SLEEP(:s)").bindparams(s=latency_ms / 1000)
+
+
+def seed(item_count: int) -> int:
+    """Create the benchmark tenant and menu items, returning the tenant ID."""
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        tenant = db.query(Tenant).filter(Tenant.slug == BENCH_SLUG).first()
+        if tenant:
+            return tenant.id
+        tenant = Tenant(name="Benchmark", slug=BENCH_SLUG, status="active")
+        db.add(tenant)
+        db.flush()
+        category = Category(name="Bench", tenant_id=tenant.id)
+        db.add(category)
+        db.flush()
+        db.add_all([
+            MenuItem(
+                tenant_id=tenant.id,
+                category_id=category.id,
+                name=f"Item {i}",
+                description="Benchmark item " * 4,
+                price=5 + i % 20,
+                is_available=True
+            )
+            for i in range(item_count)
+        ])
+        db.commit()
+        return tenant.id
+    finally:
+        db.close()
+
+
+def build_app(tenant_id: int, latency_ms: int) -> FastAPI:
+    """Build an app exposing the same query through sync and async sessions."""
+    app = FastAPI()
+    wait = latency_statement(latency_ms)
+
+    def serialize(items):
+        return [{"id": i.id, "name": i.name, "price": str(i.price)} for i in items]
+
+    @app.get("/sync/items")
+    async def sync_items():
+        db = SessionLocal()
+        try:
+            db.execute(wait)
+            items = db.query(MenuItem).filter(
+                MenuItem.tenant_id == tenant_id,
+                MenuItem.is_available == True
+            ).all()
+            return serialize(items)
+        finally:
+            db.close()
+
+    @app.get("/async/items")
+    async def async_items(db: AsyncSession = Depends(get_db)):
+        await db.execute(wait)
+        result = await db.execute(
+            select(MenuItem).where(
+                MenuItem.tenant_id == tenant_id,
+                MenuItem.is_available == True
+            )
+        )
+        return serialize(result.scalars().all())
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+
+async def run(app: FastAPI, path: str, requests: int, concurrency: int) -> dict:
+    """Fire requests at a path with bounded concurrency and collect latencies."""
+    transport = httpx.ASGITransport(app=app)
+    latencies = []
+    ping_latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one():
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get(path)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        async def pinger(stop: asyncio.Event):
+            # Measures how long unrelated requests wait behind the DB work
+            while not stop.is_set():
+                start = time.perf_counter()
+                await asyncio.sleep(0.01)
+                await client.get("/ping")
+                ping_latencies.append(time.perf_counter() - start - 0.01)
+
+        stop = asyncio.Event()
+        ping_task = asyncio.create_task(pinger(stop))
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await ping_task
+
+    latencies.sort()
+    ping_latencies.sort()
+    return {
+        "throughput": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "ping_p95_ms": ping_latencies[max(int(len(ping_latencies) * 0.95) - 1, 0)] * 1000,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--items", type=int, default=50)
+    parser.add_argument("--latency-ms", type=int, default=5)
+    args = parser.parse_args()
+
+    install_sleep_function()
+    tenant_id = seed(args.items)
+    app = build_app(tenant_id, args.latency_ms)
+
+    # Warm up both connection pools
+    await run(app, "/sync/items", 10, 5)
+    await run(app, "/async/items", 10, 5)
+
+    print(
+        f"{args.requests} requests, concurrency {args.concurrency}, "
+        f"{args.items} menu items, {args.latency_ms} ms simulated round trip"
+    )
+    print(f"{'mode':<8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'ping p95 ms':>14}")
+    for mode in ("sync", "async"):
+        stats = await run(app, f"/{mode}/items", args.requests, args.concurrency)
+        print(
+            f"{mode:<8}{stats['throughput']:>10.1f}{stats['p50_ms']:>10.1f}"
+            f"{stats['p95_ms']:>10.1f}{stats['ping_p95_ms']:>14.1f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
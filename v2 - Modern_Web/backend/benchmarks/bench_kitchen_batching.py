@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark batched kitchen queue consumption.
+
+Drains a pre-filled kitchen stream (one tenant) with one KitchenWorker per batch size and
+reports throughput, Redis round trips per order (stream reads and ack
+pipelines) and database transactions per order. Batch size 1 behaves like
+the old one-order-per-call loop. Each batch_handler call stands in for the
+rollup transaction and sleeps --db-ms.
+
+Usage:
+    python benchmarks/bench_kitchen_batching.py [--orders 2000] [--db-ms 2] [--batch-sizes 1 8 32 128]
+
+Defaults to an in-process Redis stand-in (fakeredis). Set REDIS_URL to
+benchmark against a real Redis instead; the stream keys get a random prefix.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("DATABASE_URL", "sqlite://")  # Unused; settings require one
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("ENVIRONMENT", "benchmark")
+
+import redis.asyncio as aioredis
+from app.core.queue import AsyncKitchenQueue
+from app.core.kitchen_worker import KitchenWorker
+
+
+def make_client():
+    """Create an async Redis client (fakeredis unless REDIS_URL is set)."""
+    url = os.environ.get("REDIS_URL")
+    if url:
+        return aioredis.Redis.from_url(url, decode_responses=True)
+    try:
+        import fakeredis
+    except ImportError:
+        sys.exit("Install fakeredis or set REDIS_URL to run this benchmark")
+    return fakeredis.FakeAsyncRedis(decode_responses=True)
+
+
+async def drain(client, prefix: str, orders: int, batch_size: int, db_s: float) -> dict:
+    """Fill the stream, drain it with one worker and return its counters."""
+    queue = AsyncKitchenQueue(client, prefix=prefix)
+    await client.delete(queue.stream(1), queue.tenants_key)
+    pipe = client.pipeline(transaction=False)
+    for order_id in range(1, orders + 1):
+        await queue.add({"order_id": order_id, "tenant_id": 1, "items": []}, pipe=pipe)
+    await pipe.execute()
+
+    transactions = 0
+
+    async def batch_handler(batch):
+        nonlocal transactions
+        transactions += 1
+        await asyncio.sleep(db_s)
+
+    async def handler(message):
+        pass
+
+    worker = KitchenWorker(
+        queue, "bench", handler,
+        batch_handler=batch_handler,
+        concurrency=max(batch_size, 32),
+        batch_size=batch_size,
+        max_wait_ms=0
+    )
+
+    async def stop_when_drained():
+        while worker.metrics["processed_total"] < orders:
+            await asyncio.sleep(0.005)
+        worker.stop()
+
+    start = time.perf_counter()
+    await asyncio.gather(worker.run(), stop_when_drained())
+    elapsed = time.perf_counter() - start
+    await client.delete(queue.stream(1), queue.tenants_key)
+    return {
+        "elapsed": elapsed,
+        "round_trips": worker.metrics["redis_round_trips_total"],
+        "transactions": transactions,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--db-ms", type=float, default=2)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 32, 128])
+    args = parser.parse_args()
+
+    client = make_client()
+    prefix = f"bench:kitchen:{uuid.uuid4().hex[:8]}"
+
+    print(f"{args.orders} orders, {args.db_ms:g} ms per rollup transaction")
+    print(f"{'batch':<8}{'orders/s':>10}{'round trips/order':>19}{'txns/order':>12}")
+    for batch_size in args.batch_sizes:
+        result = await drain(client, prefix, args.orders, batch_size, args.db_ms / 1000)
+        print(
+            f"{batch_size:<8}{args.orders / result['elapsed']:>10.0f}"
+            f"{result['round_trips'] / args.orders:>19.3f}"
+            f"{result['transactions'] / args.orders:>12.3f}"
+        )
+    await client.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark kitchen ticket latency of quiet tenants during another tenant's burst.
+
+One tenant queues --burst orders at once while --tenants other tenants each
+queue an order every --interval-ms, and one KitchenWorker handles them all
+with tickets of --ticket-ms. The run is repeated with every order on one
+shared stream (the old single queue) and with per-tenant streams under the
+deficit round robin scheduler, reporting each side's ticket latency from
+queueing to done. With the shared stream the quiet tenants wait behind the
+burst; with per-tenant streams their p99 should stay within a few tickets.
+
+Usage:
+    python benchmarks/bench_kitchen_fairness.py [--burst 3000] [--tenants 3] [--interval-ms 20] [--ticket-ms 20]
+
+Defaults to an in-process Redis stand-in (fakeredis). Set REDIS_URL to
+benchmark against a real Redis instead; the stream keys get a random prefix.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("DATABASE_URL", "sqlite://")  # Unused; settings require one
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("ENVIRONMENT", "benchmark")
+
+import redis.asyncio as aioredis
+from app.core.queue import AsyncKitchenQueue
+from app.core.kitchen_worker import KitchenWorker, percentile
+
+BURST_TENANT = 1
+
+# Stream all orders share in the shared run
+SHARED_TENANT = 0
+
+
+def make_client():
+    """Create an async Redis client (fakeredis unless REDIS_URL is set)."""
+    url = os.environ.get("REDIS_URL")
+    if url:
+        return aioredis.Redis.from_url(url, decode_responses=True)
+    try:
+        import fakeredis
+    except ImportError:
+        sys.exit("Install fakeredis or set REDIS_URL to run this benchmark")
+    return fakeredis.FakeAsyncRedis(decode_responses=True)
+
+
+def order(queue_tenant: int, tenant: int, order_id: int) -> dict:
+    """Build a one-line order message, routed to queue_tenant's stream."""
+    return {
+        "order_id": order_id,
+        "tenant_id": queue_tenant,
+        "tenant": tenant,
+        "items": [{"menu_item_id": 1, "quantity": 1, "unit_price": 1.0}],
+        "queued_at": time.time(),
+    }
+
+
+async def run(client, prefix: str, shared: bool, args) -> dict:
+    """Queue the burst and the quiet tenants' orders, handle them all and return latencies per side."""
+    queue = AsyncKitchenQueue(client, prefix=prefix)
+    quiet = list(range(BURST_TENANT + 1, BURST_TENANT + 1 + args.tenants))
+    tenants = [SHARED_TENANT] if shared else [BURST_TENANT, *quiet]
+    await client.delete(queue.tenants_key, *(queue.stream(tenant) for tenant in tenants))
+    await client.sadd(queue.tenants_key, *tenants)
+
+    pipe = client.pipeline(transaction=False)
+    for order_id in range(args.burst):
+        await queue.add(order(SHARED_TENANT if shared else BURST_TENANT, BURST_TENANT, order_id), pipe=pipe)
+    await pipe.execute()
+
+    latencies = {"burst": [], "quiet": []}
+    expected = args.burst + args.quiet_orders * len(quiet)
+
+    async def handler(message):
+        await asyncio.sleep(args.ticket_ms / 1000)
+        side = "burst" if message["tenant"] == BURST_TENANT else "quiet"
+        latencies[side].append((time.time() - message["queued_at"]) * 1000)
+
+    worker = KitchenWorker(
+        queue, "bench", handler,
+        concurrency=args.concurrency,
+        batch_size=args.concurrency,
+        max_wait_ms=0
+    )
+
+    async def trickle():
+        for n in range(args.quiet_orders):
+            for tenant in quiet:
+                await queue.add(order(SHARED_TENANT if shared else tenant, tenant, n))
+            await asyncio.sleep(args.interval_ms / 1000)
+
+    async def stop_when_done():
+        while len(latencies["burst"]) + len(latencies["quiet"]) < expected:
+            await asyncio.sleep(0.005)
+        worker.stop()
+
+    await asyncio.gather(worker.run(), trickle(), stop_when_done())
+    await client.delete(queue.tenants_key, *(queue.stream(tenant) for tenant in tenants))
+    return latencies
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--burst", type=int, default=3000)
+    parser.add_argument("--tenants", type=int, default=3)
+    parser.add_argument("--quiet-orders", type=int, default=50, help="Orders per quiet tenant")
+    parser.add_argument("--interval-ms", type=float, default=20)
+    parser.add_argument("--ticket-ms", type=float, default=20)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    client = make_client()
+    prefix = f"bench:kitchen:{uuid.uuid4().hex[:8]}"
+
+    print(
+        f"Burst of {args.burst} orders from one tenant; {args.tenants} quiet tenants with "
+        f"{args.quiet_orders} orders each; {args.ticket_ms:g} ms tickets, concurrency {args.concurrency}"
+    )
+    print(f"{'queue':<12}{'quiet p50':>11}{'quiet p99':>11}{'burst p50':>11}{'burst p99':>11}  (ms)")
+    for name, shared in (("shared", True), ("per-tenant", False)):
+        latencies = await run(client, prefix, shared, args)
+        print(
+            f"{name:<12}{percentile(latencies['quiet'], 0.5):>11.0f}{percentile(latencies['quiet'], 0.99):>11.0f}"
+            f"{percentile(latencies['burst'], 0.5):>11.0f}{percentile(latencies['burst'], 0.99):>11.0f}"
+        )
+    await client.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Benchmark kitchen queue throughput against the number of workers.
+
+Fills the kitchen stream with orders, then drains it with 1, 2, 4... worker
+threads, each a separate consumer in the kitchen-workers group doing a
+simulated ticket of --work-ms. Throughput should grow with the worker count
+while every order is handled exactly once. A final run kills one worker
+mid-batch and checks that its unacked orders are reclaimed by the others.
+
+Usage:
+    python benchmarks/bench_kitchen_queue.py [--orders 400] [--work-ms 20] [--workers 1 2 4 8]
+
+Defaults to an in-process Redis stand-in (fakeredis). Set REDIS_URL to
+benchmark against a real Redis instead; the stream keys get a random prefix.
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("DATABASE_URL", "sqlite://")  # Unused; settings require one
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("ENVIRONMENT", "benchmark")
+
+import redis
+from app.core.queue import KitchenQueue
+
+# All orders belong to one tenant, so throughput is limited by the workers alone
+TENANT_ID = 1
+
+
+def make_client_factory():
+    """Return a function creating Redis clients that share one server."""
+    url = os.environ.get("REDIS_URL")
+    if url:
+        return lambda: redis.Redis.from_url(url, decode_responses=True)
+    try:
+        import fakeredis
+    except ImportError:
+        sys.exit("Install fakeredis or set REDIS_URL to run this benchmark")
+    server = fakeredis.FakeServer()
+    return lambda: fakeredis.FakeRedis(server=server, decode_responses=True)
+
+
+def fill(queue: KitchenQueue, orders: int) -> None:
+    """Queue orders with one pipeline."""
+    pipe = queue.client.pipeline(transaction=False)
+    for order_id in range(1, orders + 1):
+        queue.add({"order_id": order_id, "order_number": f"A-{order_id:03d}", "tenant_id": TENANT_ID, "items": []}, pipe=pipe)
+    pipe.execute()
+
+
+def run_worker(queue: KitchenQueue, consumer: str, work_s: float, handled: Counter, lock: threading.Lock,
+               stop: threading.Event, crash_after: int = 0) -> None:
+    """Consume until stopped; with crash_after, read that many orders and die without acking."""
+    if crash_after:
+        queue.read(consumer, [TENANT_ID], count=crash_after, block_ms=100)
+        return
+    while not stop.is_set():
+        entries = queue.reclaim(consumer, TENANT_ID) or queue.read(consumer, [TENANT_ID], block_ms=100)
+        for tenant_id, entry_id, message in entries:
+            time.sleep(work_s)
+            with lock:
+                handled[message["order_id"]] += 1
+            queue.ack([(tenant_id, entry_id)])
+
+
+def drain(make_client, prefix: str, orders: int, workers: int, work_s: float, crash: bool = False) -> tuple:
+    """Fill the stream, drain it with worker threads and return (seconds, handled counts)."""
+    queue = KitchenQueue(make_client(), prefix=prefix, claim_idle_ms=200)
+    queue.client.delete(queue.stream(TENANT_ID), queue.tenants_key)
+    queue.ensure_group([TENANT_ID])
+    fill(queue, orders)
+
+    handled: Counter = Counter()
+    lock = threading.Lock()
+    stop = threading.Event()
+    if crash:
+        run_worker(KitchenQueue(make_client(), prefix=prefix), "crashed", work_s, handled, lock, stop, crash_after=10)
+
+    threads = [
+        threading.Thread(
+            target=run_worker,
+            args=(KitchenQueue(make_client(), prefix=prefix, claim_idle_ms=200), f"worker-{n}", work_s, handled, lock, stop)
+        )
+        for n in range(workers)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    while sum(handled.values()) < orders and time.perf_counter() - start < 120:
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    for thread in threads:
+        thread.join()
+    queue.client.delete(queue.stream(TENANT_ID), queue.tenants_key)
+    return elapsed, handled
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=400)
+    parser.add_argument("--work-ms", type=float, default=20)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    make_client = make_client_factory()
+    prefix = f"bench:kitchen:{uuid.uuid4().hex[:8]}"
+    work_s = args.work_ms / 1000
+
+    print(f"{args.orders} orders, {args.work_ms:g} ms per ticket")
+    print(f"{'workers':<10}{'orders/s':>10}{'speedup':>10}{'lost':>7}{'dupes':>7}")
+    baseline = None
+    for workers in args.workers:
+        elapsed, handled = drain(make_client, prefix, args.orders, workers, work_s)
+        throughput = len(handled) / elapsed
+        baseline = baseline or throughput
+        print(
+            f"{workers:<10}{throughput:>10.1f}{throughput / baseline:>9.1f}x"
+            f"{args.orders - len(handled):>7}{sum(count - 1 for count in handled.values()):>7}"
+        )
+
+    workers = max(args.workers)
+    elapsed, handled = drain(make_client, prefix, args.orders, workers, work_s, crash=True)
+    print(
+        f"\nCrash run ({workers} workers, one consumer died holding 10 orders): "
+        f"{len(handled)}/{args.orders} handled in {elapsed:.2f}s, "
+        f"lost={args.orders - len(handled)}"
+    )
+
+
+if __name__ == "__main__":
+    main()
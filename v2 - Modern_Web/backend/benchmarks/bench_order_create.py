@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Benchmark order creation for large carts.
+
+Compares the previous two-commit, row-at-a-time flow with the current
+POST /orders path (one transaction, one multi-row insert for the items) and
+reports SQL statements, commits and latency per order.
+
+Usage:
+    python benchmarks/bench_order_create.py [--orders 200] [--lines 60]
+
+Defaults to a throwaway SQLite database (aiosqlite). Set DATABASE_URL to
+benchmark against MySQL instead.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.gettempdir()}/kiosk_bench_orders.db")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("ENVIRONMENT", "benchmark")
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import event
+from app.database import AsyncSessionLocal, Base, SessionLocal, async_engine, engine
+from app.models import Category, MenuItem, Order, OrderItem, OrderStatus, PaymentStatus, Tenant
+from app.api.v1 import orders
+
+BENCH_SLUG = "benchmark-orders"
+
+
+class StatementCounter:
+    """Count statements and commits issued through the async engine."""
+
+    def __init__(self):
+        self.statements = 0
+        self.commits = 0
+        event.listen(async_engine.sync_engine, "before_cursor_execute", self._on_execute)
+        event.listen(async_engine.sync_engine, "commit", self._on_commit)
+
+    def _on_execute(self, *args):
+        self.statements += 1
+
+    def _on_commit(self, *args):
+        self.commits += 1
+
+    def reset(self):
+        self.statements = 0
+        self.commits = 0
+
+
+def seed(line_count: int) -> list:
+    """Create menu items under tenant 1 (the kiosk default) and return (id, price) pairs."""
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        tenant = db.get(Tenant, 1)
+        if tenant is None:
+            tenant = Tenant(id=1, name="Benchmark", slug=BENCH_SLUG, status="active")
+            db.add(tenant)
+            db.flush()
+        category = Category(name="Bench", tenant_id=tenant.id)
+        db.add(category)
+        db.flush()
+        items = [
+            MenuItem(
+                tenant_id=tenant.id,
+                category_id=category.id,
+                name=f"Bench item {uuid.uuid4().hex[:8]}",
+                price=5 + i % 20,
+                discount_percentage=0,
+                is_available=True
+            )
+            for i in range(line_count)
+        ]
+        db.add_all(items)
+        db.commit()
+        return [(item.id, float(item.price)) for item in items]
+    finally:
+        db.close()
+
+
+async def legacy_create_order(order_data: orders.OrderCreate) -> int:
+    """The previous flow: commit the order, refresh it, add items one by one, commit again."""
+    async with AsyncSessionLocal() as db:
+        new_order = Order(
+            tenant_id=1,
+            order_number=uuid.uuid4().hex[:20].upper(),
+            order_date=datetime.now(timezone.utc).date(),
+            total_amount=order_data.total_amount,
+            status=OrderStatus.PENDING,
+            payment_status=PaymentStatus.PAID,
+            created_at=datetime.now(timezone.utc)
+        )
+        db.add(new_order)
+        await db.commit()
+        await db.refresh(new_order)
+        for item in order_data.items:
+            db.add(OrderItem(
+                order_id=new_order.id,
+                menu_item_id=item.menu_item_id,
+                quantity=item.quantity,
+                unit_price=item.unit_price,
+                subtotal=item.quantity * item.unit_price
+            ))
+        await db.commit()
+        return new_order.id
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=200)
+    parser.add_argument("--lines", type=int, default=60)
+    args = parser.parse_args()
+
+    menu = seed(args.lines)
+    payload = {
+        "order_type": "DINE_IN",
+        "payment_method": "CARD",
+        "total_amount": sum(price * 2 for _, price in menu),
+        "items": [
+            {"menu_item_id": item_id, "quantity": 2, "unit_price": price}
+            for item_id, price in menu
+        ],
+    }
+    order_data = orders.OrderCreate(**payload)
+
+    app = FastAPI()
+    app.include_router(orders.router, prefix="/orders")
+    counter = StatementCounter()
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def current():
+            response = await client.post("/orders", json=payload)
+            response.raise_for_status()
+
+        async def legacy():
+            await legacy_create_order(order_data)
+
+        print(f"{args.orders} orders, {args.lines} lines each")
+        print(f"{'flow':<10}{'stmts/order':>13}{'commits/order':>15}{'p50 ms':>10}{'p95 ms':>10}")
+        for name, create in (("legacy", legacy), ("current", current)):
+            await create()  # warm up
+            counter.reset()
+            latencies = []
+            for _ in range(args.orders):
+                start = time.perf_counter()
+                await create()
+                latencies.append(time.perf_counter() - start)
+            latencies.sort()
+            print(
+                f"{name:<10}{counter.statements / args.orders:>13.1f}"
+                f"{counter.commits / args.orders:>15.1f}"
+                f"{statistics.median(latencies) * 1000:>10.2f}"
+                f"{latencies[int(len(latencies) * 0.95) - 1] * 1000:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+import argparse
+import json
+import socket
+import time
+import sys
+import os
+from datetime import datetime, timezone
+
+# Ensure backend directory is in python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.config import settings
+from app.database import SessionLocal
+from app.core.cache import cache
+from app.core.ingest import order_ingest, OrderIngestWriter, reconcile, STREAM_PREFIX
+
+# Seconds between metric reports
+REPORT_INTERVAL = 10
+
+
+def drain(writer: OrderIngestWriter, pending: bool = False) -> int:
+    persisted = 0
+    for stream, entries in writer.read(pending=pending):
+        db = SessionLocal()
+        try:
+            persisted += writer.process(db, stream, entries)
+        finally:
+            db.close()
+    return persisted
+
+
+def run_writer(shards):
+    streams = [f"{STREAM_PREFIX}:{shard}" for shard in shards] if shards else order_ingest.all_streams()
+    consumer = f"{socket.gethostname()}:{'-'.join(s.rsplit(':', 1)[1] for s in streams)}"
+    
+    print("Starting Order Ingest Writer...")
+    print(f"Consuming {', '.join(streams)} as {consumer} in batches of {settings.ORDER_INGEST_BATCH_SIZE}...")
+    
+    writer = OrderIngestWriter(cache.client, streams, consumer, batch_size=settings.ORDER_INGEST_BATCH_SIZE)
+    writer.ensure_groups()
+    
+    # Finish anything this consumer read but never acked before a restart
+    while drain(writer, pending=True):
+        pass
+    
+    last_report = time.monotonic()
+    while True:
+        try:
+            drain(writer)
+        except Exception as e:
+            if "Connection refused" in str(e):
+                print("Connection failed. Retrying in 5s...")
+                time.sleep(5)
+            else:
+                print(f"Error: {e}")
+                time.sleep(1)
+        
+        if time.monotonic() - last_report >= REPORT_INTERVAL:
+            backlog = sum(cache.client.xlen(stream) for stream in streams)
+            print(
+                f" [metrics] persisted={writer.metrics['persisted_total']} "
+                f"duplicates={writer.metrics['duplicates_total']} "
+                f"dead={writer.metrics['dead_total']} backlog={backlog}"
+            )
+            last_report = time.monotonic()
+
+
+def run_reconcile(day):
+    db = SessionLocal()
+    try:
+        report = reconcile(cache.client, db, order_ingest, day)
+    finally:
+        db.close()
+    print(json.dumps(report, indent=2))
+    return 1 if any(counts["missing"] for counts in report.values()) else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write queued orders from the ingest streams to the database")
+    parser.add_argument("--shards", type=int, nargs="*", help="Shard numbers to consume (default: all)")
+    parser.add_argument("--reconcile", action="store_true", help="Compare accepted orders with the database and exit")
+    parser.add_argument("--day", default=datetime.now(timezone.utc).strftime("%Y%m%d"), help="Day to reconcile (YYYYMMDD)")
+    args = parser.parse_args()
+    
+    if args.reconcile:
+        sys.exit(run_reconcile(args.day))
+    
+    try:
+        run_writer(args.shards)
+    except KeyboardInterrupt:
+        print("\nWriter stopped.")
@@ -0,0 +1,33 @@
+import argparse
+import sys
+import os
+
+# Ensure backend directory is in python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import select
+from app.database import SessionLocal
+from app.models import Tenant
+from app.core.active_orders import active_orders
+
+
+def rebuild(tenant_ids):
+    db = SessionLocal()
+    try:
+        if not tenant_ids:
+            tenant_ids = db.execute(select(Tenant.id).order_by(Tenant.id)).scalars().all()
+        for tenant_id in tenant_ids:
+            count = active_orders.rebuild(db, tenant_id)
+            print(f" [x] Tenant {tenant_id}: {count} active orders")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Regenerate the Redis active orders projection from the database")
+    parser.add_argument("--tenant", type=int, nargs="*", help="Tenant IDs to rebuild (default: all)")
+    args = parser.parse_args()
+    
+    print("Rebuilding active orders projection...")
+    rebuild(args.tenant)
+    print("Done")
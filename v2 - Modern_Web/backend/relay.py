@@ -0,0 +1,71 @@
+import time
+import sys
+import os
+
+# Ensure backend directory is in python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.config import settings
+from app.database import SessionLocal
+from app.core.cache import cache
+from app.core.outbox import OutboxRelay, METRICS_KEY
+
+# Seconds between lag reports
+REPORT_INTERVAL = 10
+
+
+def report(relay: OutboxRelay):
+    db = SessionLocal()
+    try:
+        backlog = relay.backlog(db)
+    finally:
+        db.close()
+    cache.client.hset(METRICS_KEY, mapping=backlog)
+    print(
+        f" [metrics] relayed={relay.metrics['relayed_total']} "
+        f"backlog={backlog['backlog']} oldest_lag={backlog['oldest_lag_seconds']}s "
+        f"last_batch={relay.metrics['last_batch_size']} "
+        f"last_batch_lag={relay.metrics['last_batch_max_lag_seconds']}s"
+    )
+
+
+def run_relay():
+    print("Starting Outbox Relay...")
+    print(f"Draining outbox in batches of {settings.OUTBOX_BATCH_SIZE}...")
+    
+    relay = OutboxRelay(cache.client, batch_size=settings.OUTBOX_BATCH_SIZE)
+    last_report = time.monotonic()
+    
+    while True:
+        relayed = 0
+        db = SessionLocal()
+        try:
+            relayed = relay.drain_once(db)
+        except Exception as e:
+            db.rollback()
+            if "Connection refused" in str(e):
+                print("Connection failed. Retrying in 5s...")
+                time.sleep(5)
+            else:
+                print(f"Error: {e}")
+                time.sleep(1)
+        finally:
+            db.close()
+        
+        if time.monotonic() - last_report >= REPORT_INTERVAL:
+            try:
+                report(relay)
+            except Exception as e:
+                print(f"Failed to report metrics: {e}")
+            last_report = time.monotonic()
+        
+        # Keep draining while there is a backlog, otherwise poll
+        if relayed < relay.batch_size:
+            time.sleep(settings.OUTBOX_POLL_INTERVAL)
+
+
+if __name__ == "__main__":
+    try:
+        run_relay()
+    except KeyboardInterrupt:
+        print("\nRelay stopped.")
@@ -0,0 +1,30 @@
+import argparse
+import sys
+import os
+from datetime import datetime
+
+# Ensure backend directory is in python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.database import SessionLocal
+from app.core.rollups import backfill
+
+
+def run_backfill(tenant_id, since):
+    db = SessionLocal()
+    try:
+        count = backfill(db, tenant_id=tenant_id, since=since)
+        print(f" [x] Counted or subtracted {count} orders")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Add historical orders missing from the hourly sales rollups and subtract cancelled ones")
+    parser.add_argument("--tenant", type=int, help="Tenant ID to backfill (default: all)")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="Only orders created at or after this time (ISO 8601)")
+    args = parser.parse_args()
+    
+    print("Backfilling sales rollups...")
+    run_backfill(args.tenant, args.since)
+    print("Done")
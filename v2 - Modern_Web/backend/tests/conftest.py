@@ -0,0 +1,10 @@
+"""Shared test setup: settings for an in-memory database."""
+import os
+import sys
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("ENVIRONMENT", "test")
+
+# Make the app package importable when pytest runs from the backend directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,71 @@
+"""Tests for the kitchen queue on Redis Streams."""
+import asyncio
+import time
+import fakeredis
+import pytest
+from app.core.queue import AsyncKitchenQueue, KitchenQueue, KITCHEN_DEAD_LETTER_STREAM, KITCHEN_GROUP
+
+
+def make_queue(**kwargs) -> KitchenQueue:
+    client = fakeredis.FakeRedis(decode_responses=True)
+    queue = KitchenQueue(client, **kwargs)
+    queue.ensure_group([1])
+    return queue
+
+
+def test_reclaim_dead_letters_overdelivered_entry_behind_another_consumers_entry():
+    queue = make_queue(claim_idle_ms=50, max_deliveries=5)
+    first, busy, poison = (queue.add({"tenant_id": 1, "order_id": order_id}) for order_id in (1, 2, 3))
+
+    assert [entry_id for _, entry_id, _ in queue.read("crashed", [1], block_ms=None)] == [first]
+    assert [entry_id for _, entry_id, _ in queue.read("busy", [1], block_ms=None)] == [busy]
+    assert [entry_id for _, entry_id, _ in queue.read("crashed", [1], block_ms=None)] == [poison]
+    # Redeliver the poison entry until it is over the limit
+    for _ in range(queue.max_deliveries):
+        queue.read("crashed", [1], pending={1: first})
+
+    time.sleep(0.1)
+    # The busy consumer's entry stays pending between the claimed ones, but isn't idle
+    queue.client.xclaim(queue.stream(1), KITCHEN_GROUP, "busy", 0, [busy])
+
+    claimed = queue.reclaim("rescuer", 1)
+
+    assert [entry_id for _, entry_id, _ in claimed] == [first]
+    dead = queue.client.xrange(KITCHEN_DEAD_LETTER_STREAM)
+    assert [fields["entry_id"] for _, fields in dead] == [poison]
+
+
+def test_reclaim_keeps_entries_under_the_delivery_limit():
+    queue = make_queue(claim_idle_ms=50, max_deliveries=5)
+    entry_id = queue.add({"tenant_id": 1, "order_id": 1})
+    queue.read("crashed", [1], block_ms=None)
+    time.sleep(0.1)
+
+    claimed = queue.reclaim("rescuer", 1)
+
+    assert [(tenant_id, claimed_id, message) for tenant_id, claimed_id, message in claimed] == [
+        (1, entry_id, {"tenant_id": 1, "order_id": 1})
+    ]
+    assert queue.client.xlen(KITCHEN_DEAD_LETTER_STREAM) == 0
+
+
+@pytest.mark.asyncio
+async def test_async_queue_reclaims_and_dead_letters_like_the_sync_one():
+    queue = AsyncKitchenQueue(fakeredis.FakeAsyncRedis(decode_responses=True), claim_idle_ms=50, max_deliveries=2)
+    await queue.ensure_group([1])
+    kept, poison = [await queue.add({"tenant_id": 1, "order_id": order_id}) for order_id in (1, 2)]
+    await queue.client.xadd(queue.stream(1), {"order": "not json"})
+
+    read = await queue.read("crashed", [1], count=10, block_ms=None)
+    assert [entry_id for _, entry_id, _ in read] == [kept, poison]
+    # Redeliver the poison entry until it is over the limit
+    for _ in range(queue.max_deliveries):
+        await queue.read("crashed", [1], pending={1: kept})
+    await asyncio.sleep(0.1)
+
+    claimed = await queue.reclaim("rescuer", 1)
+
+    assert [entry_id for _, entry_id, _ in claimed] == [kept]
+    dead = await queue.client.xrange(KITCHEN_DEAD_LETTER_STREAM)
+    assert sorted(fields["error"] for _, fields in dead) == ["too many deliveries", "unreadable entry"]
+    assert await queue.depth([1]) == {1: {"backlog": 1, "in_progress": 1}}
@@ -0,0 +1,63 @@
+"""Tests for menu change log versioning."""
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from app.database import Base
+from app.models import MenuChange, MenuChangeType, Tenant
+from app.core.menu_changes import (
+    latest_menu_version, next_menu_version, record_menu_change, record_menu_changes
+)
+
+
+@pytest_asyncio.fixture
+async def db():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSession(engine, autoflush=False, expire_on_commit=False) as session:
+        session.add_all([Tenant(id=1, name="A", slug="a"), Tenant(id=2, name="B", slug="b")])
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_one_transaction_shares_one_version(db):
+    await record_menu_change(db, 1, 10, MenuChangeType.UPSERT)
+    await record_menu_changes(db, 1, [11, 12], MenuChangeType.UPSERT)
+    await record_menu_change(db, 1, 13, MenuChangeType.DELETE)
+    await db.commit()
+
+    versions = (await db.execute(select(MenuChange.version))).scalars().all()
+    assert versions == [1, 1, 1, 1]
+    assert await latest_menu_version(db, 1) == 1
+
+
+@pytest.mark.asyncio
+async def test_each_transaction_takes_a_new_version(db):
+    assert await next_menu_version(db, 1) == 1
+    await db.commit()
+    assert await next_menu_version(db, 1) == 2
+    assert await next_menu_version(db, 1) == 2
+    await db.commit()
+    assert await latest_menu_version(db, 1) == 2
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_version_is_taken_again(db):
+    assert await next_menu_version(db, 1) == 1
+    await db.rollback()
+    assert await next_menu_version(db, 1) == 1
+    await db.commit()
+    assert await latest_menu_version(db, 1) == 1
+
+
+@pytest.mark.asyncio
+async def test_versions_are_per_tenant(db):
+    assert await next_menu_version(db, 1) == 1
+    assert await next_menu_version(db, 2) == 1
+    await db.commit()
+    assert await next_menu_version(db, 2) == 2
+    await db.commit()
+    assert await latest_menu_version(db, 1) == 1
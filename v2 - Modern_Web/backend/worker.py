@@ -1,43 +1,175 @@
-import time
+import argparse
+import asyncio
+import signal
+import socket
 import sys
 import os
 
 # Ensure backend directory is in python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.core.cache import cache
+import redis.asyncio as aioredis
+from app.config import settings
+from app.database import SessionLocal
+from app.core.queue import AsyncKitchenQueue, KITCHEN_STREAM, station_prefix
+from app.core.kitchen_worker import KitchenWorker
+from app.core.rollups import record_orders
+from app.core.stations import complete_ticket, dispatch_orders
 
-def process_orders():
+# Simulated ticket preparation time in seconds, with --simulate
+# Otherwise a station's display completes its tickets through the API
+TICKET_SECONDS = 2
+
+
+def record_batch(batch):
+    # Hourly sales rollups and per-station tickets for the whole batch; redelivered orders are skipped
+    db = SessionLocal()
+    try:
+        record_orders(db, batch)
+        dispatch_orders(db, batch)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def handle_batch(batch):
+    # The database session is synchronous; keep it off the event loop
+    await asyncio.to_thread(record_batch, batch)
+
+
+async def handle_order(data):
+    print(f" [x] Routed Order #{data.get('order_number')} (ID: {data.get('order_id')}), items: {len(data.get('items'))}")
+
+
+def finish_ticket(data):
+    db = SessionLocal()
+    try:
+        return complete_ticket(db, data["tenant_id"], data["ticket_id"])
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def ticket_handler(station, simulate):
+    async def handle_ticket(data):
+        if not simulate:
+            # The ticket stays open until the station's display completes it
+            print(f" [{station}] New Order #{data.get('order_number')} (ticket {data.get('ticket_id')}), items: {len(data.get('items'))}")
+            return
+        print(f" [{station}] Preparing Order #{data.get('order_number')} (ticket {data.get('ticket_id')}), items: {len(data.get('items'))}")
+        await asyncio.sleep(TICKET_SECONDS)
+        completion = await asyncio.to_thread(finish_ticket, data)
+        if completion is None:
+            print(f" [{station}] Ticket {data.get('ticket_id')} no longer exists")
+        else:
+            print(f" [{station}] Done Order #{data.get('order_number')}; order is {completion['order_status']}")
+    return handle_ticket
+
+
+def make_client():
+    return aioredis.Redis(
+        host=settings.REDIS_HOST,
+        port=settings.REDIS_PORT,
+        db=settings.REDIS_DB,
+        password=settings.REDIS_PASSWORD if settings.REDIS_PASSWORD else None,
+        decode_responses=True
+    )
+
+
+def make_worker(client, prefix, consumer, handler, concurrency, batch_handler=None):
+    queue = AsyncKitchenQueue(
+        client,
+        prefix=prefix,
+        claim_idle_ms=settings.KITCHEN_QUEUE_CLAIM_IDLE_MS,
+        max_deliveries=settings.KITCHEN_QUEUE_MAX_DELIVERIES
+    )
+    return KitchenWorker(
+        queue,
+        consumer,
+        handler,
+        batch_handler=batch_handler,
+        concurrency=concurrency,
+        batch_size=settings.KITCHEN_WORKER_BATCH_SIZE,
+        max_wait_ms=settings.KITCHEN_WORKER_BATCH_MAX_WAIT_MS,
+        drain_timeout=settings.KITCHEN_WORKER_DRAIN_TIMEOUT,
+        tenant_quantum=settings.KITCHEN_WORKER_TENANT_QUANTUM
+    )
+
+
+async def process_orders(consumer, concurrency):
     print("Starting Kitchen Order Worker...")
-    print("Waiting for orders from 'kitchen_orders' queue...")
-    
-    while True:
+    print(f"Waiting for orders from the '{KITCHEN_STREAM}:<tenant>' streams as {consumer}, up to {concurrency} at a time...")
+
+    client = make_client()
+    worker = make_worker(client, KITCHEN_STREAM, consumer, handle_order, concurrency, batch_handler=handle_batch)
+    try:
+        await worker.run()
+    finally:
+        await client.aclose()
+
+
+async def process_stations(stations, consumer, concurrency, simulate):
+    print(f"Starting Kitchen Station Worker for {', '.join(stations)}...")
+    if simulate:
+        print(f"Simulating preparation: tickets complete after {TICKET_SECONDS}s")
+    print(f"Waiting for tickets as {consumer}, up to {concurrency} at a time per station...")
+
+    client = make_client()
+    # Stations don't share slots, so one busy station can't hold up the others
+    workers = [
+        make_worker(client, station_prefix(station), f"{consumer}:{station}", ticket_handler(station, simulate), concurrency)
+        for station in stations
+    ]
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
         try:
-            # Blocking pop from list - waits 5 seconds then loops
-            # This is efficient as it avoids busy waiting
-            result = cache.brpop("kitchen_orders", timeout=5)
-            
-            if result:
-                queue_name, data = result
-                print(f" [x] Received Order #{data.get('order_number')} (ID: {data.get('order_id')})")
-                print(f"     Items: {len(data.get('items'))}")
-                
-                # Simulate processing time
-                # In a real system, this might print a ticket or update a specialized KDS DB
-                print("     Processing...", end="", flush=True)
-                time.sleep(2) 
-                print(" Done")
-                
-        except Exception as e:
-            if "Connection refused" in str(e):
-                print("Redis connection failed. Retrying in 5s...")
-                time.sleep(5)
-            else:
-                print(f"Error: {e}")
-                time.sleep(1)
+            loop.add_signal_handler(sig, lambda: [worker.stop() for worker in workers])
+        except (NotImplementedError, RuntimeError):
+            pass  # No signal handlers on Windows
+    try:
+        await asyncio.gather(*(worker.run(handle_signals=False) for worker in workers))
+    finally:
+        await client.aclose()
+
 
 if __name__ == "__main__":
-    try:
-        process_orders()
-    except KeyboardInterrupt:
-        print("\nWorker stopped.")
+    parser = argparse.ArgumentParser(description="Consume kitchen orders; run as many workers as needed")
+    parser.add_argument(
+        "--consumer",
+        default=f"{socket.gethostname()}-{os.getpid()}",
+        help="Consumer name in the kitchen-workers group (default: host-pid)"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=settings.KITCHEN_WORKER_CONCURRENCY,
+        help="Orders processed at once (default: KITCHEN_WORKER_CONCURRENCY)"
+    )
+    parser.add_argument(
+        "--station",
+        nargs="+",
+        metavar="STATION",
+        help="Surface the tickets of these kitchen stations ('all' for KITCHEN_STATIONS) instead of splitting orders"
+    )
+    parser.add_argument(
+        "--simulate",
+        action="store_true",
+        help=f"With --station, complete each ticket after {TICKET_SECONDS}s instead of waiting for the station's display"
+    )
+    args = parser.parse_args()
+    if args.simulate and not args.station:
+        parser.error("--simulate requires --station")
+
+    if args.station:
+        stations = settings.kitchen_stations_list if "all" in args.station else list(dict.fromkeys(args.station))
+        unknown = [station for station in stations if station not in settings.kitchen_stations_list]
+        if unknown:
+            parser.error(f"unknown station(s): {', '.join(unknown)} (KITCHEN_STATIONS is {settings.KITCHEN_STATIONS})")
+        asyncio.run(process_stations(stations, args.consumer, args.concurrency, args.simulate))
+    else:
+        asyncio.run(process_orders(args.consumer, args.concurrency))
+    print("Worker stopped.")
@@ -36,6 +36,8 @@ const CheckoutPage: React.FC = () => {
     const currencySymbol = brandConfig?.currency_symbol || '$';
     const [paymentMethod, setPaymentMethod] = useState('CARD');
     const [isSubmitting, setIsSubmitting] = useState(false);
+    // One key per checkout, so retries after a network error can't create duplicate orders
+    const [idempotencyKey] = useState(() => crypto.randomUUID());
 
     const handleSubmitOrder = async () => {
         setIsSubmitting(true);
@@ -51,7 +53,9 @@ const CheckoutPage: React.FC = () => {
                 }))
             };
 
-            const response = await api.post('/orders', orderData);
+            const response = await api.post('/orders', orderData, {
+                headers: { 'Idempotency-Key': idempotencyKey },
+            });
             clearCart();
             // Assuming response contains order_number
             navigate('/confirmation', { state: { orderNumber: response.data.order_number } });
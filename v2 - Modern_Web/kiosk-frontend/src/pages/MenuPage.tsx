@@ -34,14 +34,11 @@ const MenuPage: React.FC = () => {
     useEffect(() => {
         const fetchData = async () => {
             try {
-                const [itemsRes, catRes] = await Promise.all([
-                    api.get('/menu/items'),
-                    api.get('/menu/categories'),
-                ]);
-                setItems(itemsRes.data);
-                setCategories(catRes.data);
-                if (catRes.data.length > 0) {
-                    setActiveCategory(catRes.data[0].id);
+                const response = await api.get('/menu/bootstrap');
+                setItems(response.data.items);
+                setCategories(response.data.categories);
+                if (response.data.categories.length > 0) {
+                    setActiveCategory(response.data.categories[0].id);
                 }
             } catch (error) {
                 console.error('Error fetching menu:', error);